@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_pipeline.option_ranking import add_greeks, bs_price, build_contract_table, implied_volatility, rank_contracts
+
+
+def synthetic_chains(n_contracts, spot=100.0, rate=0.04, seed=0, now=None):
+    # Calls and puts priced off a volatility smile, spread over weekly expirations
+    rng = np.random.default_rng(seed)
+    now = pd.Timestamp("2026-01-05 15:00", tz="UTC") if now is None else now
+    n_expirations = max(1, min(52, n_contracts // 200))
+    strikes_per_side = max(1, n_contracts // (2 * n_expirations))
+    chains = []
+    for week in range(n_expirations):
+        expiration = (now + pd.Timedelta(days=4 + 7 * week)).strftime("%Y-%m-%d")
+        years = ((pd.Timestamp(expiration, tz="UTC") + pd.Timedelta(hours=20)) - now).total_seconds() / (365 * 86400)
+        strike = np.round(np.linspace(0.5, 1.5, strikes_per_side) * spot, 2)
+        sigma = 0.25 + 0.4 * (np.log(strike / spot)) ** 2
+        sides = []
+        for kind in (1, -1):
+            fair = bs_price(spot, strike, years, sigma, rate, kind)
+            spread = np.maximum(0.01, fair * rng.uniform(0.01, 0.2, strikes_per_side))
+            sides.append(pd.DataFrame({
+                # OCC-style symbols: root, YYMMDD, C/P, strike x 1000
+                "contractSymbol": [f"SYN{expiration[2:].replace('-', '')}{'C' if kind > 0 else 'P'}{k:08.0f}" for k in strike * 1000],
+                "lastTradeDate": now,
+                "strike": strike,
+                "lastPrice": fair,
+                "bid": np.maximum(fair - spread / 2, 0.0),
+                "ask": fair + spread / 2,
+                "volume": rng.integers(0, 500, strikes_per_side),
+                "openInterest": rng.integers(0, 5000, strikes_per_side),
+                "impliedVolatility": sigma,
+                "inTheMoney": kind * (spot - strike) > 0,
+            }))
+        chains.append((expiration, sides[0], sides[1]))
+    return chains, now
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-expiration option contract ranking")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    spot = 100.0
+    print(f"{'contracts':>10} {'table':>9} {'greeks':>9} {'rank':>9}  max IV error (|delta| 0.02-0.98)")
+    for n in args.sizes:
+        chains, now = synthetic_chains(n, spot)
+        build_time, table = best_of(lambda: build_contract_table(chains, now), args.repeat)
+        greeks_time, greeks = best_of(lambda: add_greeks(table, spot), args.repeat)
+        rank_time, _ranked = best_of(lambda: rank_contracts(greeks, "BUY"), args.repeat)
+        # Mids are exact model prices only where the bid was not floored at zero; deep in-the-money
+        # contracts carry almost no time value, so their IV is not identifiable and is left out
+        exact = ((table["bid"] > 0) & (greeks["delta"].abs() > 0.02) & (greeks["delta"].abs() < 0.98)).to_numpy()
+        solved = implied_volatility(greeks["mid"].to_numpy(), spot, table["strike"].to_numpy(), table["years"].to_numpy(),
+                                    0.04, table["kind"].to_numpy())
+        hits = exact & np.isfinite(solved)
+        error = np.abs(solved[hits] - table["impliedVolatility"].to_numpy()[hits]).max()
+        print(f"{len(table):>10} {build_time * 1000:>7.1f}ms {greeks_time * 1000:>7.1f}ms {rank_time * 1000:>7.1f}ms  "
+              f"{error:.2e} ({hits.sum()}/{exact.sum()} solved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_pipeline.parallel_indicators import IndicatorPool
+
+
+def synthetic_frames(n_symbols, bars, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2026-01-01", periods=bars, freq="h")
+    frames = {}
+    for i in range(n_symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+        spread = rng.uniform(0, 0.01, bars)
+        frames[f"SYM{i}/USDT"] = pd.DataFrame({
+            "open": close, "high": close * (1 + spread), "low": close * (1 - spread),
+            "close": close, "volume": rng.uniform(10, 1000, bars),
+        }, index=index)
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling curve of process-pool indicator computation")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[250, 1000, 2000])
+    parser.add_argument("--bars", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="pool sizes to try (default: 1, 2, 4, ... up to the core count)")
+    parser.add_argument("--kind", choices=["crypto", "equity"], default="crypto")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = args.workers or sorted({1, *[2 ** k for k in range(1, 8) if 2 ** k <= cores], cores})
+    print(f"{cores} cores, {args.bars} bars per symbol")
+    print(f"{'symbols':>8} {'workers':>8} {'seconds':>9} {'symbols/s':>10} {'speedup':>8}")
+    for n_symbols in args.symbols:
+        frames = synthetic_frames(n_symbols, args.bars)
+        if args.kind == "equity":
+            frames = {symbol: df.rename(columns=str.capitalize) for symbol, df in frames.items()}
+        baseline = None
+        for n_workers in workers:
+            pool = IndicatorPool(args.kind, workers=n_workers, min_symbols=1)
+            # Warm-up: starts the workers and imports pandas_ta in each of them
+            pool.compute(dict(list(frames.items())[:n_workers * 2]))
+            started = time.perf_counter()
+            pool.compute(frames)
+            elapsed = time.perf_counter() - started
+            pool.close()
+            baseline = baseline or elapsed
+            print(f"{n_symbols:>8} {n_workers:>8} {elapsed:>8.2f}s {n_symbols / elapsed:>10.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import argparse
+import ast
+import contextlib
+import datetime
+import functools
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_services import FakeExchange, FakeWebhook, FakeYFinance
+from signal_pipeline.alerts import get_dispatcher
+from signal_pipeline.funding import FundingRateProvider
+from signal_pipeline.metrics import registry, write_metrics
+from signal_pipeline.option_chains import OptionChainCache
+from signal_pipeline.parallel_indicators import IndicatorPool
+from signal_pipeline.runner import BOTS, REPO_ROOT, load_bots
+from signal_pipeline.signal_state import SignalStateStore
+
+# Offline end-to-end benchmark of the four bots: python benchmarks/bench_pipeline.py [bots] --sizes 10 100 1000
+# Each bot's real scan function runs against synthetic watchlists, with ccxt,
+# yfinance and the Discord webhook replaced by the fakes in fake_services.py.
+# Stage times are inclusive wall times of the bot functions listed in STAGES
+# (a report stage includes its alert), summed over all calls. Reports are JSON;
+# --baseline compares against an earlier report and exits 1 on a regression.
+
+STAGES = {
+    "spot": [
+        ("prescreen", "prescreen_watchlist"),
+        ("fetch", "get_crypto_ohlcv"), ("indicators", "calculate_indicators"), ("indicators", "update_bar_store"),
+        ("signals", "check_signals"), ("signals", "check_bar_signals"),
+        ("report", "report_crypto_signal"), ("alert", "send_discord_alert"),
+    ],
+    "futures": [
+        ("prescreen", "prescreen_watchlist"),
+        ("fetch", "get_futures_ohlcv"), ("indicators", "calculate_indicators"), ("indicators", "update_bar_store"),
+        ("signals", "check_futures_signals"), ("signals", "check_bar_signals"),
+        ("funding", "get_funding_rate"), ("report", "report_futures_signal"), ("alert", "send_discord_alert"),
+    ],
+    "equities": [
+        ("prescreen", "prescreen_watchlist"), ("fetch", "download_bars"), ("fetch", "fetch_shared_data"),
+        ("indicators", "prepare_stock_frames"),
+        ("indicators", "calculate_indicators"), ("signals", "check_signal"), ("levels", "detect_support_resistance"),
+        ("report", "report_equity_signal"), ("alert", "send_discord_alert"),
+    ],
+    "options": [
+        ("prescreen", "prescreen_watchlist"), ("fetch", "download_bars"), ("fetch", "fetch_shared_data"),
+        ("indicators", "prepare_stock_frames"),
+        ("indicators", "calculate_indicators"), ("signals", "check_signal"), ("chains", "prefetch_option_chains"),
+        ("chains", "get_option_chain"), ("ranking", "rank_trade_idea"),
+        ("levels", "detect_support_resistance"), ("report", "report_option_signal"), ("alert", "send_discord_alert"),
+    ],
+}
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
+        self._patched = []
+        self._lock = threading.Lock()
+
+    def wrap(self, target, attr, stage):
+        original = getattr(target, attr)
+        owned = attr in vars(target)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self._record(stage, time.perf_counter() - started)
+
+        setattr(target, attr, timed)
+        self._patched.append((target, attr, original, owned))
+
+    def _record(self, stage, seconds):
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"calls": 0, "seconds": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+
+    def restore(self):
+        for target, attr, original, owned in reversed(self._patched):
+            if owned:
+                setattr(target, attr, original)
+            else:
+                delattr(target, attr)
+        self._patched = []
+
+
+def synthetic_watchlist(name, size):
+    if name in ("spot", "futures"):
+        return [f"S{i:04d}/USDT" for i in range(size)]
+    return [f"T{i:04d}" for i in range(size)]
+
+
+def parse_overrides(pairs):
+    overrides = {}
+    for pair in pairs:
+        name, _, value = pair.partition("=")
+        try:
+            overrides[name] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            overrides[name] = value
+    return overrides
+
+
+def configure(name, module, watchlist, args, webhook, yfinance):
+    # Points one bot module at the fakes; returns the services whose requests are counted
+    for knob, value in args.overrides.items():
+        if hasattr(module, knob):
+            setattr(module, knob, value)
+    module.DISCORD_WEBHOOK_URL = webhook.url
+    module.alert_dispatcher = get_dispatcher(webhook.url) if module.USE_ALERT_DISPATCHER else None
+    if module.SIGNAL_STATE_DB and module.signal_state is None:
+        module.signal_state = SignalStateStore(module.SIGNAL_STATE_DB, module.ALERT_COOLDOWN, module.ALERT_ON_SCORE_CHANGE)
+    if name in ("spot", "futures"):
+        # The async scan builds its own ccxt.async_support exchange, so the sync path is measured
+        module.USE_ASYNC_SCAN = False
+        module.ohlcv_cache = None
+        module.bar_store = None
+        module.exchange = FakeExchange(watchlist, name, swaps=name == "futures", latency=args.latency,
+                                       failure_rate=args.failure_rate, seed=args.seed)
+        if name == "futures":
+            module.funding_rates = FundingRateProvider(module.exchange)
+        return {"exchange": module.exchange}
+    if name == "options":
+        module.option_chains = OptionChainCache(ttl=module.OPTION_CHAIN_TTL, max_entries=module.OPTION_CHAIN_CACHE_SIZE,
+                                                ticker_factory=yfinance.Ticker)
+    return {"yfinance": yfinance}
+
+
+def run_bot(adapter, name, module, size, args, webhook):
+    watchlist = synthetic_watchlist(name, size)
+    yfinance = FakeYFinance(latency=args.latency, failure_rate=args.failure_rate, seed=args.seed).install()
+    services = configure(name, module, watchlist, args, webhook, yfinance)
+    webhook.reset()
+
+    timer = StageTimer()
+    for stage, attr in STAGES[name]:
+        if hasattr(module, attr):
+            timer.wrap(module, attr, stage)
+    timer.wrap(IndicatorPool, "compute", "indicators")
+
+    output = io.StringIO()
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            getattr(module, adapter.run)(watchlist)
+            if module.alert_dispatcher is not None:
+                module.alert_dispatcher.flush()
+        seconds = time.perf_counter() - started
+    finally:
+        timer.restore()
+        yfinance.uninstall()
+
+    requests = {label: dict(service.requests) for label, service in services.items()}
+    return {
+        "bot": name,
+        "symbols": size,
+        "seconds": seconds,
+        "symbols_per_second": size / seconds if seconds else None,
+        "errors": output.getvalue().count("❌"),
+        "alerts": webhook.messages,
+        "webhook_posts": webhook.requests["post"],
+        "requests": requests,
+        "stages": timer.stages,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_run(run):
+    stages = ", ".join(f"{stage} {entry['seconds']:.2f}s" for stage, entry in run["stages"].items())
+    print(f"{run['bot']:>9} {run['symbols']:>6} {run['seconds']:>8.2f}s {run['symbols_per_second']:>9.0f} "
+          f"{run['alerts']:>7} {run['errors']:>7}   {stages}")
+
+
+def compare(report, baseline, tolerance, min_seconds):
+    # Regressions: runs or stages slower than the baseline's by more than `tolerance` (fraction)
+    if baseline["config"] != report["config"]:
+        print(f"⚠️ Baseline was run with a different configuration: {baseline['config']}")
+    previous = {(run["bot"], run["symbols"]): run for run in baseline["runs"]}
+    regressions = []
+    for run in report["runs"]:
+        base = previous.get((run["bot"], run["symbols"]))
+        if base is None:
+            continue
+        pairs = [("total", base["seconds"], run["seconds"])]
+        pairs += [(stage, base["stages"][stage]["seconds"], entry["seconds"])
+                  for stage, entry in run["stages"].items() if stage in base["stages"]]
+        for stage, before, after in pairs:
+            if before >= min_seconds and after > before * (1 + tolerance):
+                regressions.append((run["bot"], run["symbols"], stage, before, after))
+    for bot, symbols, stage, before, after in regressions:
+        print(f"🐢 {bot} x{symbols} {stage}: {before:.3f}s -> {after:.3f}s ({after / before:.2f}x)")
+    if not regressions:
+        print(f"✅ No regressions beyond {tolerance:.0%} against the baseline ({baseline.get('git') or 'unknown revision'})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the bots against synthetic data and fake services")
+    parser.add_argument("bots", nargs="*", help=f"any of {', '.join(BOTS)} (default: all four)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000], help="watchlist sizes")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per exchange/yfinance request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of exchange/yfinance requests that fail")
+    parser.add_argument("--webhook-latency", type=float, default=0.0, help="seconds per webhook post")
+    parser.add_argument("--webhook-failure-rate", type=float, default=0.0, help="fraction of webhook posts answered with 500")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="KNOB=VALUE",
+                        help="override a bot knob for the run, e.g. --set USE_PANEL_SIGNALS=True (repeatable)")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="compare against this earlier JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a run counts as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="ignore stages faster than this in the baseline")
+    parser.add_argument("--metrics", metavar="PATH", help="enable the bots' metrics and write them here in Prometheus format")
+    parser.add_argument("--verbose", action="store_true", help="show the bots' own output")
+    args = parser.parse_args()
+    unknown = sorted(set(args.bots) - set(BOTS))
+    if unknown:
+        parser.error(f"unknown bots: {', '.join(unknown)}")
+    args.bots = args.bots or list(BOTS)
+    args.overrides = parse_overrides(args.overrides)
+
+    report = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {
+            "latency": args.latency, "failure_rate": args.failure_rate, "webhook_latency": args.webhook_latency,
+            "webhook_failure_rate": args.webhook_failure_rate, "seed": args.seed, "overrides": args.overrides,
+            "metrics": bool(args.metrics),
+        },
+        "runs": [],
+    }
+    registry.enabled = bool(args.metrics)
+    webhook = FakeWebhook(args.webhook_latency, args.webhook_failure_rate, args.seed).start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            loaded = load_bots(args.bots)
+        print(f"{'bot':>9} {'size':>6} {'wall':>9} {'symbols/s':>9} {'alerts':>7} {'errors':>7}   stages")
+        for adapter, module in loaded:
+            name = next(key for key, value in BOTS.items() if value is adapter)
+            for size in args.sizes:
+                run = run_bot(adapter, name, module, size, args, webhook)
+                report["runs"].append(run)
+                print_run(run)
+    finally:
+        webhook.close()
+
+    if args.metrics:
+        write_metrics(args.metrics)
+        print(f"📈 Metrics written to {args.metrics}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance, args.min_seconds):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_pipeline.runner import BOTS, REPO_ROOT
+
+# Startup cost of the bots as four interpreters versus one runner process.
+# Each child imports its bot modules (what happens before the first fetch) and
+# reports its wall time and peak RSS; no network calls are made.
+
+CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+from signal_pipeline.runner import BOTS, load_bots
+load_bots({names!r})
+elapsed = time.perf_counter() - started
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "rss_mb": rss_kb / 1024}}))
+"""
+
+
+def measure(names):
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(root=REPO_ROOT, names=names)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_seconds"] = time.perf_counter() - started
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare bot startup time and memory: separate vs one process")
+    parser.add_argument("bots", nargs="*", help=f"any of {', '.join(BOTS)} (default: all four)")
+    args = parser.parse_args()
+    unknown = sorted(set(args.bots) - set(BOTS))
+    if unknown:
+        parser.error(f"unknown bots: {', '.join(unknown)}")
+    args.bots = args.bots or list(BOTS)
+
+    print(f"{'run':>24} {'import':>9} {'process':>9} {'peak RSS':>10}")
+    separate_seconds = separate_rss = 0.0
+    for name in args.bots:
+        result = measure([name])
+        separate_seconds += result["process_seconds"]
+        separate_rss += result["rss_mb"]
+        print(f"{name:>24} {result['seconds']:>8.2f}s {result['process_seconds']:>8.2f}s {result['rss_mb']:>8.0f}MB")
+
+    combined = measure(args.bots)
+    print(f"{'separate (total)':>24} {'':>9} {separate_seconds:>8.2f}s {separate_rss:>8.0f}MB")
+    print(f"{'one process':>24} {combined['seconds']:>8.2f}s {combined['process_seconds']:>8.2f}s {combined['rss_mb']:>8.0f}MB")
+    print(f"⚡ {separate_seconds / combined['process_seconds']:.1f}x less startup time, "
+          f"{separate_rss / combined['rss_mb']:.1f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import argparse
+import contextlib
+import functools
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_pipeline import parse_overrides, synthetic_watchlist
+from fake_services import FakeExchange, FakeWebhook
+from fake_stream import FakeStreamExchange, FakeStreamServer, load_recording, record_candles, save_recording
+from signal_pipeline.alerts import get_dispatcher
+from signal_pipeline.funding import FundingRateProvider
+from signal_pipeline.ohlcv_cache import timeframe_to_ms
+from signal_pipeline.runner import load_bots
+
+# Offline benchmark of the crypto bots' stream mode: python benchmarks/bench_stream.py spot --symbols 100
+# A FakeStreamServer replays candles (synthetic, or a recording saved with
+# --save-recording) over a local WebSocket at --speed times real time, and the
+# bot's run_stream evaluates each closed candle. Latencies are wall-clock
+# seconds from the moment a candle ends on the replay clock to its evaluation
+# finishing and to its alert being posted; they include the fake feed's tick.
+
+STREAM_BOTS = ("spot", "futures")
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else None
+
+
+def run_stream_bot(name, module, candles, args, webhook):
+    for knob, value in args.overrides.items():
+        if hasattr(module, knob):
+            setattr(module, knob, value)
+    module.TIMEFRAME = args.timeframe
+    module.DISCORD_WEBHOOK_URL = webhook.url
+    module.alert_dispatcher = get_dispatcher(webhook.url) if module.USE_ALERT_DISPATCHER else None
+    module.ohlcv_cache = None
+    module.bar_store = None
+    module.PRESCREEN_MIN_VOLUME = module.PRESCREEN_MIN_PRICE = module.PRESCREEN_MAX_SPREAD = None
+    module.SCAN_ALL_QUOTE = None
+    if name == "futures":
+        # Funding rates still come over REST, from the sync fake exchange
+        module.funding_rates = FundingRateProvider(FakeExchange(list(candles), name, swaps=True, seed=args.seed))
+
+    server = FakeStreamServer(candles, args.timeframe, args.speed, args.warmup, args.tick, args.quiet_rate, args.seed).start()
+    period = timeframe_to_ms(args.timeframe)
+    evaluated, alerted = [], []
+    lock = threading.Lock()
+    analyze, send = module.analyze_closed_bars, module.send_discord_alert
+
+    @functools.wraps(analyze)
+    def analyze_closed_bars(symbol, ohlcv):
+        result = analyze(symbol, ohlcv)
+        with lock:
+            evaluated.append(time.time() - server.to_real(ohlcv[-1][0] + period))
+        return result
+
+    @functools.wraps(send)
+    def send_discord_alert(message, on_delivered=None):
+        sent = send(message, on_delivered)
+        with lock:
+            alerted.append(time.time() - server.to_real(server.now() // period * period))
+        return sent
+
+    module.analyze_closed_bars, module.send_discord_alert = analyze_closed_bars, send_discord_alert
+    exchanges = []
+
+    def exchange_factory():
+        exchanges.append(FakeStreamExchange(server.url, multiplexed=not args.per_symbol))
+        return exchanges[-1]
+
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            stream = module.run_stream(list(candles), exchange_factory, server.duration + args.tail)
+            if module.alert_dispatcher is not None:
+                module.alert_dispatcher.flush()
+    finally:
+        module.analyze_closed_bars, module.send_discord_alert = analyze, send
+        server.close()
+
+    return {
+        "bot": name, "symbols": len(candles), "closed": stream.closed, "evaluated": len(evaluated),
+        "alerts": webhook.messages, "errors": output.getvalue().count("❌"),
+        "rest_requests": sum(exchange.requests for exchange in exchanges), "ws_messages": server.messages,
+        "evaluation_latency": {q: percentile(evaluated, p) for q, p in (("p50", 0.5), ("p95", 0.95), ("max", 1.0))},
+        "alert_latency": {q: percentile(alerted, p) for q, p in (("p50", 0.5), ("p95", 0.95), ("max", 1.0))},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the crypto bots' WebSocket stream mode")
+    parser.add_argument("bots", nargs="*", help=f"any of {', '.join(STREAM_BOTS)} (default: both)")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--timeframe", default="1m")
+    parser.add_argument("--bars", type=int, default=5, help="candles replayed after the history")
+    parser.add_argument("--warmup", type=int, default=200, help="candles of history served over REST")
+    parser.add_argument("--speed", type=float, default=30.0, help="replay speed relative to real time")
+    parser.add_argument("--tick", type=float, default=0.05, help="seconds between WebSocket pushes")
+    parser.add_argument("--quiet-rate", type=float, default=0.2, help="fraction of pushes a symbol sits out")
+    parser.add_argument("--tail", type=float, default=2.0, help="seconds to keep streaming after the replay ends")
+    parser.add_argument("--per-symbol", action="store_true", help="no watchOHLCVForSymbols, one watch_ohlcv per symbol")
+    parser.add_argument("--recording", help="replay this JSON recording ({symbol: ohlcv rows}) instead of synthetic candles")
+    parser.add_argument("--save-recording", metavar="PATH", help="save the replayed candles here")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="KNOB=VALUE",
+                        help="override a bot knob for the run, e.g. --set USE_BAR_STORE=True (repeatable)")
+    parser.add_argument("--verbose", action="store_true", help="show the bots' own output")
+    args = parser.parse_args()
+    unknown = sorted(set(args.bots) - set(STREAM_BOTS))
+    if unknown:
+        parser.error(f"unknown bots: {', '.join(unknown)}")
+    args.bots = args.bots or list(STREAM_BOTS)
+    args.overrides = parse_overrides(args.overrides)
+
+    if args.recording:
+        candles = load_recording(args.recording)
+    else:
+        symbols = synthetic_watchlist("spot", args.symbols)
+        candles = record_candles(symbols, args.timeframe, args.warmup + args.bars, args.seed)
+    if args.save_recording:
+        save_recording(candles, args.save_recording)
+
+    webhook = FakeWebhook().start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            loaded = load_bots(args.bots)
+        for (_adapter, module), name in zip(loaded, args.bots):
+            webhook.reset()
+            run = run_stream_bot(name, module, candles, args, webhook)
+            evaluation, alert = run["evaluation_latency"], run["alert_latency"]
+            print(f"📡 {name}: {run['symbols']} symbols, {run['closed']} candles closed, {run['evaluated']} evaluated, "
+                  f"{run['alerts']} alerts, {run['errors']} errors, {run['rest_requests']} REST requests, "
+                  f"{run['ws_messages']} WebSocket messages")
+            for label, latency in (("close → evaluated", evaluation), ("close → alert sent", alert)):
+                if latency["p50"] is not None:
+                    print(f"   {label}: p50 {latency['p50']:.3f}s, p95 {latency['p95']:.3f}s, max {latency['max']:.3f}s")
+    finally:
+        webhook.close()
+
+
+if __name__ == "__main__":
+    main()
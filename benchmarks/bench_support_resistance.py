@@ -0,0 +1,72 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_pipeline.levels import detect_support_resistance
+
+
+def legacy_detect_support_resistance(df, lookback=60):
+    # The per-bar loop the equities/options bots used before signal_pipeline.levels
+    support_levels = []
+    resistance_levels = []
+
+    for i in range(lookback, len(df) - lookback):
+        if df['Low'].iloc[i] < min(df['Low'].iloc[i - lookback:i]) and df['Low'].iloc[i] < min(df['Low'].iloc[i+1:i+lookback+1]):
+            support_levels.append(df['Low'].iloc[i])
+        if df['High'].iloc[i] > max(df['High'].iloc[i - lookback:i]) and df['High'].iloc[i] > max(df['High'].iloc[i+1:i+lookback+1]):
+            resistance_levels.append(df['High'].iloc[i])
+
+    def filter_levels(levels, threshold=0.02):
+        filtered = []
+        for lvl in levels:
+            if all(abs(lvl - f) / f > threshold for f in filtered):
+                filtered.append(lvl)
+        return sorted(filtered)
+
+    return filter_levels(support_levels), filter_levels(resistance_levels)
+
+
+def synthetic_bars(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    spread = rng.uniform(0, 0.002, n)
+    return pd.DataFrame({"High": close * (1 + spread), "Low": close * (1 - spread), "Close": close})
+
+
+def best_of(func, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(df)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark support/resistance detection")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-max", type=int, default=20_000,
+                        help="largest frame to run the slow per-bar loop on")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'bars':>10} {'vectorized':>12} {'legacy':>12} {'speedup':>9}  levels")
+    for n in args.sizes:
+        df = synthetic_bars(n)
+        fast, fast_levels = best_of(detect_support_resistance, df, args.repeat)
+        if n <= args.legacy_max:
+            slow, slow_levels = best_of(legacy_detect_support_resistance, df, 1)
+            same = "match" if fast_levels == slow_levels else "MISMATCH"
+            print(f"{n:>10} {fast * 1000:>10.1f}ms {slow * 1000:>10.1f}ms {slow / fast:>8.0f}x  {same}")
+        else:
+            print(f"{n:>10} {fast * 1000:>10.1f}ms {'skipped':>12} {'-':>9}  {len(fast_levels[0])}/{len(fast_levels[1])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import ccxt
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_pipeline.discord_dispatch import SEPARATOR
+from synthetic_market import (
+    base_price, synthetic_expirations, synthetic_ohlcv, synthetic_option_chain, synthetic_quote, synthetic_stock_bars,
+)
+
+# Offline stand-ins for the services the bots talk to, for benchmarks only:
+# a ccxt exchange, the yfinance module (download and Ticker) and a Discord
+# webhook on localhost. Each request sleeps `latency` seconds and fails with
+# probability `failure_rate` (a ccxt NetworkError, a ticker missing from the
+# download, or an HTTP 500), and every request is counted.
+
+Options = namedtuple("Options", ["calls", "puts", "underlying"])
+
+
+class _Service:
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _request(self, name):
+        # Returns True when this request should fail
+        with self._lock:
+            self.requests[name] += 1
+            failed = self.failure_rate > 0 and self._random.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        return failed
+
+
+class FakeExchange(_Service):
+    def __init__(self, symbols=(), exchange_id="fake", swaps=False, latency=0.0, failure_rate=0.0, seed=0, clock=time.time):
+        super().__init__(latency, failure_rate, seed)
+        self.id = exchange_id
+        self.clock = clock
+        self.has = {"fetchOHLCV": True, "fetchTickers": True, "fetchFundingRates": swaps, "fetchFundingRate": swaps}
+        self.markets = {}
+        for symbol in symbols:
+            base, quote = symbol.split(":")[0].split("/")
+            self.markets[f"{base}/{quote}"] = self._market(f"{base}/{quote}", base, quote, "spot")
+            if swaps:
+                self.markets[f"{base}/{quote}:{quote}"] = self._market(f"{base}/{quote}:{quote}", base, quote, "swap")
+
+    @staticmethod
+    def _market(symbol, base, quote, market_type):
+        swap = market_type == "swap"
+        return {"symbol": symbol, "base": base, "quote": quote, "type": market_type, "spot": not swap,
+                "swap": swap, "contract": swap, "linear": True if swap else None, "active": True}
+
+    def _fail(self, name, symbol=None):
+        if self._request(name):
+            raise ccxt.NetworkError(f"{self.id} {name}: simulated failure")
+        if symbol is not None and symbol not in self.markets:
+            raise ccxt.BadSymbol(f"{self.id} does not have market symbol {symbol}")
+
+    def load_markets(self, reload=False, params=None):
+        self._fail("load_markets")
+        return self.markets
+
+    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None, params=None):
+        self._fail("fetch_ohlcv", symbol)
+        return synthetic_ohlcv(symbol.split(":")[0], timeframe, limit, since, int(self.clock() * 1000), self.seed)
+
+    def fetch_tickers(self, symbols=None, params=None):
+        self._fail("fetch_tickers")
+        symbols = symbols or list(self.markets)
+        return {symbol: synthetic_quote(symbol.split(":")[0], self.seed) | {"symbol": symbol}
+                for symbol in symbols if symbol in self.markets}
+
+    def _funding(self, symbol):
+        now_ms = int(self.clock() * 1000)
+        interval = 8 * 3_600_000
+        rate = (base_price(symbol, self.seed) % 1 - 0.5) / 1000
+        return {"symbol": symbol, "fundingRate": rate, "fundingTimestamp": (now_ms // interval + 1) * interval,
+                "interval": "8h"}
+
+    def fetch_funding_rates(self, symbols=None, params=None):
+        self._fail("fetch_funding_rates")
+        symbols = symbols or [s for s, market in self.markets.items() if market["swap"]]
+        return {symbol: self._funding(symbol) for symbol in symbols if symbol in self.markets}
+
+    def fetch_funding_rate(self, symbol, params=None):
+        self._fail("fetch_funding_rate", symbol)
+        return self._funding(symbol)
+
+    def close(self):
+        pass
+
+
+class FakeTicker:
+    def __init__(self, service, ticker):
+        self.service = service
+        self.ticker = ticker
+
+    @property
+    def options(self):
+        if self.service._request("options"):
+            return ()
+        return synthetic_expirations(self.service.now(), self.service.expirations)
+
+    def _spot(self):
+        # The last close of every synthetic bar series
+        return base_price(self.ticker, self.service.seed)
+
+    def option_chain(self, date=None):
+        if self.service._request("option_chain"):
+            raise ValueError(f"Simulated failure loading {self.ticker} options for {date}")
+        date = date or self.options[0]
+        calls, puts = synthetic_option_chain(self.ticker, date, self._spot(), self.service.now(), seed=self.service.seed)
+        return Options(calls, puts, {"regularMarketPrice": self._spot()})
+
+    def history(self, period="1mo", interval="1d", **kwargs):
+        if self.service._request("history"):
+            return pd.DataFrame()
+        return synthetic_stock_bars(self.ticker, period, interval, self.service.now(), self.service.seed)
+
+
+class FakeYFinance(_Service):
+    # Installed as sys.modules["yfinance"], so the bots' `import yfinance as yf` picks it up
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=0, expirations=8, clock=time.time):
+        super().__init__(latency, failure_rate, seed)
+        self.expirations = expirations
+        self.clock = clock
+        self._previous = None
+
+    def now(self):
+        return pd.Timestamp(self.clock(), unit="s", tz="UTC")
+
+    def download(self, tickers, period="1mo", interval="1d", group_by="column", auto_adjust=True,
+                 threads=True, progress=True, **kwargs):
+        # One request per call; a failed download leaves tickers out, as yfinance does for errors
+        tickers = tickers.split() if isinstance(tickers, str) else list(tickers)
+        self._request("download")
+        with self._lock:
+            failed = {t for t in tickers if self.failure_rate > 0 and self._random.random() < self.failure_rate}
+        frames = {t: synthetic_stock_bars(t, period, interval, self.now(), self.seed) for t in tickers if t not in failed}
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, axis=1)
+        return df if group_by == "ticker" else df.swaplevel(axis=1)
+
+    def Ticker(self, ticker):
+        return FakeTicker(self, ticker)
+
+    def install(self):
+        self._previous = sys.modules.get("yfinance")
+        sys.modules["yfinance"] = self
+        return self
+
+    def uninstall(self):
+        if self._previous is None:
+            sys.modules.pop("yfinance", None)
+        else:
+            sys.modules["yfinance"] = self._previous
+
+
+class FakeWebhook(_Service):
+    # A Discord webhook on 127.0.0.1; answers 204, or 500 for simulated failures
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=0):
+        super().__init__(latency, failure_rate, seed)
+        self.messages = 0
+        self.bytes = 0
+        self._server = None
+
+    def start(self):
+        webhook = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                failed = webhook._request("post")
+                if not failed:
+                    with webhook._lock:
+                        webhook.messages += json.loads(body or b"{}").get("content", "").count(SEPARATOR) + 1
+                        webhook.bytes += len(body)
+                self.send_response(500 if failed else 204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/webhooks/0/offline"
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self.messages = 0
+            self.bytes = 0
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
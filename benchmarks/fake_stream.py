@@ -0,0 +1,244 @@
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_pipeline.ohlcv_cache import timeframe_to_ms
+from synthetic_market import synthetic_ohlcv
+
+# An offline WebSocket market-data feed for the streaming mode, for benchmarks only.
+# FakeStreamServer replays recorded candles ({symbol: ccxt OHLCV rows}) on a
+# virtual clock running `speed` times faster than real time: the first `warmup`
+# bars are history (served over REST at /ohlcv) and the rest are played over
+# the /ws WebSocket as a forming candle that grows every tick, followed by its
+# final values once the next candle starts. A fraction of ticks is skipped per
+# symbol to mimic quiet markets. FakeStreamExchange is the client side, with the
+# parts of the ccxt.pro interface OHLCVStream uses.
+
+
+def record_candles(symbols, timeframe="1m", bars=260, seed=0, exchange=None):
+    # {symbol: rows} from a live ccxt exchange when given, otherwise synthetic
+    if exchange is not None:
+        return {symbol: exchange.fetch_ohlcv(symbol, timeframe, limit=bars) for symbol in symbols}
+    period = timeframe_to_ms(timeframe)
+    now_ms = int(time.time() * 1000) // period * period - period
+    return {symbol: synthetic_ohlcv(symbol, timeframe, bars, None, now_ms, seed) for symbol in symbols}
+
+
+def save_recording(candles, path):
+    with open(path, "w") as f:
+        json.dump(candles, f)
+
+
+def load_recording(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def partial_candle(row, fraction):
+    # The forming candle `fraction` of the way through its period
+    ts, o, h, l, c, v = row
+    close = o + (c - o) * fraction
+    high = max(o, close) + (h - max(o, c)) * fraction
+    low = min(o, close) - (min(o, c) - l) * fraction
+    return [ts, o, high, low, close, v * fraction]
+
+
+class FakeStreamServer:
+    def __init__(self, candles, timeframe="1m", speed=60.0, warmup=200, tick=0.05, quiet_rate=0.2, seed=0):
+        self.candles = candles
+        self.timeframe = timeframe
+        self.period = timeframe_to_ms(timeframe)
+        self.speed = speed
+        self.warmup = warmup
+        self.tick = tick
+        self.quiet_rate = quiet_rate
+        self.messages = 0
+        self._random = random.Random(seed)
+        first = next(iter(candles.values()))
+        self.virtual_start = first[warmup][0] if len(first) > warmup else first[-1][0] + self.period
+        self.virtual_end = first[-1][0] + self.period
+        self.real_start = None
+        self.loop = None
+        self.port = None
+        self._runner = None
+
+    def now(self):
+        return int(self.virtual_start + (time.time() - self.real_start) * 1000 * self.speed)
+
+    def to_real(self, virtual_ms):
+        # Wall-clock time at which the replay reaches `virtual_ms`
+        return self.real_start + (virtual_ms - self.virtual_start) / 1000 / self.speed
+
+    @property
+    def duration(self):
+        return (self.virtual_end - self.virtual_start) / 1000 / self.speed
+
+    def _rows(self, symbol, now):
+        # (closed rows, forming row or None) at virtual time `now`
+        rows = self.candles.get(symbol, [])
+        closed = [row for row in rows if row[0] + self.period <= now]
+        forming = next((row for row in rows if row[0] <= now < row[0] + self.period), None)
+        if forming is not None:
+            forming = partial_candle(forming, (now - forming[0]) / self.period)
+        return closed, forming
+
+    async def _ohlcv(self, request):
+        symbol = request.query["symbol"]
+        limit = int(request.query.get("limit", 500))
+        closed, forming = self._rows(symbol, self.now())
+        rows = closed[-limit:] if forming is None else (closed + [forming])[-limit:]
+        return web.json_response(rows)
+
+    async def _ws(self, request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        subscribed, last_bar = [], {}
+
+        async def reader():
+            async for message in ws:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    subscribed.extend(s for s in json.loads(message.data).get("symbols", []) if s not in last_bar)
+                    for symbol in subscribed:
+                        last_bar.setdefault(symbol, None)
+
+        reading = asyncio.create_task(reader())
+        try:
+            while not ws.closed:
+                now = self.now()
+                data = []
+                for symbol in list(subscribed):
+                    rows = self.candles.get(symbol, [])
+                    index = (now - rows[0][0]) // self.period if rows else -1
+                    previous = last_bar[symbol]
+                    if previous is not None and previous < index:
+                        data.append([symbol, rows[previous]])  # final values of the candle that just closed
+                        last_bar[symbol] = None
+                    elif self._random.random() < self.quiet_rate:
+                        continue
+                    if 0 <= index < len(rows):
+                        last_bar[symbol] = index
+                        data.append([symbol, partial_candle(rows[index], (now - rows[index][0]) / self.period)])
+                await ws.send_str(json.dumps({"time": now, "data": data}))
+                self.messages += 1
+                await asyncio.sleep(self.tick)
+        except (ConnectionResetError, aiohttp.ClientConnectionResetError):
+            pass
+        finally:
+            reading.cancel()
+        return ws
+
+    def start(self):
+        ready = threading.Event()
+
+        def serve():
+            self.loop = asyncio.new_event_loop()
+            app = web.Application()
+            app.add_routes([web.get("/ohlcv", self._ohlcv), web.get("/ws", self._ws)])
+            self._runner = web.AppRunner(app)
+            self.loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, "127.0.0.1", 0)
+            self.loop.run_until_complete(site.start())
+            self.port = site._server.sockets[0].getsockname()[1]
+            self.real_start = time.time()
+            ready.set()
+            self.loop.run_forever()
+
+        threading.Thread(target=serve, name="fake-stream", daemon=True).start()
+        ready.wait()
+        return self
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def close(self):
+        if self.loop is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self.loop).result(10)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class FakeStreamExchange:
+    # Client of FakeStreamServer: fetch_ohlcv over HTTP, watch_ohlcv(_for_symbols) over one WebSocket
+    id = "fake-stream"
+
+    def __init__(self, url, multiplexed=True):
+        self.url = url
+        self.has = {"fetchOHLCV": True, "watchOHLCV": True, "watchOHLCVForSymbols": multiplexed}
+        self.time = None
+        self.requests = 0
+        self._session = None
+        self._ws = None
+        self._reader = None
+        self._connecting = None
+        self._queues = {}
+
+    def milliseconds(self):
+        return self.time if self.time is not None else int(time.time() * 1000)
+
+    async def _get_session(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None, params=None):
+        session = await self._get_session()
+        self.requests += 1
+        async with session.get(f"{self.url}/ohlcv", params={"symbol": symbol, "limit": str(limit or 500)}) as response:
+            rows = await response.json()
+        if rows and self.time is None:
+            self.time = rows[-1][0]
+        return rows
+
+    async def _connect(self):
+        session = await self._get_session()
+        self._ws = await session.ws_connect(f"{self.url}/ws")
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self):
+        async for message in self._ws:
+            payload = json.loads(message.data)
+            self.time = payload["time"]
+            by_symbol = {}
+            for symbol, row in payload["data"]:
+                by_symbol.setdefault(symbol, []).append(row)
+            for symbols, queue in self._queues.items():
+                update = {symbol: rows for symbol, rows in by_symbol.items() if symbol in symbols}
+                if update:
+                    queue.put_nowait(update)
+
+    async def _subscribe(self, symbols):
+        key = frozenset(symbols)
+        if key not in self._queues:
+            if self._connecting is None:
+                self._connecting = asyncio.ensure_future(self._connect())
+            await self._connecting
+            self._queues[key] = asyncio.Queue()
+            await self._ws.send_str(json.dumps({"symbols": list(symbols)}))
+        return self._queues[key]
+
+    async def watch_ohlcv_for_symbols(self, pairs, since=None, limit=None, params=None):
+        timeframes = {symbol: timeframe for symbol, timeframe in pairs}
+        queue = await self._subscribe([symbol for symbol, _timeframe in pairs])
+        update = await queue.get()
+        return {symbol: {timeframes[symbol]: rows} for symbol, rows in update.items()}
+
+    async def watch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None, params=None):
+        queue = await self._subscribe([symbol])
+        return (await queue.get())[symbol]
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._ws is not None:
+            await self._ws.close()
+        if self._session is not None:
+            await self._session.close()
@@ -0,0 +1,134 @@
+import os
+import re
+import sys
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_pipeline.ohlcv_cache import timeframe_to_ms
+from signal_pipeline.option_ranking import bs_price
+
+# Deterministic synthetic market data for the offline benchmarks.
+# Every series is a random walk seeded by (seed, symbol) and generated backwards
+# from the latest bar, so a symbol's recent history and last close are the same
+# whatever limit/period is asked for; the option chains are priced off that close.
+# The synthetic stock market holds a 9:30-16:00 New York session every calendar
+# day, so downloaded bars always pass the bots' freshness check.
+
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_CLOSE = pd.Timedelta(hours=16)
+PERIOD_DAYS = {"d": 1, "wk": 7, "mo": 30, "y": 365}
+
+
+def _rng(*parts):
+    return np.random.default_rng(zlib.crc32(":".join(map(str, parts)).encode()))
+
+
+def base_price(symbol, seed=0):
+    # Last close of a symbol, log-uniform between 0.5 and 500
+    return float(np.exp(_rng(seed, symbol, "price").uniform(np.log(0.5), np.log(500))))
+
+
+def synthetic_quote(symbol, seed=0):
+    # A ccxt ticker: 24h quote volume is log-normal across symbols (a few liquid, a long illiquid tail)
+    rng = _rng(seed, symbol, "quote")
+    last = base_price(symbol, seed)
+    spread = last * rng.uniform(0.0002, 0.01)
+    quote_volume = float(np.exp(rng.normal(np.log(2_000_000), 2.0)))
+    return {"last": last, "bid": last - spread / 2, "ask": last + spread / 2,
+            "baseVolume": quote_volume / last, "quoteVolume": quote_volume}
+
+
+def synthetic_bars(symbol, n, volatility=0.01, volume=1_000.0, seed=0, salt=""):
+    # (open, high, low, close, volume) arrays, oldest first, ending at base_price(symbol)
+    rng = _rng(seed, symbol, salt)
+    steps = rng.normal(0, volatility, (n, 4))
+    back = np.concatenate([[0.0], np.cumsum(steps[:-1, 0])])
+    close = base_price(symbol, seed) * np.exp(back)[::-1]
+    opens = np.concatenate([[close[0] * np.exp(steps[0, 1])], close[:-1]])
+    high = np.maximum(opens, close) * (1 + np.abs(steps[::-1, 2]))
+    low = np.minimum(opens, close) * (1 - np.abs(steps[::-1, 3]))
+    volumes = volume * rng.lognormal(0, 0.5, n)
+    return opens, high, low, close, volumes
+
+
+def synthetic_ohlcv(symbol, timeframe="1h", limit=200, since=None, now_ms=None, seed=0):
+    # ccxt fetch_ohlcv rows; the last one is the still-forming candle, as on a live exchange
+    period = timeframe_to_ms(timeframe)
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    last = now_ms // period * period
+    limit = limit or 500
+    count = limit if since is None else max(0, min(limit, (last - since) // period + 1))
+    stamps = last - period * np.arange(count)[::-1]
+    columns = synthetic_bars(symbol, count, seed=seed, salt=timeframe)
+    return [[int(ts), *values] for ts, *values in zip(stamps, *(c.tolist() for c in columns))]
+
+
+def period_days(period):
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    return int(match.group(1)) * PERIOD_DAYS[match.group(2)]
+
+
+def session_index(period="5d", interval="5m", now=None, tz="America/New_York"):
+    # Bar start times of the synthetic sessions in the last `period`, up to `now`
+    now = pd.Timestamp.now(tz=tz) if now is None else pd.Timestamp(now).tz_convert(tz)
+    days = pd.date_range(end=now.normalize(), periods=period_days(period), freq="D")
+    step = pd.Timedelta(milliseconds=timeframe_to_ms(interval))
+    if step >= pd.Timedelta(days=1):
+        return days[days <= now]
+    offsets = pd.timedelta_range(SESSION_OPEN, SESSION_CLOSE - step, freq=step)
+    index = pd.DatetimeIndex((days.values[:, None] + offsets.values[None, :]).ravel()).tz_localize(tz)
+    return index[index <= now]
+
+
+def synthetic_stock_bars(ticker, period="5d", interval="5m", now=None, seed=0):
+    # A yfinance-style frame (capitalised columns, New York timestamps)
+    index = session_index(period, interval, now)
+    opens, high, low, close, volume = synthetic_bars(ticker, len(index), volatility=0.003, volume=2_000_000, seed=seed, salt=interval)
+    return pd.DataFrame({"Open": opens, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def synthetic_expirations(now=None, count=8):
+    # Weekly Friday expirations, nearest first
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    first = now.normalize() + pd.Timedelta(days=(4 - now.dayofweek) % 7)
+    return tuple((first + pd.Timedelta(weeks=week)).strftime("%Y-%m-%d") for week in range(count))
+
+
+def synthetic_option_chain(ticker, expiration, spot, now=None, strikes=40, rate=0.04, seed=0):
+    # (calls, puts) with yfinance's columns, priced by Black-Scholes off a volatility smile
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    rng = _rng(seed, ticker, expiration)
+    expires_at = pd.Timestamp(expiration, tz="UTC") + pd.Timedelta(hours=20)
+    years = max((expires_at - now).total_seconds(), 3600.0) / (365 * 86400)
+    strike = np.unique(np.round(np.linspace(0.7, 1.3, strikes) * spot, 2 if spot < 10 else 0))
+    n = len(strike)
+    sigma = 0.3 + 0.5 * np.log(strike / spot) ** 2
+    code = expiration[2:].replace("-", "")
+    sides = []
+    for kind in (1, -1):
+        fair = bs_price(spot, strike, years, sigma, rate, kind)
+        spread = np.maximum(0.01, fair * rng.uniform(0.02, 0.3, n))
+        sides.append(pd.DataFrame({
+            "contractSymbol": [f"{ticker}{code}{'C' if kind > 0 else 'P'}{k:08.0f}" for k in strike * 1000],
+            "lastTradeDate": now - pd.to_timedelta(rng.integers(1, 600, n), unit="min"),
+            "strike": strike,
+            "lastPrice": np.round(fair, 2),
+            "bid": np.round(np.maximum(fair - spread / 2, 0.0), 2),
+            "ask": np.round(fair + spread / 2, 2),
+            "change": 0.0,
+            "percentChange": 0.0,
+            "volume": rng.integers(0, 2_000, n).astype(float),
+            "openInterest": rng.integers(0, 20_000, n),
+            "impliedVolatility": sigma,
+            "inTheMoney": kind * (spot - strike) > 0,
+            "contractSize": "REGULAR",
+            "currency": "USD",
+        }))
+    return sides[0], sides[1]
@@ -1,128 +1,472 @@
 import ccxt
-import pandas as pd
-import pandas_ta as ta
-import requests
 import datetime
+import atexit
+import sys
+import time
+
+from signal_pipeline.async_ohlcv import AsyncOHLCVScanner, make_async_exchange, scan_ohlcv
+from signal_pipeline.ohlcv_stream import OHLCVStream, make_pro_exchange
+from signal_pipeline.ohlcv_cache import fetch_ohlcv_cached, ohlcv_to_df, shared_ohlcv_cache, timeframe_to_ms
+from signal_pipeline.indicator_engine import IndicatorEngineStore
+from signal_pipeline.bar_store import BarStore
+from signal_pipeline.panel import check_crypto_bar, check_crypto_signal, evaluate_crypto_panel
+from signal_pipeline.scheduler import BarCloseScheduler
+from signal_pipeline.alerts import get_dispatcher, send_alert
+from signal_pipeline.indicators import add_crypto_indicators
+from signal_pipeline.parallel_indicators import IndicatorPool
+from signal_pipeline.markets import quote_markets
+from signal_pipeline.prescreen import prescreen_exchange
+from signal_pipeline.signal_state import SignalStateStore
+from signal_pipeline.sharding import ShardCoordinator, base_rate_limit, share_rate_limit
+from signal_pipeline.timeframes import analyze_timeframes, ordered_timeframes
+from signal_pipeline.metrics import configure_metrics, instrument_exchange, scan, timed
 
 # 🔗 Your Discord webhook URL
 DISCORD_WEBHOOK_URL = "https://discord.com/api/webhooks/1399850966731194509/p6h6_E-ZSKvY-NoO8UXzSsXhqEqPKd1JNPUxrSkakQzesH4tKInqWs4Yid_dW7x7I6uB"
 
+# 🔁 Signal state: remember sent alerts in SQLite so a signal that keeps holding is not re-sent every run (None disables it)
+SIGNAL_STATE_DB = None  # e.g. ".cache/signals.sqlite", can be shared by all bots
+ALERT_COOLDOWN = 0  # seconds before the same side may alert again for a symbol, e.g. 4 * 3600
+ALERT_ON_SCORE_CHANGE = False  # while a signal keeps holding, re-alert only when its score changes
+signal_state = SignalStateStore(SIGNAL_STATE_DB, ALERT_COOLDOWN, ALERT_ON_SCORE_CHANGE) if SIGNAL_STATE_DB else None
+
+# 📨 Background alerts: queue alerts and post them from a worker thread, batched and rate-limit aware
+USE_ALERT_DISPATCHER = False
+alert_dispatcher = get_dispatcher(DISCORD_WEBHOOK_URL) if USE_ALERT_DISPATCHER else None
+
 # ✅ Recommended: Use Binance for more pairs and better OHLCV support
 # exchange = ccxt.binance()
-exchange = ccxt.kraken()
+EXCHANGE_ID = "kraken"
+EXCHANGE_CONFIG = {"enableRateLimit": True}
+exchange = getattr(ccxt, EXCHANGE_ID)(EXCHANGE_CONFIG)
+
+# ⚡ Async scan: fetch the whole watchlist concurrently instead of one symbol at a time
+USE_ASYNC_SCAN = False
+SCAN_CONCURRENCY = 8
+SCAN_TIMEOUT = 30.0
+async_scanner = None
+
+TIMEFRAME = "1h"
+
+# 🕰 Daemon mode: keep running and scan a few seconds after every candle close (or pass --daemon)
+DAEMON_MODE = False
+DAEMON_GRACE_SECONDS = 5.0
+
+# 📡 Stream mode: subscribe to live candles over WebSocket (ccxt.pro) and evaluate each symbol as soon as its candle closes (or pass --stream)
+STREAM_MODE = False
+STREAM_GRACE_SECONDS = 1.0  # a symbol with no update after the close is evaluated this long after it
+STREAM_BATCH_SIZE = 50  # symbols per multiplexed subscription, where the exchange supports watchOHLCVForSymbols
+
+# 💾 Candle cache: each run only fetches bars newer than the last cached one (None disables it)
+OHLCV_CACHE_DIR = ".cache/ohlcv"
+ohlcv_cache = shared_ohlcv_cache(OHLCV_CACHE_DIR) if OHLCV_CACHE_DIR else None
+
+# 🧮 Streaming indicators: set a directory to update indicators bar-by-bar and keep their state across runs (None uses pandas_ta)
+INDICATOR_STATE_DIR = None  # e.g. ".cache/indicators/spot"
+indicator_store = IndicatorEngineStore(INDICATOR_STATE_DIR) if INDICATOR_STATE_DIR else None
+
+# 🧊 Panel signals: score the latest bar of every symbol in one vectorized pass
+USE_PANEL_SIGNALS = False
+
+# 🧮 Parallel indicators: compute indicators for the whole scan on a process pool (0 = in this process, None = one per core)
+INDICATOR_WORKERS = 0
+indicator_pool = None
 
-def send_discord_alert(message):
-    try:
-        response = requests.post(DISCORD_WEBHOOK_URL, json={"content": message})
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to send alert: {e}")
+# 🧱 Bar store: keep each symbol's bars and streaming indicators in preallocated NumPy buffers across scans, so a scan only appends the new candles (no DataFrames; takes over from the indicator options above, except with MTF_TIMEFRAMES)
+USE_BAR_STORE = False
+BAR_STORE_CAPACITY = 200  # bars kept per symbol; memory per symbol is fixed (BarStore.bytes_per_symbol)
+bar_store = None
+
+# 🌐 Whole-market scan: set a quote currency (e.g. "USDT") to scan every active spot market quoted in it instead of the watchlist
+SCAN_ALL_QUOTE = None
+
+# 🔎 Pre-screen: drop illiquid markets with one fetch_tickers request before any candles are fetched (None skips a check)
+PRESCREEN_MIN_VOLUME = None  # 24h volume in the quote currency, e.g. 1_000_000
+PRESCREEN_MIN_PRICE = None
+PRESCREEN_MAX_SPREAD = None  # bid/ask spread as a fraction of the mid, e.g. 0.005
+
+# 🧩 Sharded scan: split the watchlist (every listed market with SCAN_ALL_QUOTE) across bot processes on one or more hosts sharing this SQLite file; each bar is scanned once and a dead worker's shards are taken over
+SHARD_DB = None  # e.g. "/mnt/shared/spot-shards.sqlite"
+SHARD_COUNT = 64
+SHARD_LEASE_SECONDS = 120  # a worker silent for this long is considered dead
+SHARD_WORKER = None  # defaults to host:pid
+shard_coordinator = None
+
+# 🧭 Multi-timeframe: confirm TIMEFRAME signals on these timeframes as well; only the finest of them is fetched and the rest are resampled from it
+MTF_TIMEFRAMES = []  # e.g. ["4h"] or ["30m", "4h"]
+MTF_MIN_CONFLUENCE = 1  # timeframes (TIMEFRAME included) that must agree before an alert goes out
+MTF_LIMIT = 720  # bars fetched at the finest timeframe, enough for the indicators on the highest one
+
+# 📈 Metrics: stage latency histograms, fetch bytes, rate-limit waits, errors by type and alert latency in Prometheus format (both None disables them)
+METRICS_PORT = None  # e.g. 9108 serves http://127.0.0.1:9108/metrics
+METRICS_FILE = None  # e.g. ".cache/metrics/spot.prom", rewritten after every scan
+PROFILE_SCAN = None  # e.g. ".cache/profile/spot.pstats" to cProfile the next scan
+if configure_metrics("spot", METRICS_PORT, METRICS_FILE, PROFILE_SCAN):
+    instrument_exchange(exchange)
+
+@timed("spot", "alert")
+def send_discord_alert(message, on_delivered=None):
+    return send_alert(DISCORD_WEBHOOK_URL, message, alert_dispatcher, on_delivered)
+
+@timed("spot", "fetch")
+def get_crypto_ohlcv(symbol="BTC/USDT", timeframe="1h", limit=200):
+    if ohlcv_cache is not None:
+        return fetch_ohlcv_cached(exchange, ohlcv_cache, symbol, timeframe, limit, exchange_id=EXCHANGE_ID)
+    return exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
 
 def get_crypto_data(symbol="BTC/USDT", timeframe="1h", limit=200):
-    ohlcv = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
-    df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-    df.set_index("timestamp", inplace=True)
-    return df
+    return ohlcv_to_df(get_crypto_ohlcv(symbol, timeframe, limit))
+
+def fetch_timeframe():
+    return ordered_timeframes(TIMEFRAME, MTF_TIMEFRAMES)[0]
 
+def fetch_limit():
+    return MTF_LIMIT if MTF_TIMEFRAMES else 200
+
+@timed("spot", "indicators")
 def calculate_indicators(df):
-    df["RSI"] = ta.rsi(df["close"], length=14)
-    macd = ta.macd(df["close"])
-    df["MACD_Hist"] = macd["MACDh_12_26_9"]
-    df["EMA_50"] = ta.ema(df["close"], length=50)
-    df["ATR_14"] = ta.atr(df["high"], df["low"], df["close"], length=14)
-    bbands = ta.bbands(df["close"], length=20, std=2)
-    df["BBL"] = bbands["BBL_20_2.0"]
-    df["BBM"] = bbands["BBM_20_2.0"]
-    df["BBU"] = bbands["BBU_20_2.0"]
-    stochrsi = ta.stochrsi(df["close"], length=14)
-    df["StochRSI_K"] = stochrsi.iloc[:, 0]
-    df["StochRSI_D"] = stochrsi.iloc[:, 1]
-    df.dropna(inplace=True)
-    return df
+    return add_crypto_indicators(df)
 
+@timed("spot", "signals")
 def check_signals(df):
-    latest = df.iloc[-1]
-
-    buy_conditions = [
-        latest["RSI"] < 40,
-        latest["MACD_Hist"] > 0,
-        latest["close"] > latest["EMA_50"],
-        latest["StochRSI_K"] > latest["StochRSI_D"],
-        latest["close"] < latest["BBL"],
-        latest["ATR_14"] > 0
-    ]
-
-    short_conditions = [
-        latest["RSI"] > 60,
-        latest["MACD_Hist"] < 0,
-        latest["close"] < latest["EMA_50"],
-        latest["StochRSI_K"] < latest["StochRSI_D"],
-        latest["close"] > latest["BBU"],
-        latest["ATR_14"] > 0
-    ]
-
-    buy_score = sum(buy_conditions)
-    short_score = sum(short_conditions)
-
-    if buy_score >= 3:
-        return "BUY", latest, buy_score
-    elif short_score >= 3:
-        return "SHORT", latest, short_score
+    return check_crypto_signal(df)
+
+@timed("spot", "indicators")
+def calculate_indicators_streaming(symbol, df):
+    return indicator_store.update_from_frame(symbol, df)
+
+def get_bar_store():
+    global bar_store
+    if bar_store is None:
+        bar_store = BarStore(BAR_STORE_CAPACITY, timeframe_ms=timeframe_to_ms(TIMEFRAME))
+    return bar_store
+
+@timed("spot", "indicators")
+def update_bar_store(symbol, ohlcv):
+    return get_bar_store().update(symbol, ohlcv)
+
+@timed("spot", "signals")
+def check_bar_signals(latest):
+    return check_crypto_bar(latest)
+
+def prepare_crypto_frame(symbol, df):
+    if df.empty:
+        print(f"⚠️ No data for {symbol}")
+        return None
+
+    if indicator_store is not None:
+        df = calculate_indicators_streaming(symbol, df)
+    else:
+        df = calculate_indicators(df)
+    if df.empty:
+        print(f"⚠️ Indicators could not be calculated for {symbol}")
+        return None
+    return df
+
+def get_indicator_pool():
+    global indicator_pool
+    if indicator_pool is None:
+        indicator_pool = IndicatorPool("crypto", workers=INDICATOR_WORKERS)
+        atexit.register(indicator_pool.close)
+    return indicator_pool
+
+def prepare_crypto_frames(frames):
+    if INDICATOR_WORKERS == 0 or indicator_store is not None:
+        prepared = {}
+        for symbol, df in frames.items():
+            try:
+                df = prepare_crypto_frame(symbol, df)
+                if df is not None:
+                    prepared[symbol] = df
+            except Exception as e:
+                print(f"❌ Error processing {symbol}: {e}")
+        return prepared
+
+    for symbol, df in frames.items():
+        if df.empty:
+            print(f"⚠️ No data for {symbol}")
+    prepared = {}
+    for symbol, df in get_indicator_pool().compute(frames).items():
+        if df.empty:
+            print(f"⚠️ Indicators could not be calculated for {symbol}")
+        else:
+            prepared[symbol] = df
+    return prepared
+
+@timed("spot", "prescreen")
+def prescreen_watchlist(symbols):
+    kept, _rejected = prescreen_exchange(exchange, symbols, PRESCREEN_MIN_VOLUME, PRESCREEN_MIN_PRICE, PRESCREEN_MAX_SPREAD)
+    return kept
+
+def market_watchlist(symbols):
+    if SCAN_ALL_QUOTE:
+        return quote_markets(exchange, SCAN_ALL_QUOTE, "spot")
+    return symbols
+
+def resolve_watchlist(symbols):
+    return prescreen_watchlist(market_watchlist(symbols))
+
+def retain_bars(symbols):
+    if bar_store is not None:
+        bar_store.retain(symbols)
+
+def analyze_crypto_symbol(symbol, df):
+    if MTF_TIMEFRAMES:
+        return analyze_crypto_timeframes(symbol, df)
+
+    df = prepare_crypto_frame(symbol, df)
+    if df is None:
+        return
+
+    signal, latest, score = check_signals(df)
+    report_crypto_signal(symbol, df, signal, latest, score)
+
+def analyze_crypto_bars(symbol, ohlcv):
+    if not ohlcv:
+        print(f"⚠️ No data for {symbol}")
+        return
+
+    latest = update_bar_store(symbol, ohlcv)
+    if latest is None:
+        print(f"⚠️ Indicators could not be calculated for {symbol}")
+        return
+
+    signal, latest, score = check_bar_signals(latest)
+    report_crypto_signal(symbol, get_bar_store().bars(symbol), signal, latest, score)
+
+def analyze_crypto_panel(frames):
+    prepared = prepare_crypto_frames(frames)
+    panel = evaluate_crypto_panel(prepared, labels=("BUY", "SHORT"))
+    for symbol, signal, score in zip(panel.index, panel["signal"], panel["score"]):
+        try:
+            df = prepared[symbol]
+            report_crypto_signal(symbol, df, signal, df.iloc[-1], score)
+        except Exception as e:
+            print(f"❌ Error processing {symbol}: {e}")
+
+def analyze_crypto_timeframes(symbol, df):
+    # pandas_ta on every timeframe; the streaming store, panel and process pool only cover TIMEFRAME scans
+    if df.empty:
+        print(f"⚠️ No data for {symbol}")
+        return
+
+    analyzed = analyze_timeframes(df, TIMEFRAME, MTF_TIMEFRAMES, calculate_indicators, check_signals, MTF_MIN_CONFLUENCE)
+    if analyzed is None:
+        print(f"⚠️ Indicators could not be calculated for {symbol}")
+        return
+    df, signal, latest, score, confluence = analyzed
+    report_crypto_signal(symbol, df, signal, latest, score, confluence)
+
+def analyze_crypto_frames(frames):
+    if MTF_TIMEFRAMES:
+        for symbol, df in frames.items():
+            try:
+                analyze_crypto_timeframes(symbol, df)
+            except Exception as e:
+                print(f"❌ Error processing {symbol}: {e}")
+        return
+
+    if USE_PANEL_SIGNALS:
+        return analyze_crypto_panel(frames)
+
+    for symbol, df in prepare_crypto_frames(frames).items():
+        try:
+            signal, latest, score = check_signals(df)
+            report_crypto_signal(symbol, df, signal, latest, score)
+        except Exception as e:
+            print(f"❌ Error processing {symbol}: {e}")
+
+def is_new_signal(symbol, signal, score, latest):
+    # With a signal state store, repeats of an alert already sent are dropped here, before the costly work
+    if signal_state is None:
+        return True
+    return signal_state.check("spot", symbol, signal, score, latest.name)
+
+def delivery_recorder(symbol, signal, score, latest):
+    # Records the alert in the signal state store once Discord has accepted it
+    if signal_state is None:
+        return None
+    return signal_state.recorder("spot", symbol, signal, score, latest.name)
+
+@timed("spot", "report")
+def report_crypto_signal(symbol, df, signal, latest, score, confluence=None):
+    if latest["volume"] < 10:
+        print(f"⚠️ Low volume for {symbol} — skipping")
+        return
+    if not is_new_signal(symbol, signal, score, latest):
+        return
+
+    confluence_line = f"\n> 🧭 Confluence: {confluence}" if confluence else ""
+
+    if signal == "BUY":
+        msg = (
+            f"🚨 **BUY SIGNAL** for `{symbol}`\n"
+            f"> Price: **${latest['close']:.4f}**\n"
+            f"> RSI: {latest['RSI']:.2f}, MACD Hist: {latest['MACD_Hist']:.2f}\n"
+            f"> StochRSI: K={latest['StochRSI_K']:.2f}, D={latest['StochRSI_D']:.2f}\n"
+            f"> ATR: {latest['ATR_14']:.2f}, EMA50: {latest['EMA_50']:.2f}\n"
+            f"> Bollinger Lower Band: {latest['BBL']:.2f}\n"
+            f"> 🔍 Confidence Score: {score}/6\n"
+            f"> Time: {latest.name.strftime('%Y-%m-%d %H:%M:%S')}"
+        )
+        return send_discord_alert(msg + confluence_line, delivery_recorder(symbol, signal, score, latest))
+
+    elif signal == "SHORT":
+        msg = (
+            f"⚠️ **SHORT SIGNAL** for `{symbol}`\n"
+            f"> Price: **${latest['close']:.4f}**\n"
+            f"> RSI: {latest['RSI']:.2f}, MACD Hist: {latest['MACD_Hist']:.2f}\n"
+            f"> StochRSI: K={latest['StochRSI_K']:.2f}, D={latest['StochRSI_D']:.2f}\n"
+            f"> ATR: {latest['ATR_14']:.2f}, EMA50: {latest['EMA_50']:.2f}\n"
+            f"> Bollinger Upper Band: {latest['BBU']:.2f}\n"
+            f"> 🔍 Confidence Score: {score}/6\n"
+            f"> Time: {latest.name.strftime('%Y-%m-%d %H:%M:%S')}"
+        )
+        return send_discord_alert(msg + confluence_line, delivery_recorder(symbol, signal, score, latest))
+
     else:
-        return None, latest, 0
+        print(f"⛔ No signal for {symbol} at {latest.name}")
 
+@scan("spot")
 def run_crypto_bot(crypto_watchlist):
+    if SHARD_DB:
+        return run_crypto_bot_sharded(crypto_watchlist)
+    if USE_ASYNC_SCAN:
+        return run_crypto_bot_async(crypto_watchlist)
+    crypto_watchlist = resolve_watchlist(crypto_watchlist)
+    retain_bars(crypto_watchlist)
+    scan_crypto_watchlist(crypto_watchlist)
+
+def scan_crypto_watchlist(crypto_watchlist):
+    if USE_BAR_STORE and not MTF_TIMEFRAMES:
+        for symbol in crypto_watchlist:
+            try:
+                analyze_crypto_bars(symbol, get_crypto_ohlcv(symbol, TIMEFRAME, fetch_limit()))
+            except Exception as e:
+                print(f"❌ Error processing {symbol}: {e}")
+        return
+
+    if USE_PANEL_SIGNALS or INDICATOR_WORKERS != 0:
+        frames = {}
+        for symbol in crypto_watchlist:
+            try:
+                frames[symbol] = get_crypto_data(symbol, fetch_timeframe(), fetch_limit())
+            except Exception as e:
+                print(f"❌ Error processing {symbol}: {e}")
+        return analyze_crypto_frames(frames)
+
     for symbol in crypto_watchlist:
         try:
-            df = get_crypto_data(symbol)
-            if df.empty:
-                print(f"⚠️ No data for {symbol}")
-                continue
+            df = get_crypto_data(symbol, fetch_timeframe(), fetch_limit())
+            analyze_crypto_symbol(symbol, df)
+        except Exception as e:
+            print(f"❌ Error processing {symbol}: {e}")
 
-            df = calculate_indicators(df)
-            if df.empty:
-                print(f"⚠️ Indicators could not be calculated for {symbol}")
-                continue
+def async_exchange_config():
+    # The async throttler reads rateLimit once, so sharded workers on this host split it up front
+    if not SHARD_DB:
+        return EXCHANGE_CONFIG
+    share = get_shard_coordinator().rate_limit_share()
+    return {**EXCHANGE_CONFIG, "rateLimit": base_rate_limit(exchange) * share}
 
-            signal, latest, score = check_signals(df)
+def get_async_scanner():
+    global async_scanner
+    if async_scanner is None:
+        async_scanner = AsyncOHLCVScanner(lambda: make_async_exchange(EXCHANGE_ID, async_exchange_config()))
+        atexit.register(async_scanner.close)
+    return async_scanner
 
-            if latest["volume"] < 10:
-                print(f"⚠️ Low volume for {symbol} — skipping")
-                continue
-
-            if signal == "BUY":
-                msg = (
-                    f"🚨 **BUY SIGNAL** for `{symbol}`\n"
-                    f"> Price: **${latest['close']:.4f}**\n"
-                    f"> RSI: {latest['RSI']:.2f}, MACD Hist: {latest['MACD_Hist']:.2f}\n"
-                    f"> StochRSI: K={latest['StochRSI_K']:.2f}, D={latest['StochRSI_D']:.2f}\n"
-                    f"> ATR: {latest['ATR_14']:.2f}, EMA50: {latest['EMA_50']:.2f}\n"
-                    f"> Bollinger Lower Band: {latest['BBL']:.2f}\n"
-                    f"> 🔍 Confidence Score: {score}/6\n"
-                    f"> Time: {latest.name.strftime('%Y-%m-%d %H:%M:%S')}"
-                )
-                send_discord_alert(msg)
-
-            elif signal == "SHORT":
-                msg = (
-                    f"⚠️ **SHORT SIGNAL** for `{symbol}`\n"
-                    f"> Price: **${latest['close']:.4f}**\n"
-                    f"> RSI: {latest['RSI']:.2f}, MACD Hist: {latest['MACD_Hist']:.2f}\n"
-                    f"> StochRSI: K={latest['StochRSI_K']:.2f}, D={latest['StochRSI_D']:.2f}\n"
-                    f"> ATR: {latest['ATR_14']:.2f}, EMA50: {latest['EMA_50']:.2f}\n"
-                    f"> Bollinger Upper Band: {latest['BBU']:.2f}\n"
-                    f"> 🔍 Confidence Score: {score}/6\n"
-                    f"> Time: {latest.name.strftime('%Y-%m-%d %H:%M:%S')}"
-                )
-                send_discord_alert(msg)
+def run_crypto_bot_async(crypto_watchlist, concurrency=SCAN_CONCURRENCY, timeout=SCAN_TIMEOUT, exchange_factory=None):
+    crypto_watchlist = resolve_watchlist(crypto_watchlist)
+    retain_bars(crypto_watchlist)
+    scan_crypto_watchlist_async(crypto_watchlist, concurrency, timeout, exchange_factory)
 
-            else:
-                print(f"⛔ No signal for {symbol} at {df.index[-1]}")
+def scan_crypto_watchlist_async(crypto_watchlist, concurrency=SCAN_CONCURRENCY, timeout=SCAN_TIMEOUT, exchange_factory=None):
+    timeframe, limit = fetch_timeframe(), fetch_limit()
+    since = {}
+    if ohlcv_cache is not None:
+        since = {symbol: ohlcv_cache.since(EXCHANGE_ID, symbol, timeframe, limit) for symbol in crypto_watchlist}
 
+    scan_args = dict(timeframe=timeframe, limit=limit, concurrency=concurrency, timeout=timeout, since=since)
+    if exchange_factory is not None:
+        results, _errors = scan_ohlcv(exchange_factory, crypto_watchlist, **scan_args)
+    else:
+        # Reuses one exchange and event loop across scans (matters in daemon mode)
+        results, _errors = get_async_scanner().scan(crypto_watchlist, **scan_args)
+
+    use_bar_store = USE_BAR_STORE and not MTF_TIMEFRAMES
+    frames = {}
+    for symbol in crypto_watchlist:
+        if symbol not in results:
+            continue
+        try:
+            ohlcv = results[symbol]
+            if ohlcv_cache is not None:
+                ohlcv = ohlcv_cache.update(EXCHANGE_ID, symbol, timeframe, ohlcv, limit, replace=since.get(symbol) is None)
+            if use_bar_store:
+                analyze_crypto_bars(symbol, ohlcv)
+            else:
+                frames[symbol] = ohlcv_to_df(ohlcv)
         except Exception as e:
             print(f"❌ Error processing {symbol}: {e}")
 
+    if not use_bar_store:
+        analyze_crypto_frames(frames)
+
+def get_shard_coordinator():
+    global shard_coordinator
+    if shard_coordinator is None:
+        shard_coordinator = ShardCoordinator(SHARD_DB, "spot", SHARD_COUNT, SHARD_LEASE_SECONDS, SHARD_WORKER)
+        atexit.register(shard_coordinator.leave)
+    return shard_coordinator
+
+def run_crypto_bot_sharded(crypto_watchlist):
+    coordinator = get_shard_coordinator()
+    symbols = market_watchlist(crypto_watchlist)
+    period_ms = timeframe_to_ms(TIMEFRAME)
+    period = int(time.time() * 1000) // period_ms * period_ms
+
+    def scan_shards(shard_symbols):
+        share_rate_limit(exchange, coordinator.rate_limit_share())
+        shard_symbols = prescreen_watchlist(shard_symbols)
+        if USE_ASYNC_SCAN:
+            scan_crypto_watchlist_async(shard_symbols)
+        else:
+            scan_crypto_watchlist(shard_symbols)
+
+    scanned = coordinator.run(symbols, scan_shards, period)
+    retain_bars(scanned)
+    print(f"🧩 {coordinator.worker} scanned {len(scanned)} of {len(symbols)} symbols for this {TIMEFRAME} bar")
+
+def analyze_closed_bars(symbol, ohlcv):
+    # Stream mode: called on the stream's worker thread with the closed bars of fetch_timeframe()
+    if MTF_TIMEFRAMES:
+        if (ohlcv[-1][0] + timeframe_to_ms(fetch_timeframe())) % timeframe_to_ms(TIMEFRAME):
+            return  # a finer bar inside a TIMEFRAME bar that is still forming
+        return analyze_crypto_timeframes(symbol, ohlcv_to_df(ohlcv))
+    if USE_BAR_STORE:
+        return analyze_crypto_bars(symbol, ohlcv)
+    analyze_crypto_symbol(symbol, ohlcv_to_df(ohlcv))
+
+def warm_bar_store(symbol, ohlcv):
+    # Stream mode: indicators are computed from the seeded history before the first close arrives
+    update_bar_store(symbol, ohlcv)
+
+def run_stream(crypto_watchlist, exchange_factory=None, duration=None):
+    crypto_watchlist = resolve_watchlist(crypto_watchlist)
+    exchange_factory = exchange_factory or (lambda: make_pro_exchange(EXCHANGE_ID, EXCHANGE_CONFIG))
+    stream = OHLCVStream(exchange_factory, crypto_watchlist, fetch_timeframe(), analyze_closed_bars, fetch_limit(),
+                         STREAM_GRACE_SECONDS, STREAM_BATCH_SIZE, SCAN_CONCURRENCY,
+                         on_seed=warm_bar_store if USE_BAR_STORE and not MTF_TIMEFRAMES else None)
+    stream.run(duration)
+    return stream
+
+def run_daemon(crypto_watchlist, grace_seconds=DAEMON_GRACE_SECONDS):
+    # Keeps the exchange, markets and caches warm between scans
+    scheduler = BarCloseScheduler(grace_seconds)
+    scheduler.add_job("Crypto spot", TIMEFRAME, run_crypto_bot, crypto_watchlist)
+    scheduler.run_forever()
+
 # 👇 You can expand or adjust the list freely
 # crypto_watchlist = [
 #     "BTC/USDT", "ETH/USDT", "SOL/USDT", "DOGE/USDT",
@@ -140,5 +484,10 @@ crypto_watchlist = [
 ]
 
 
-
-run_crypto_bot(crypto_watchlist)
+if __name__ == "__main__":
+    if STREAM_MODE or "--stream" in sys.argv:
+        run_stream(crypto_watchlist)
+    elif DAEMON_MODE or "--daemon" in sys.argv:
+        run_daemon(crypto_watchlist)
+    else:
+        run_crypto_bot(crypto_watchlist)
@@ -1,167 +1,326 @@
-import yfinance as yf
 import pandas as pd
-import pandas_ta as ta
-import datetime
-import requests
+import atexit
+import sys
+import time
+
+from signal_pipeline.yf_batch import (
+    download_bars, download_ticker, is_data_fresh, prepare_stock_frame, prepare_stock_frames, usable_stock_frame,
+)
+from signal_pipeline.parallel_indicators import IndicatorPool
+from signal_pipeline.levels import detect_support_resistance
+from signal_pipeline.panel import check_equity_signal, evaluate_equity_panel
+from signal_pipeline.scheduler import BarCloseScheduler
+from signal_pipeline.alerts import get_dispatcher, send_alert
+from signal_pipeline.indicator_engine import IndicatorEngineStore
+from signal_pipeline.indicators import add_equity_indicators
+from signal_pipeline.timeframes import analyze_timeframes, ordered_timeframes
+from signal_pipeline.metrics import configure_metrics, scan, timed
+from signal_pipeline.prescreen import prescreen_stocks
+from signal_pipeline.signal_state import SignalStateStore
+from signal_pipeline.market_data import MarketDataClient
+from signal_pipeline.market_calendar import get_calendar, scan_gate
 
 DISCORD_WEBHOOK_URL = "https://discord.com/api/webhooks/1399849142116814868/I-PCwu9QNdUYTEIJhAdoZQwX1gjt-mwntbQI2c5X4g6nzX9R8Q1eKUwmysOwJDEfESxk"
 
-def send_discord_alert(message):
-    try:
-        response = requests.post(DISCORD_WEBHOOK_URL, json={"content": message})
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to send alert: {e}")
+# 🔁 Signal state: remember sent alerts in SQLite so a signal that keeps holding is not re-sent every run (None disables it)
+SIGNAL_STATE_DB = None  # e.g. ".cache/signals.sqlite", can be shared by all bots
+ALERT_COOLDOWN = 0  # seconds before the same side may alert again for a ticker, e.g. 2 * 3600
+ALERT_ON_SCORE_CHANGE = False  # while a signal keeps holding, re-alert only when its score changes
+signal_state = SignalStateStore(SIGNAL_STATE_DB, ALERT_COOLDOWN, ALERT_ON_SCORE_CHANGE) if SIGNAL_STATE_DB else None
 
-def get_stock_data(ticker, period="5d", interval="5m"):
-    print(f"📥 Downloading historical data for {ticker}...")
-    df = yf.download(ticker, period=period, interval=interval, auto_adjust=True, group_by='ticker')
-
-    if isinstance(df.columns, pd.MultiIndex):
-        df = df[ticker]
-
-    if df.empty or "Close" not in df.columns:
-        print(f"⚠️ No usable 'Close' data for {ticker}")
-        return pd.DataFrame()
-
-    if "Volume" not in df.columns or df["Volume"].iloc[-1] < 500000:
-        print(f"⚠️ Low volume for {ticker} ({df['Volume'].iloc[-1] if 'Volume' in df.columns else 'N/A'}), skipping")
-        return pd.DataFrame()
-
-    try:
-        df["RSI"] = ta.rsi(df["Close"], length=14)
-        macd = ta.macd(df["Close"])
-        df["MACD_Hist"] = macd["MACDh_12_26_9"] if macd is not None else pd.NA
-        df["EMA_50"] = ta.ema(df["Close"], length=50)
-        bb = ta.bbands(df["Close"], length=20)
-        df["BB_Lower"] = bb["BBL_20_2.0"]
-        df["BB_Upper"] = bb["BBU_20_2.0"]
-        stoch = ta.stoch(df["High"], df["Low"], df["Close"])
-        df["Stoch_K"] = stoch["STOCHk_14_3_3"]
-        df["Stoch_D"] = stoch["STOCHd_14_3_3"]
-        df.dropna(inplace=True)
-        return df
-
-    except Exception as e:
-        print(f"❌ Error calculating indicators for {ticker}: {e}")
-        return pd.DataFrame()
-
-def is_data_fresh(df, tolerance_days=2):
-    last_date = df.index[-1].date()
-    today = datetime.date.today()
-    return (today - last_date).days <= tolerance_days
+# 📨 Background alerts: queue alerts and post them from a worker thread, batched and rate-limit aware
+USE_ALERT_DISPATCHER = False
+alert_dispatcher = get_dispatcher(DISCORD_WEBHOOK_URL) if USE_ALERT_DISPATCHER else None
 
-def check_signal(df):
-    latest = df.iloc[-1]
-    close = latest["Close"]
-
-    conditions_buy = [
-        latest["RSI"] < 40,
-        latest["MACD_Hist"] >= 0,
-        close >= latest["EMA_50"],
-        close <= latest["BB_Lower"] * 1.02,
-        latest["Stoch_K"] < 30
-    ]
-
-    conditions_short = [
-        latest["RSI"] > 60,
-        latest["MACD_Hist"] <= 0,
-        close <= latest["EMA_50"],
-        close >= latest["BB_Upper"] * 0.98,
-        latest["Stoch_K"] > 70
-    ]
-
-    buy_count = sum(conditions_buy)
-    short_count = sum(conditions_short)
-
-    if buy_count >= 2:
-        return "BUY", latest, buy_count
-    elif short_count >= 2:
-        return "SHORT", latest, short_count
-    else:
-        return None, latest, 0
+# 📦 Tickers per yf.download call when fetching the watchlist in bulk
+DOWNLOAD_CHUNK_SIZE = 50
 
-def detect_support_resistance(df, lookback=60):
-    support_levels = []
-    resistance_levels = []
+PERIOD = "5d"
+INTERVAL = "5m"
 
-    for i in range(lookback, len(df) - lookback):
-        if df['Low'].iloc[i] < min(df['Low'].iloc[i - lookback:i]) and df['Low'].iloc[i] < min(df['Low'].iloc[i+1:i+lookback+1]):
-            support_levels.append(df['Low'].iloc[i])
-        if df['High'].iloc[i] > max(df['High'].iloc[i - lookback:i]) and df['High'].iloc[i] > max(df['High'].iloc[i+1:i+lookback+1]):
-            resistance_levels.append(df['High'].iloc[i])
+# 🔎 Pre-screen: drop illiquid tickers using one daily-bar download per chunk before the intraday history (None skips a check)
+PRESCREEN_MIN_VOLUME = None  # average daily shares over PRESCREEN_PERIOD, e.g. 5_000_000
+PRESCREEN_MIN_PRICE = None
+PRESCREEN_PERIOD = "5d"
 
-    def filter_levels(levels, threshold=0.02):
-        filtered = []
-        for lvl in levels:
-            if all(abs(lvl - f) / f > threshold for f in filtered):
-                filtered.append(lvl)
-        return sorted(filtered)
+# 🕰 Daemon mode: keep running and scan a few seconds after every bar close (or pass --daemon)
+DAEMON_MODE = False
+DAEMON_GRACE_SECONDS = 15.0
 
-    return filter_levels(support_levels), filter_levels(resistance_levels)
+# 📅 Market calendar: skip downloads outside exchange sessions (weekends, holidays, half-day afternoons, overnight) using the bundled offline table, and sleep until the next open in daemon mode (None always downloads)
+MARKET_CALENDAR = None  # "NYSE"
+last_scanned_bar = None
 
-def run_equities_bot(tickers):
+# 🧮 Streaming indicators: set a directory to update indicators bar-by-bar and keep their state across runs (None uses pandas_ta)
+INDICATOR_STATE_DIR = None  # e.g. ".cache/indicators/equities"
+indicator_store = IndicatorEngineStore(INDICATOR_STATE_DIR) if INDICATOR_STATE_DIR else None
+
+# 🧊 Panel signals: score the latest bar of every ticker in one vectorized pass
+USE_PANEL_SIGNALS = False
+
+# 🧮 Parallel indicators: compute indicators for the whole download on a process pool (0 = in this process, None = one per core)
+INDICATOR_WORKERS = 0
+indicator_pool = None
+
+# 🧭 Multi-timeframe: confirm INTERVAL signals on these timeframes as well; only the finest of them is downloaded and the rest are resampled from it
+MTF_TIMEFRAMES = []  # e.g. ["15m", "1h"]
+MTF_MIN_CONFLUENCE = 1  # timeframes (INTERVAL included) that must agree before an alert goes out
+MTF_PERIOD = "1mo"  # history downloaded in this mode so the highest timeframe has enough bars (Yahoo keeps 60 days of intraday bars)
+SESSION_OFFSET = "30min"  # resampled hourly bars start at the 9:30 open, like Yahoo's own
+
+# 🛰 Shared market data: get bars and indicators from the local service (python -m signal_pipeline.market_data) shared with the other stock bot, so overlapping tickers are downloaded and computed once per bar (None downloads directly; takes over from the indicator options above)
+MARKET_DATA_SOCKET = None  # e.g. "/tmp/signal-market-data.sock", the same path for the equities and options bots
+market_data = None
+
+# 📈 Metrics: stage latency histograms, download rows, errors by type and alert latency in Prometheus format (both None disables them)
+METRICS_PORT = None  # e.g. 9108 serves http://127.0.0.1:9108/metrics
+METRICS_FILE = None  # e.g. ".cache/metrics/equities.prom", rewritten after every scan
+PROFILE_SCAN = None  # e.g. ".cache/profile/equities.pstats" to cProfile the next scan
+configure_metrics("equities", METRICS_PORT, METRICS_FILE, PROFILE_SCAN)
+
+@timed("equities", "alert")
+def send_discord_alert(message, on_delivered=None):
+    return send_alert(DISCORD_WEBHOOK_URL, message, alert_dispatcher, on_delivered)
+
+def get_stock_data(ticker, period="5d", interval="5m"):
+    return prepare_stock_data(ticker, download_ticker(ticker, period=period, interval=interval))
+
+def get_stock_data_bulk(tickers, period="5d", interval="5m", chunk_size=None):
+    if MARKET_DATA_SOCKET:
+        frames = fetch_shared_data(tickers, period, interval)
+        if frames is not None:
+            return frames
+    return prepare_stock_data_bulk(download_stock_data(tickers, period, interval, chunk_size))
+
+def get_market_data():
+    global market_data
+    if market_data is None:
+        market_data = MarketDataClient(MARKET_DATA_SOCKET)
+    return market_data
+
+@timed("equities", "fetch")
+def fetch_shared_data(tickers, period="5d", interval="5m", indicators=True):
+    # None when the service is unreachable, so the scan falls back to downloading itself
+    return get_market_data().frames(tickers, period, interval, indicators)
+
+@timed("equities", "fetch")
+def download_stock_data(tickers, period="5d", interval="5m", chunk_size=None):
+    return download_bars(tickers, period=period, interval=interval, chunk_size=chunk_size or DOWNLOAD_CHUNK_SIZE)
+
+@timed("equities", "indicators")
+def prepare_stock_data_bulk(frames):
+    pool = get_indicator_pool() if INDICATOR_WORKERS != 0 else None
+    return prepare_stock_frames(frames, indicator_store, pool)
+
+@timed("equities", "indicators")
+def calculate_indicators(df):
+    return add_equity_indicators(df)
+
+def get_indicator_pool():
+    global indicator_pool
+    if indicator_pool is None:
+        indicator_pool = IndicatorPool("equity", workers=INDICATOR_WORKERS)
+        atexit.register(indicator_pool.close)
+    return indicator_pool
+
+@timed("equities", "indicators")
+def prepare_stock_data(ticker, df):
+    return prepare_stock_frame(ticker, df, indicator_store)
+
+@timed("equities", "signals")
+def check_signal(df):
+    return check_equity_signal(df)
+
+def get_stock_data_timeframes(tickers, chunk_size=None):
+    # Raw bars at the finest timeframe; indicators are computed per timeframe after resampling
+    interval = ordered_timeframes(INTERVAL, MTF_TIMEFRAMES)[0]
+    if MARKET_DATA_SOCKET:
+        frames = fetch_shared_data(tickers, MTF_PERIOD, interval, indicators=False)
+        if frames is not None:
+            return frames
+    return download_stock_data(tickers, MTF_PERIOD, interval, chunk_size)
+
+def check_timeframes(ticker, df_stock):
+    # (df, signal, latest, confidence, confluence) on INTERVAL, or None when the ticker is skipped
+    if df_stock.empty or not is_data_fresh(df_stock):
+        print(f"⚠️ Skipping {ticker}: No fresh or valid stock data.")
+        return None
+    if not usable_stock_frame(ticker, df_stock):
+        return None
+
+    analyzed = analyze_timeframes(
+        df_stock, INTERVAL, MTF_TIMEFRAMES, calculate_indicators, check_signal, MTF_MIN_CONFLUENCE, offset=SESSION_OFFSET,
+    )
+    if analyzed is None:
+        print(f"⚠️ Skipping {ticker}: Not enough {INTERVAL} bars for indicators.")
+    return analyzed
+
+def is_new_signal(ticker, signal, confidence, latest):
+    # With a signal state store, repeats of an alert already sent are dropped here, before the support/resistance work
+    if signal_state is None:
+        return True
+    return signal_state.check("equities", ticker, signal, confidence, latest.name)
+
+def delivery_recorder(ticker, signal, confidence, latest):
+    # Records the alert in the signal state store once Discord has accepted it
+    if signal_state is None:
+        return None
+    return signal_state.recorder("equities", ticker, signal, confidence, latest.name)
+
+def analyze_equity(ticker, df_stock):
+    print(f"\n🔍 Scanning {ticker}...")
+
+    if df_stock.empty or not is_data_fresh(df_stock):
+        print(f"⚠️ Skipping {ticker}: No fresh or valid stock data.")
+        return
+
+    signal, latest, confidence = check_signal(df_stock)
+    if not is_new_signal(ticker, signal, confidence, latest):
+        return
+    if not signal:
+        print(f"⛔ No signal for {ticker}")
+        return
+
+    report_equity_signal(ticker, df_stock, signal, latest, confidence)
+
+def analyze_equity_timeframes(ticker, df_stock):
+    print(f"\n🔍 Scanning {ticker}...")
+
+    analyzed = check_timeframes(ticker, df_stock)
+    if analyzed is None:
+        return
+    df_stock, signal, latest, confidence, confluence = analyzed
+    if not is_new_signal(ticker, signal, confidence, latest):
+        return
+    if not signal:
+        print(f"⛔ No signal for {ticker}")
+        return
+
+    report_equity_signal(ticker, df_stock, signal, latest, confidence, confluence)
+
+def analyze_equities_panel(tickers, stock_data):
+    fresh = {}
     for ticker in tickers:
         print(f"\n🔍 Scanning {ticker}...")
-
+        df_stock = stock_data.get(ticker, pd.DataFrame())
+        if df_stock.empty or not is_data_fresh(df_stock):
+            print(f"⚠️ Skipping {ticker}: No fresh or valid stock data.")
+            continue
+        fresh[ticker] = df_stock
+
+    panel = evaluate_equity_panel(fresh)
+    for ticker, signal, confidence in zip(panel.index, panel["signal"], panel["score"]):
+        df_stock = fresh[ticker]
+        if not is_new_signal(ticker, signal, confidence, df_stock.iloc[-1]):
+            continue
+        if not signal:
+            print(f"⛔ No signal for {ticker}")
+            continue
         try:
-            df_stock = get_stock_data(ticker)
-            if df_stock.empty or not is_data_fresh(df_stock):
-                print(f"⚠️ Skipping {ticker}: No fresh or valid stock data.")
-                continue
-
-            signal, latest, confidence = check_signal(df_stock)
-            if not signal:
-                print(f"⛔ No signal for {ticker}")
-                continue
-
-            spot_price = latest["Close"]
-            support_levels, resistance_levels = detect_support_resistance(df_stock)
-
-            nearest_support = max([lvl for lvl in support_levels if lvl < spot_price], default=None)
-            nearest_resistance = min([lvl for lvl in resistance_levels if lvl > spot_price], default=None)
-
-            stop, target = None, None
-            if signal == "BUY":
-                if nearest_support:
-                    stop = nearest_support * 0.98
-                if nearest_resistance:
-                    target = nearest_resistance
-            elif signal == "SHORT":
-                if nearest_resistance:
-                    stop = nearest_resistance * 1.02
-                if nearest_support:
-                    target = nearest_support
-
-            msg = (
-                f"📢 **{signal} SIGNAL** for `{ticker}`\n"
-                f"> Spot Price: **${spot_price:.2f}**\n"
-                f"> RSI: {latest['RSI']:.2f}, MACD Hist: {latest['MACD_Hist']:.2f}, "
-                f"Stoch %K: {latest['Stoch_K']:.2f}\n"
-                f"> Confidence Score: `{confidence}/5`\n"
-            )
-
-            if nearest_support:
-                msg += f"> 📉 Support: **${nearest_support:.2f}**\n"
-            else:
-                msg += "> 📉 Support: _Not detected in recent range_\n"
-
-            if nearest_resistance:
-                msg += f"> 📈 Resistance: **${nearest_resistance:.2f}**\n"
-            else:
-                msg += "> 📈 Resistance: _Not detected in recent range_\n"
-
-            if stop and target:
-                msg += f"> 🛑 Stop: **${stop:.2f}**, 🎯 Target: **${target:.2f}**\n"
-            else:
-                msg += "> 🚫 Stop/Target not available due to lack of clear support/resistance\n"
-
-            msg += f"> 🕒 Signal Time: {latest.name.strftime('%Y-%m-%d %H:%M:%S')}"
-            send_discord_alert(msg)
+            report_equity_signal(ticker, df_stock, signal, df_stock.iloc[-1], confidence)
+        except Exception as e:
+            print(f"❌ Error processing {ticker}: {e}")
+
+@timed("equities", "levels")
+def find_levels(df_stock):
+    return detect_support_resistance(df_stock)
+
+@timed("equities", "report")
+def report_equity_signal(ticker, df_stock, signal, latest, confidence, confluence=None):
+    spot_price = latest["Close"]
+    support_levels, resistance_levels = find_levels(df_stock)
+
+    nearest_support = max([lvl for lvl in support_levels if lvl < spot_price], default=None)
+    nearest_resistance = min([lvl for lvl in resistance_levels if lvl > spot_price], default=None)
+
+    stop, target = None, None
+    if signal == "BUY":
+        if nearest_support:
+            stop = nearest_support * 0.98
+        if nearest_resistance:
+            target = nearest_resistance
+    elif signal == "SHORT":
+        if nearest_resistance:
+            stop = nearest_resistance * 1.02
+        if nearest_support:
+            target = nearest_support
+
+    msg = (
+        f"📢 **{signal} SIGNAL** for `{ticker}`\n"
+        f"> Spot Price: **${spot_price:.2f}**\n"
+        f"> RSI: {latest['RSI']:.2f}, MACD Hist: {latest['MACD_Hist']:.2f}, "
+        f"Stoch %K: {latest['Stoch_K']:.2f}\n"
+        f"> Confidence Score: `{confidence}/5`\n"
+    )
+
+    if nearest_support:
+        msg += f"> 📉 Support: **${nearest_support:.2f}**\n"
+    else:
+        msg += "> 📉 Support: _Not detected in recent range_\n"
 
+    if nearest_resistance:
+        msg += f"> 📈 Resistance: **${nearest_resistance:.2f}**\n"
+    else:
+        msg += "> 📈 Resistance: _Not detected in recent range_\n"
+
+    if stop and target:
+        msg += f"> 🛑 Stop: **${stop:.2f}**, 🎯 Target: **${target:.2f}**\n"
+    else:
+        msg += "> 🚫 Stop/Target not available due to lack of clear support/resistance\n"
+
+    if confluence:
+        msg += f"> 🧭 Confluence: {confluence}\n"
+
+    msg += f"> 🕒 Signal Time: {latest.name.strftime('%Y-%m-%d %H:%M:%S')}"
+    return send_discord_alert(msg, delivery_recorder(ticker, signal, confidence, latest))
+
+@timed("equities", "prescreen")
+def prescreen_watchlist(tickers):
+    kept, _rejected = prescreen_stocks(tickers, PRESCREEN_MIN_VOLUME, PRESCREEN_MIN_PRICE, PRESCREEN_PERIOD, DOWNLOAD_CHUNK_SIZE)
+    return kept
+
+def market_bar_due():
+    # With a market calendar, False when there is no new session bar to download since the last scan
+    global last_scanned_bar
+    calendar = get_calendar(MARKET_CALENDAR)
+    if calendar is None:
+        return True
+    bar_close, reason = scan_gate(calendar, time.time(), INTERVAL, last_scanned_bar, DAEMON_GRACE_SECONDS)
+    if bar_close is None:
+        print(f"⏸ Skipping the equities scan: {reason}")
+        return False
+    last_scanned_bar = bar_close
+    return True
+
+@scan("equities")
+def run_equities_bot(tickers):
+    if not market_bar_due():
+        return
+    tickers = prescreen_watchlist(tickers)
+    if MTF_TIMEFRAMES:
+        stock_data = get_stock_data_timeframes(tickers)
+        for ticker in tickers:
+            try:
+                analyze_equity_timeframes(ticker, stock_data.get(ticker, pd.DataFrame()))
+            except Exception as e:
+                print(f"❌ Error processing {ticker}: {e}")
+        return
+
+    stock_data = get_stock_data_bulk(tickers, period=PERIOD, interval=INTERVAL)
+    if USE_PANEL_SIGNALS:
+        return analyze_equities_panel(tickers, stock_data)
+
+    for ticker in tickers:
+        try:
+            analyze_equity(ticker, stock_data.get(ticker, pd.DataFrame()))
         except Exception as e:
             print(f"❌ Error processing {ticker}: {e}")
 
+def run_daemon(tickers, grace_seconds=DAEMON_GRACE_SECONDS):
+    scheduler = BarCloseScheduler(grace_seconds)
+    scheduler.add_job("Equities", INTERVAL, run_equities_bot, tickers, get_calendar(MARKET_CALENDAR))
+    scheduler.run_forever()
+
 # Example stock watchlist
 stock_watchlist = [
     "AAPL", "TSLA", "NVDA", "AMZN", "SPY", "MSFT", "META", "GOOGL", "NFLX", "AMD",
@@ -170,4 +329,8 @@ stock_watchlist = [
     "UPST", "LCID", "AFRM", "T", "PFE", "BBD", "DNA"
 ]
 
-run_equities_bot(stock_watchlist)
+if __name__ == "__main__":
+    if DAEMON_MODE or "--daemon" in sys.argv:
+        run_daemon(stock_watchlist)
+    else:
+        run_equities_bot(stock_watchlist)
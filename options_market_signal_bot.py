@@ -1,117 +1,191 @@
-import yfinance as yf
 import pandas as pd
-import pandas_ta as ta
 import datetime
-import requests
+import atexit
+import sys
+import time
+
+from signal_pipeline.yf_batch import (
+    download_bars, download_ticker, is_data_fresh, prepare_stock_frame, prepare_stock_frames, usable_stock_frame,
+)
+from signal_pipeline.parallel_indicators import IndicatorPool
+from signal_pipeline.levels import detect_support_resistance
+from signal_pipeline.panel import check_equity_signal, evaluate_equity_panel
+from signal_pipeline.scheduler import BarCloseScheduler
+from signal_pipeline.alerts import get_dispatcher, send_alert
+from signal_pipeline.indicator_engine import IndicatorEngineStore
+from signal_pipeline.indicators import add_equity_indicators
+from signal_pipeline.timeframes import analyze_timeframes, ordered_timeframes
+from signal_pipeline.metrics import configure_metrics, scan, timed
+from signal_pipeline.prescreen import prescreen_stocks
+from signal_pipeline.signal_state import SignalStateStore
+from signal_pipeline.market_data import MarketDataClient
+from signal_pipeline.market_calendar import get_calendar, scan_gate
+from signal_pipeline.option_chains import OptionChainCache
+from signal_pipeline.option_ranking import pick_contract
 
 DISCORD_WEBHOOK_URL = "https://discord.com/api/webhooks/1383524121035538543/RvpjHOfrbtH0wmdVdgph9uZpDDlaYKchi5VZ65TZy1Lb2XSNxmt82895wJ73RGBxlEat"
 
-def get_stock_data(ticker, period="5d", interval="5m"):
-    print(f"📥 Downloading historical data for {ticker}...")
-    df = yf.download(ticker, period=period, interval=interval, auto_adjust=True, group_by='ticker')
-
-    if isinstance(df.columns, pd.MultiIndex):
-        df = df[ticker]
-
-    if df.empty or "Close" not in df.columns:
-        print(f"⚠️ No usable 'Close' data for {ticker}")
-        return pd.DataFrame()
-
-    if "Volume" not in df.columns or df["Volume"].iloc[-1] < 500000:
-        print(f"⚠️ Low volume for {ticker} ({df['Volume'].iloc[-1] if 'Volume' in df.columns else 'N/A'}), skipping")
-        return pd.DataFrame()
-
-    try:
-        print("📈 Calculating indicators...")
-
-        df["RSI"] = ta.rsi(df["Close"], length=14)
-        macd = ta.macd(df["Close"])
-        if macd is not None and "MACDh_12_26_9" in macd.columns:
-            df["MACD_Hist"] = macd["MACDh_12_26_9"]
-        else:
-            df["MACD_Hist"] = pd.NA
-        df["EMA_50"] = ta.ema(df["Close"], length=50)
+# 🔁 Signal state: remember sent alerts in SQLite so a signal that keeps holding is not re-sent every run (None disables it)
+SIGNAL_STATE_DB = None  # e.g. ".cache/signals.sqlite", can be shared by all bots
+ALERT_COOLDOWN = 0  # seconds before the same side may alert again for a ticker, e.g. 2 * 3600
+ALERT_ON_SCORE_CHANGE = False  # while a signal keeps holding, re-alert only when its score changes
+signal_state = SignalStateStore(SIGNAL_STATE_DB, ALERT_COOLDOWN, ALERT_ON_SCORE_CHANGE) if SIGNAL_STATE_DB else None
+
+# 📨 Background alerts: queue alerts and post them from a worker thread, batched and rate-limit aware
+USE_ALERT_DISPATCHER = False
+alert_dispatcher = get_dispatcher(DISCORD_WEBHOOK_URL) if USE_ALERT_DISPATCHER else None
+
+# 📦 Tickers per yf.download call when fetching the watchlist in bulk
+DOWNLOAD_CHUNK_SIZE = 50
+
+PERIOD = "5d"
+INTERVAL = "5m"
+
+# 🔎 Pre-screen: drop illiquid tickers using one daily-bar download per chunk before the intraday history (None skips a check)
+PRESCREEN_MIN_VOLUME = None  # average daily shares over PRESCREEN_PERIOD, e.g. 5_000_000
+PRESCREEN_MIN_PRICE = None
+PRESCREEN_PERIOD = "5d"
+
+# 🕰 Daemon mode: keep running and scan a few seconds after every bar close (or pass --daemon)
+DAEMON_MODE = False
+DAEMON_GRACE_SECONDS = 15.0
+
+# 📅 Market calendar: skip downloads outside exchange sessions (weekends, holidays, half-day afternoons, overnight) using the bundled offline table, and sleep until the next open in daemon mode (None always downloads)
+MARKET_CALENDAR = None  # "NYSE"
+last_scanned_bar = None
+
+# 🧮 Streaming indicators: set a directory to update indicators bar-by-bar and keep their state across runs (None uses pandas_ta)
+INDICATOR_STATE_DIR = None  # e.g. ".cache/indicators/options"
+indicator_store = IndicatorEngineStore(INDICATOR_STATE_DIR) if INDICATOR_STATE_DIR else None
+
+# 🧊 Panel signals: score the latest bar of every ticker in one vectorized pass
+USE_PANEL_SIGNALS = False
+
+# 🧮 Parallel indicators: compute indicators for the whole download on a process pool (0 = in this process, None = one per core)
+INDICATOR_WORKERS = 0
+indicator_pool = None
+
+# 🧭 Multi-timeframe: confirm INTERVAL signals on these timeframes as well; only the finest of them is downloaded and the rest are resampled from it
+MTF_TIMEFRAMES = []  # e.g. ["15m", "1h"]
+MTF_MIN_CONFLUENCE = 1  # timeframes (INTERVAL included) that must agree before an alert goes out
+MTF_PERIOD = "1mo"  # history downloaded in this mode so the highest timeframe has enough bars (Yahoo keeps 60 days of intraday bars)
+SESSION_OFFSET = "30min"  # resampled hourly bars start at the 9:30 open, like Yahoo's own
+
+# 🛰 Shared market data: get bars and indicators from the local service (python -m signal_pipeline.market_data) shared with the other stock bot, so overlapping tickers are downloaded and computed once per bar (None downloads directly; takes over from the indicator options above)
+MARKET_DATA_SOCKET = None  # e.g. "/tmp/signal-market-data.sock", the same path for the equities and options bots
+market_data = None
+
+# 📈 Metrics: stage latency histograms, download rows, errors by type and alert latency in Prometheus format (both None disables them)
+METRICS_PORT = None  # e.g. 9108 serves http://127.0.0.1:9108/metrics
+METRICS_FILE = None  # e.g. ".cache/metrics/options.prom", rewritten after every scan
+PROFILE_SCAN = None  # e.g. ".cache/profile/options.pstats" to cProfile the next scan
+configure_metrics("options", METRICS_PORT, METRICS_FILE, PROFILE_SCAN)
+
+# 🗄 Option chain cache: chains are reused for OPTION_CHAIN_TTL seconds (set a directory to keep them across runs)
+OPTION_CHAIN_TTL = 300
+OPTION_CHAIN_CACHE_SIZE = 256
+OPTION_CHAIN_CACHE_DIR = None  # e.g. ".cache/options"
+OPTION_CHAIN_WORKERS = 8
+option_chains = OptionChainCache(ttl=OPTION_CHAIN_TTL, max_entries=OPTION_CHAIN_CACHE_SIZE, root=OPTION_CHAIN_CACHE_DIR)
+
+# 🎯 Contract ranking: pick across the nearest OPTION_EXPIRATIONS expirations by target delta, DTE and bid/ask spread
+USE_CONTRACT_RANKING = False
+OPTION_EXPIRATIONS = 6
+TARGET_DELTA = 0.30
+TARGET_DTE = 21
+MIN_DTE = 2
+MAX_DTE = 60
+MAX_SPREAD_PCT = 0.25
+RISK_FREE_RATE = 0.04
 
-        bbands = ta.bbands(df["Close"], length=20)
-        df["BB_Lower"] = bbands["BBL_20_2.0"]
-        df["BB_Upper"] = bbands["BBU_20_2.0"]
-
-        stoch = ta.stoch(df["High"], df["Low"], df["Close"])
-        df["Stoch_K"] = stoch["STOCHk_14_3_3"]
-        df["Stoch_D"] = stoch["STOCHd_14_3_3"]
-
-        df.dropna(inplace=True)
-        return df
-
-    except Exception as e:
-        print(f"❌ Error calculating indicators for {ticker}: {e}")
-        return pd.DataFrame()
+def get_stock_data(ticker, period="5d", interval="5m"):
+    return prepare_stock_data(ticker, download_ticker(ticker, period=period, interval=interval))
+
+def get_stock_data_bulk(tickers, period="5d", interval="5m", chunk_size=None):
+    if MARKET_DATA_SOCKET:
+        frames = fetch_shared_data(tickers, period, interval)
+        if frames is not None:
+            return frames
+    return prepare_stock_data_bulk(download_stock_data(tickers, period, interval, chunk_size))
+
+def get_market_data():
+    global market_data
+    if market_data is None:
+        market_data = MarketDataClient(MARKET_DATA_SOCKET)
+    return market_data
+
+@timed("options", "fetch")
+def fetch_shared_data(tickers, period="5d", interval="5m", indicators=True):
+    # None when the service is unreachable, so the scan falls back to downloading itself
+    return get_market_data().frames(tickers, period, interval, indicators)
+
+@timed("options", "fetch")
+def download_stock_data(tickers, period="5d", interval="5m", chunk_size=None):
+    return download_bars(tickers, period=period, interval=interval, chunk_size=chunk_size or DOWNLOAD_CHUNK_SIZE)
+
+@timed("options", "indicators")
+def prepare_stock_data_bulk(frames):
+    pool = get_indicator_pool() if INDICATOR_WORKERS != 0 else None
+    return prepare_stock_frames(frames, indicator_store, pool)
+
+@timed("options", "indicators")
+def calculate_indicators(df):
+    return add_equity_indicators(df)
+
+def get_indicator_pool():
+    global indicator_pool
+    if indicator_pool is None:
+        indicator_pool = IndicatorPool("equity", workers=INDICATOR_WORKERS)
+        atexit.register(indicator_pool.close)
+    return indicator_pool
+
+@timed("options", "indicators")
+def prepare_stock_data(ticker, df):
+    return prepare_stock_frame(ticker, df, indicator_store)
+
+@timed("options", "signals")
+def check_signal(df):
+    return check_equity_signal(df)
+
+def get_stock_data_timeframes(tickers, chunk_size=None):
+    # Raw bars at the finest timeframe; indicators are computed per timeframe after resampling
+    interval = ordered_timeframes(INTERVAL, MTF_TIMEFRAMES)[0]
+    if MARKET_DATA_SOCKET:
+        frames = fetch_shared_data(tickers, MTF_PERIOD, interval, indicators=False)
+        if frames is not None:
+            return frames
+    return download_stock_data(tickers, MTF_PERIOD, interval, chunk_size)
+
+def check_timeframes(ticker, df_stock):
+    # (df, signal, latest, confidence, confluence) on INTERVAL, or None when the ticker is skipped
+    if df_stock.empty or not is_data_fresh(df_stock):
+        print(f"⚠️ Skipping {ticker}: No fresh or valid stock data.")
+        return None
+    if not usable_stock_frame(ticker, df_stock):
+        return None
 
-def is_data_fresh(df, tolerance_days=2):
-    last_date = df.index[-1].date()
-    today = datetime.date.today()
-    return (today - last_date).days <= tolerance_days
+    analyzed = analyze_timeframes(
+        df_stock, INTERVAL, MTF_TIMEFRAMES, calculate_indicators, check_signal, MTF_MIN_CONFLUENCE, offset=SESSION_OFFSET,
+    )
+    if analyzed is None:
+        print(f"⚠️ Skipping {ticker}: Not enough {INTERVAL} bars for indicators.")
+    return analyzed
 
-def check_signal(df):
-    latest = df.iloc[-1]
-    close = latest["Close"]
-
-    conditions_buy = [
-        latest["RSI"] < 40,
-        latest["MACD_Hist"] >= 0,
-        close >= latest["EMA_50"],
-        close <= latest["BB_Lower"] * 1.02,
-        latest["Stoch_K"] < 30
-    ]
-
-    conditions_short = [
-        latest["RSI"] > 60,
-        latest["MACD_Hist"] <= 0,
-        close <= latest["EMA_50"],
-        close >= latest["BB_Upper"] * 0.98,
-        latest["Stoch_K"] > 70
-    ]
-
-    buy_count = sum(conditions_buy)
-    short_count = sum(conditions_short)
-
-    if buy_count >= 2:
-        return "BUY", latest, buy_count
-    elif short_count >= 2:
-        return "SHORT", latest, short_count
-    else:
-        return None, latest, 0
-
-def detect_support_resistance(df, lookback=60):
-    support_levels = []
-    resistance_levels = []
-
-    for i in range(lookback, len(df) - lookback):
-        if df['Low'].iloc[i] < min(df['Low'].iloc[i - lookback:i]) and df['Low'].iloc[i] < min(df['Low'].iloc[i+1:i+lookback+1]):
-            support_levels.append(df['Low'].iloc[i])
-        if df['High'].iloc[i] > max(df['High'].iloc[i - lookback:i]) and df['High'].iloc[i] > max(df['High'].iloc[i+1:i+lookback+1]):
-            resistance_levels.append(df['High'].iloc[i])
-
-    def filter_levels(levels, threshold=0.02):
-        filtered = []
-        for lvl in levels:
-            if all(abs(lvl - f) / f > threshold for f in filtered):
-                filtered.append(lvl)
-        return sorted(filtered)
-
-    return filter_levels(support_levels), filter_levels(resistance_levels)
-
-def get_option_chain(ticker):
-    stock = yf.Ticker(ticker)
-    expirations = stock.options
+@timed("options", "chains")
+def get_option_chain(ticker, df_stock=None):
+    expirations = option_chains.expirations(ticker)
     if not expirations:
         return None, None, None
 
-    expiration = expirations[0]
-    option_chain = stock.option_chain(expiration)
-    spot_price = stock.history(period="1d")["Close"].iloc[-1]
+    calls, puts = option_chains.chain(ticker, expirations[0])
+    # The bars were just downloaded, so their last close is the spot price
+    if df_stock is not None and not df_stock.empty:
+        spot_price = df_stock["Close"].iloc[-1]
+    else:
+        import yfinance as yf
+        spot_price = yf.Ticker(ticker).history(period="1d")["Close"].iloc[-1]
 
-    return option_chain.calls, option_chain.puts, spot_price
+    return calls, puts, spot_price
 
 def find_trade_ideas(calls, puts, spot_price, signal_type):
     df = calls if signal_type == "BUY" else puts
@@ -122,6 +196,14 @@ def find_trade_ideas(calls, puts, spot_price, signal_type):
     df = df[df["volume"] > 0]
     return df.iloc[0] if not df.empty else None
 
+@timed("options", "ranking")
+def rank_trade_idea(ticker, df_stock, signal_type):
+    chains = option_chains.nearest_chains(ticker, OPTION_EXPIRATIONS)
+    spot_price = df_stock["Close"].iloc[-1]
+    option = pick_contract(chains, spot_price, signal_type, rate=RISK_FREE_RATE, target_delta=TARGET_DELTA,
+                           target_dte=TARGET_DTE, min_dte=MIN_DTE, max_dte=MAX_DTE, max_spread_pct=MAX_SPREAD_PCT)
+    return option, spot_price
+
 def parse_expiration_from_symbol(symbol):
     try:
         date_str = symbol[-15:-9]
@@ -130,98 +212,227 @@ def parse_expiration_from_symbol(symbol):
         print(f"❌ Could not parse expiration from {symbol}: {e}")
         return None
 
-def send_discord_alert(message):
-    try:
-        response = requests.post(DISCORD_WEBHOOK_URL, json={"content": message})
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to send alert: {e}")
+@timed("options", "alert")
+def send_discord_alert(message, on_delivered=None):
+    return send_alert(DISCORD_WEBHOOK_URL, message, alert_dispatcher, on_delivered)
 
-def run_options_bot(tickers):
+def is_new_signal(ticker, signal, confidence, latest):
+    # With a signal state store, repeats of an alert already sent are dropped here, before the option-chain and support/resistance work
+    if signal_state is None:
+        return True
+    return signal_state.check("options", ticker, signal, confidence, latest.name)
+
+def delivery_recorder(ticker, signal, confidence, latest):
+    # Records the alert in the signal state store once Discord has accepted it
+    if signal_state is None:
+        return None
+    return signal_state.recorder("options", ticker, signal, confidence, latest.name)
+
+def screen_option_ticker(ticker, df_stock):
+    print(f"\n🔍 Screening options for {ticker}...")
+
+    if df_stock.empty or not is_data_fresh(df_stock):
+        print(f"⚠️ Skipping {ticker}: No fresh or valid stock data.")
+        return None
+
+    signal, latest, confidence = check_signal(df_stock)
+    if not is_new_signal(ticker, signal, confidence, latest):
+        return None
+    if not signal:
+        print(f"⛔ No signal for {ticker}")
+        return None
+
+    return ticker, df_stock, signal, latest, confidence
+
+def screen_option_timeframes(ticker, df_stock):
+    print(f"\n🔍 Screening options for {ticker}...")
+
+    analyzed = check_timeframes(ticker, df_stock)
+    if analyzed is None:
+        return None
+    df_stock, signal, latest, confidence, confluence = analyzed
+    if not is_new_signal(ticker, signal, confidence, latest):
+        return None
+    if not signal:
+        print(f"⛔ No signal for {ticker}")
+        return None
+
+    return ticker, df_stock, signal, latest, confidence, confluence
+
+def analyze_option_ticker(ticker, df_stock):
+    found = screen_option_ticker(ticker, df_stock)
+    if found:
+        report_option_signals([found])
+
+def analyze_options_panel(tickers, stock_data):
+    fresh = {}
     for ticker in tickers:
         print(f"\n🔍 Screening options for {ticker}...")
-
+        df_stock = stock_data.get(ticker, pd.DataFrame())
+        if df_stock.empty or not is_data_fresh(df_stock):
+            print(f"⚠️ Skipping {ticker}: No fresh or valid stock data.")
+            continue
+        fresh[ticker] = df_stock
+
+    panel = evaluate_equity_panel(fresh)
+    signals = []
+    for ticker, signal, confidence in zip(panel.index, panel["signal"], panel["score"]):
+        df_stock = fresh[ticker]
+        if not is_new_signal(ticker, signal, confidence, df_stock.iloc[-1]):
+            continue
+        if not signal:
+            print(f"⛔ No signal for {ticker}")
+            continue
+        signals.append((ticker, df_stock, signal, df_stock.iloc[-1], confidence))
+    report_option_signals(signals)
+
+@timed("options", "chains")
+def prefetch_option_chains(tickers):
+    count = OPTION_EXPIRATIONS if USE_CONTRACT_RANKING else 1
+    option_chains.prefetch(tickers, count=count, workers=OPTION_CHAIN_WORKERS)
+
+def report_option_signals(signals):
+    # Chains for every signalled ticker are fetched concurrently before any alert is built
+    if not signals:
+        return
+    prefetch_option_chains([found[0] for found in signals])
+    for found in signals:
         try:
-            df_stock = get_stock_data(ticker)
-            if df_stock.empty or not is_data_fresh(df_stock):
-                print(f"⚠️ Skipping {ticker}: No fresh or valid stock data.")
-                continue
-
-            signal, latest, confidence = check_signal(df_stock)
-            if not signal:
-                print(f"⛔ No signal for {ticker}")
-                continue
-
-            calls, puts, spot_price = get_option_chain(ticker)
-            if calls is None or puts is None:
-                print(f"⚠️ Skipping {ticker}: No option chain available.")
-                continue
-
-            option = find_trade_ideas(calls, puts, spot_price, signal)
-            if option is None:
-                print(f"⚠️ No suitable option found for {signal} on {ticker}")
-                continue
-
-            exp_date = parse_expiration_from_symbol(option["contractSymbol"])
-            last_traded = option["lastTradeDate"].date()
-
-            # Support and resistance logic
-            support_levels, resistance_levels = detect_support_resistance(df_stock)
-            nearest_support = max([lvl for lvl in support_levels if lvl < spot_price], default=None)
-            nearest_resistance = min([lvl for lvl in resistance_levels if lvl > spot_price], default=None)
-
-            # Stop-loss and target logic (independent)
-            stop, target = None, None
-
-            if signal == "BUY":
-                if nearest_support:
-                    stop = nearest_support * 0.98
-                if nearest_resistance:
-                    target = nearest_resistance
-
-            elif signal == "SHORT":
-                if nearest_resistance:
-                    stop = nearest_resistance * 1.02
-                if nearest_support:
-                    target = nearest_support
-            # Build message
-            msg = (
-                f"📢 **{signal} SIGNAL** for `{ticker}`\n"
-                f"> Spot Price: **${spot_price:.2f}**\n"
-                f"> Option: `{option['contractSymbol']}`\n"
-                f"> Strike: **${option['strike']:.2f}**, Premium: **${option['lastPrice']:.2f}**, Volume: `{option['volume']}`\n"
-                f"> 🗓️ Expiration: **{exp_date}**, Last traded on: **{last_traded}**\n"
-                f"> RSI: {latest['RSI']:.2f}, MACD Hist: {latest['MACD_Hist']:.2f}, Stoch %K: {latest['Stoch_K']:.2f}\n"
-                f"> Confidence Score: `{confidence}/5`"
-            )
-
-            if nearest_support:
-                msg += f"\n> 📉 Support: **${nearest_support:.2f}**"
-            else:
-                msg += "\n> 📉 Support: _Not detected in recent range_"
-
-            if nearest_resistance:
-                msg += f"\n> 📈 Resistance: **${nearest_resistance:.2f}**"
-            else:
-                msg += "\n> 📈 Resistance: _Not detected in recent range_"
-            if stop and target:
-                msg += (
-                    f"\n> 🛑 Suggested Stop: **${stop:.2f}**"
-                    f"\n> 🎯 Suggested Target: **${target:.2f}**"
-                )
-            elif not stop and target:
-                msg += f"\n> 🎯 Suggested Target: **${target:.2f}**, 🛑 Stop: _Not available_"
-            elif stop and not target:
-                msg += f"\n> 🛑 Suggested Stop: **${stop:.2f}**, 🎯 Target: _Not available_"
-            else:
-                msg += "\n> 🚫 Stop & Target: _Not available due to lack of support/resistance_"
-
-
-            msg += f"\n> Signal Time: {latest.name.strftime('%Y-%m-%d')}"
-            send_discord_alert(msg)
+            report_option_signal(*found)
+        except Exception as e:
+            print(f"❌ Error processing {found[0]}: {e}")
+
+@timed("options", "levels")
+def find_levels(df_stock):
+    return detect_support_resistance(df_stock)
 
+@timed("options", "report")
+def report_option_signal(ticker, df_stock, signal, latest, confidence, confluence=None):
+    if USE_CONTRACT_RANKING:
+        option, spot_price = rank_trade_idea(ticker, df_stock, signal)
+    else:
+        calls, puts, spot_price = get_option_chain(ticker, df_stock)
+        if calls is None or puts is None:
+            print(f"⚠️ Skipping {ticker}: No option chain available.")
+            return
+        option = find_trade_ideas(calls, puts, spot_price, signal)
+    if option is None:
+        print(f"⚠️ No suitable option found for {signal} on {ticker}")
+        return
+
+    exp_date = parse_expiration_from_symbol(option["contractSymbol"])
+    last_traded = option["lastTradeDate"].date()
+
+    # Support and resistance logic
+    support_levels, resistance_levels = find_levels(df_stock)
+    nearest_support = max([lvl for lvl in support_levels if lvl < spot_price], default=None)
+    nearest_resistance = min([lvl for lvl in resistance_levels if lvl > spot_price], default=None)
+
+    # Stop-loss and target logic (independent)
+    stop, target = None, None
+
+    if signal == "BUY":
+        if nearest_support:
+            stop = nearest_support * 0.98
+        if nearest_resistance:
+            target = nearest_resistance
+
+    elif signal == "SHORT":
+        if nearest_resistance:
+            stop = nearest_resistance * 1.02
+        if nearest_support:
+            target = nearest_support
+    # Build message
+    msg = (
+        f"📢 **{signal} SIGNAL** for `{ticker}`\n"
+        f"> Spot Price: **${spot_price:.2f}**\n"
+        f"> Option: `{option['contractSymbol']}`\n"
+        f"> Strike: **${option['strike']:.2f}**, Premium: **${option['lastPrice']:.2f}**, Volume: `{option['volume']}`\n"
+        f"> 🗓️ Expiration: **{exp_date}**, Last traded on: **{last_traded}**\n"
+        f"> RSI: {latest['RSI']:.2f}, MACD Hist: {latest['MACD_Hist']:.2f}, Stoch %K: {latest['Stoch_K']:.2f}\n"
+        f"> Confidence Score: `{confidence}/5`"
+    )
+    if "delta" in option:
+        msg += (
+            f"\n> Δ {option['delta']:.2f}, IV {option['iv']:.0%}, DTE {option['dte']:.0f}, "
+            f"Spread {option['spread_pct']:.1%}, OI `{option['openInterest']:.0f}`"
+        )
+
+    if confluence:
+        msg += f"\n> 🧭 Confluence: {confluence}"
+
+    if nearest_support:
+        msg += f"\n> 📉 Support: **${nearest_support:.2f}**"
+    else:
+        msg += "\n> 📉 Support: _Not detected in recent range_"
+
+    if nearest_resistance:
+        msg += f"\n> 📈 Resistance: **${nearest_resistance:.2f}**"
+    else:
+        msg += "\n> 📈 Resistance: _Not detected in recent range_"
+    if stop and target:
+        msg += (
+            f"\n> 🛑 Suggested Stop: **${stop:.2f}**"
+            f"\n> 🎯 Suggested Target: **${target:.2f}**"
+        )
+    elif not stop and target:
+        msg += f"\n> 🎯 Suggested Target: **${target:.2f}**, 🛑 Stop: _Not available_"
+    elif stop and not target:
+        msg += f"\n> 🛑 Suggested Stop: **${stop:.2f}**, 🎯 Target: _Not available_"
+    else:
+        msg += "\n> 🚫 Stop & Target: _Not available due to lack of support/resistance_"
+
+
+    msg += f"\n> Signal Time: {latest.name.strftime('%Y-%m-%d')}"
+    return send_discord_alert(msg, delivery_recorder(ticker, signal, confidence, latest))
+
+@timed("options", "prescreen")
+def prescreen_watchlist(tickers):
+    kept, _rejected = prescreen_stocks(tickers, PRESCREEN_MIN_VOLUME, PRESCREEN_MIN_PRICE, PRESCREEN_PERIOD, DOWNLOAD_CHUNK_SIZE)
+    return kept
+
+def market_bar_due():
+    # With a market calendar, False when there is no new session bar to download since the last scan
+    global last_scanned_bar
+    calendar = get_calendar(MARKET_CALENDAR)
+    if calendar is None:
+        return True
+    bar_close, reason = scan_gate(calendar, time.time(), INTERVAL, last_scanned_bar, DAEMON_GRACE_SECONDS)
+    if bar_close is None:
+        print(f"⏸ Skipping the options scan: {reason}")
+        return False
+    last_scanned_bar = bar_close
+    return True
+
+@scan("options")
+def run_options_bot(tickers):
+    if not market_bar_due():
+        return
+    tickers = prescreen_watchlist(tickers)
+    if MTF_TIMEFRAMES:
+        stock_data = get_stock_data_timeframes(tickers)
+        screen = screen_option_timeframes
+    else:
+        stock_data = get_stock_data_bulk(tickers, period=PERIOD, interval=INTERVAL)
+        if USE_PANEL_SIGNALS:
+            return analyze_options_panel(tickers, stock_data)
+        screen = screen_option_ticker
+
+    signals = []
+    for ticker in tickers:
+        try:
+            found = screen(ticker, stock_data.get(ticker, pd.DataFrame()))
         except Exception as e:
             print(f"❌ Error processing {ticker}: {e}")
+            continue
+        if found:
+            signals.append(found)
+    report_option_signals(signals)
+
+def run_daemon(tickers, grace_seconds=DAEMON_GRACE_SECONDS):
+    scheduler = BarCloseScheduler(grace_seconds)
+    scheduler.add_job("Options", INTERVAL, run_options_bot, tickers, get_calendar(MARKET_CALENDAR))
+    scheduler.run_forever()
 
 # Combined watchlist: Large-cap + cheaper stocks (LCID prioritized)
 stock_watchlist = [
@@ -235,5 +446,8 @@ stock_watchlist = [
     "RCL", "UAL", "CCL", "FUBO", "WORK", "CLNE", "VYGR", "VGZ"
 ]
 
-
-run_options_bot(stock_watchlist)
+if __name__ == "__main__":
+    if DAEMON_MODE or "--daemon" in sys.argv:
+        run_daemon(stock_watchlist)
+    else:
+        run_options_bot(stock_watchlist)
@@ -0,0 +1,50 @@
+import threading
+import time
+
+import requests
+
+from signal_pipeline.discord_dispatch import DiscordDispatcher
+from signal_pipeline.metrics import observe_alert
+
+# Discord delivery shared by every bot in the process: synchronous posts reuse
+# one keep-alive session, and there is at most one background dispatcher per
+# webhook URL, so bots that share a webhook also share its queue and batching.
+# on_delivered is called once Discord has accepted the alert: right away for a
+# synchronous post, from the dispatcher's worker for a queued one.
+
+_lock = threading.Lock()
+_session = None
+_dispatchers = {}
+
+
+def http_session():
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+        return _session
+
+
+def get_dispatcher(webhook_url):
+    with _lock:
+        if webhook_url not in _dispatchers:
+            _dispatchers[webhook_url] = DiscordDispatcher(webhook_url)
+        return _dispatchers[webhook_url]
+
+
+def send_alert(webhook_url, message, dispatcher=None, on_delivered=None):
+    # True when the alert was posted (or queued, with a dispatcher)
+    if dispatcher is not None:
+        return dispatcher.send(message, on_delivered)
+    started = time.perf_counter()
+    try:
+        response = http_session().post(webhook_url, json={"content": message}, timeout=10)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        observe_alert("sync", "failed")
+        print(f"❌ Failed to send alert: {e}")
+        return False
+    observe_alert("sync", "delivered", time.perf_counter() - started)
+    if on_delivered is not None:
+        on_delivered()
+    return True
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+# Concurrent OHLCV fetching on top of ccxt's async exchange classes.
+# Any object exposing an awaitable fetch_ohlcv(symbol, timeframe=..., limit=...)
+# works, so scans can be exercised offline against a fake exchange.
+
+
+def make_async_exchange(exchange_id, config=None):
+    import ccxt.async_support as ccxt_async
+
+    config = dict(config or {})
+    # ✅ ccxt's throttler only spaces requests when this is on
+    config.setdefault("enableRateLimit", True)
+    return getattr(ccxt_async, exchange_id)(config)
+
+
+async def _fetch_one(exchange, symbol, timeframe, limit, since, semaphore, timeout):
+    async with semaphore:
+        started = time.perf_counter()
+        if since is None:
+            request = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+        else:
+            request = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
+        ohlcv = await asyncio.wait_for(request, timeout)
+        return ohlcv, time.perf_counter() - started
+
+
+async def fetch_ohlcv_many(exchange, symbols, timeframe="1h", limit=200, concurrency=8, timeout=30.0, since=None):
+    # `since` optionally maps symbol -> first timestamp wanted (delta fetches).
+    # The timeout applies per symbol once it holds a concurrency slot, so it
+    # includes the exchange throttle wait but not time spent queued behind others.
+    semaphore = asyncio.Semaphore(concurrency)
+    since = since or {}
+    outcomes = await asyncio.gather(
+        *(
+            _fetch_one(exchange, symbol, timeframe, limit, since.get(symbol), semaphore, timeout)
+            for symbol in symbols
+        ),
+        return_exceptions=True,
+    )
+
+    results, errors, timings = {}, {}, {}
+    for symbol, outcome in zip(symbols, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            errors[symbol] = f"timed out after {timeout:.1f}s"
+        elif isinstance(outcome, BaseException):
+            errors[symbol] = f"{type(outcome).__name__}: {outcome}"
+        else:
+            results[symbol], timings[symbol] = outcome
+    return results, errors, timings
+
+
+def _report(results, errors, timings, symbols, elapsed, concurrency):
+    for symbol, error in errors.items():
+        print(f"⏱ Failed to fetch {symbol}: {error}")
+    slowest = max(timings.values(), default=0.0)
+    print(
+        f"⚡ Fetched {len(results)}/{len(symbols)} symbols in {elapsed:.2f}s "
+        f"(slowest symbol {slowest:.2f}s, concurrency {concurrency})"
+    )
+
+
+class AsyncOHLCVScanner:
+    # Keeps one event loop and one async exchange alive across scans, so a
+    # long-running process does not reload markets or reopen sessions every time
+    def __init__(self, exchange_factory):
+        self.exchange_factory = exchange_factory
+        self.loop = asyncio.new_event_loop()
+        self.exchange = None
+
+    def scan(self, symbols, timeframe="1h", limit=200, concurrency=8, timeout=30.0, since=None):
+        if self.exchange is None:
+            # Built inside the loop: aiohttp sessions are bound to the loop that creates them
+            self.exchange = self.loop.run_until_complete(self._create())
+        started = time.perf_counter()
+        results, errors, timings = self.loop.run_until_complete(
+            fetch_ohlcv_many(self.exchange, symbols, timeframe, limit, concurrency, timeout, since)
+        )
+        _report(results, errors, timings, symbols, time.perf_counter() - started, concurrency)
+        return results, errors
+
+    async def _create(self):
+        return self.exchange_factory()
+
+    def close(self):
+        if self.exchange is not None:
+            close = getattr(self.exchange, "close", None)
+            if close is not None:
+                self.loop.run_until_complete(close())
+            self.exchange = None
+        self.loop.close()
+
+
+def scan_ohlcv(exchange_factory, symbols, timeframe="1h", limit=200, concurrency=8, timeout=30.0, since=None):
+    # One-shot scan: the exchange is always closed afterwards, even when the scan fails
+    scanner = AsyncOHLCVScanner(exchange_factory)
+    try:
+        return scanner.scan(symbols, timeframe, limit, concurrency, timeout, since)
+    finally:
+        scanner.close()
@@ -0,0 +1,309 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from signal_pipeline.levels import filter_levels, pivot_indices
+from signal_pipeline.panel import CRYPTO_RULES, EQUITY_RULES, crypto_conditions, equity_conditions, score_signals
+
+# Offline backtest of the bots' signal rules over a full bar history.
+# Indicators and rule conditions are computed column-wise for every bar at once;
+# only the trades themselves are walked, one position per symbol at a time.
+# Stops and targets follow run_equities_bot: nearest support/resistance when one
+# exists (stop 2% beyond the level), otherwise ATR multiples. Support/resistance
+# at an entry only uses pivots already confirmed `lookback` bars before it.
+# Across symbols ("ALL"), trades, hit_rate and avg_return pool every trade, while
+# total_return and max_drawdown are those of an equal-weight portfolio: the
+# capital is split evenly between the symbols up front, each share compounds
+# only its own symbol's trades, and equity is marked whenever a trade exits.
+
+RULE_SETS = {
+    "crypto": (crypto_conditions, CRYPTO_RULES),
+    "equity": (equity_conditions, EQUITY_RULES),
+}
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+def load_bars(path):
+    # Reads CSV / Parquet / Feather, including the OHLCVCache files and
+    # yfinance-style frames with capitalised columns
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    elif path.endswith(".feather"):
+        df = pd.read_feather(path)
+    else:
+        df = pd.read_csv(path)
+
+    df = df.rename(columns=str.lower)
+    for time_column in ("timestamp", "datetime", "date"):
+        if time_column in df.columns:
+            values = df[time_column]
+            unit = "ms" if pd.api.types.is_numeric_dtype(values) else None
+            df.index = pd.to_datetime(values, unit=unit)
+            df = df.drop(columns=[time_column])
+            break
+    df.index.name = "timestamp"
+    return df[PRICE_COLUMNS].astype(float).sort_index()
+
+
+def add_indicators(df):
+    # Union of the crypto and equities indicator columns, named as in the bots
+    import pandas_ta as ta
+
+    df = df.copy()
+    df["RSI"] = ta.rsi(df["close"], length=14)
+    df["MACD_Hist"] = ta.macd(df["close"])["MACDh_12_26_9"]
+    df["EMA_50"] = ta.ema(df["close"], length=50)
+    df["ATR_14"] = ta.atr(df["high"], df["low"], df["close"], length=14)
+    bbands = ta.bbands(df["close"], length=20, std=2)
+    df["BBL"] = df["BB_Lower"] = bbands["BBL_20_2.0"]
+    df["BBM"] = bbands["BBM_20_2.0"]
+    df["BBU"] = df["BB_Upper"] = bbands["BBU_20_2.0"]
+    stochrsi = ta.stochrsi(df["close"], length=14)
+    df["StochRSI_K"] = stochrsi.iloc[:, 0]
+    df["StochRSI_D"] = stochrsi.iloc[:, 1]
+    stoch = ta.stoch(df["high"], df["low"], df["close"])
+    df["Stoch_K"] = stoch["STOCHk_14_3_3"]
+    df["Stoch_D"] = stoch["STOCHd_14_3_3"]
+    df["Close"] = df["close"]
+    return df.dropna()
+
+
+def signal_sides(df, rules="crypto", **params):
+    conditions, defaults = RULE_SETS[rules]
+    params = {**defaults, **params}
+    min_score = params.pop("min_score")
+    cols = {name: df[name].to_numpy() for name in df.columns}
+    buy, short = conditions(cols, **params)
+    side, _score = score_signals(buy, short, min_score)
+    return side
+
+
+def _confirmed_levels(indices, values, entry, lookback, sr_window, threshold):
+    start = np.searchsorted(indices, entry - sr_window)
+    stop = np.searchsorted(indices, entry - lookback, side="right")
+    return filter_levels(values[indices[start:stop]], threshold)
+
+
+class TradeSimulator:
+    # Holds one symbol's arrays and pivots. A trade's stop, target and exit
+    # depend only on its entry bar and direction, so outcomes are memoised and
+    # reused when the same history is replayed with different signal rules.
+    def __init__(self, df, lookback=60, sr_window=390, sr_threshold=0.02,
+                 atr_stop=2.0, atr_target=3.0, max_hold=500, fee=0.0, allow_short=True):
+        self.index = df.index
+        self.high = df["high"].to_numpy(dtype=float)
+        self.low = df["low"].to_numpy(dtype=float)
+        self.close = df["close"].to_numpy(dtype=float)
+        self.atr = df["ATR_14"].to_numpy(dtype=float)
+        self.lookback = lookback
+        self.sr_window = sr_window
+        self.sr_threshold = sr_threshold
+        self.atr_stop = atr_stop
+        self.atr_target = atr_target
+        self.max_hold = max_hold
+        self.fee = fee
+        self.allow_short = allow_short
+        self.support_idx = pivot_indices(self.low, lookback, "min")
+        self.resistance_idx = pivot_indices(self.high, lookback, "max")
+        self._outcomes = {}
+
+    def outcome(self, entry, direction):
+        key = (entry, direction)
+        if key in self._outcomes:
+            return self._outcomes[key]
+
+        price = self.close[entry]
+        supports = _confirmed_levels(self.support_idx, self.low, entry, self.lookback, self.sr_window, self.sr_threshold)
+        resistances = _confirmed_levels(self.resistance_idx, self.high, entry, self.lookback, self.sr_window, self.sr_threshold)
+        nearest_support = max([lvl for lvl in supports if lvl < price], default=None)
+        nearest_resistance = min([lvl for lvl in resistances if lvl > price], default=None)
+
+        if direction > 0:
+            stop = nearest_support * 0.98 if nearest_support else price - self.atr_stop * self.atr[entry]
+            target = nearest_resistance if nearest_resistance else price + self.atr_target * self.atr[entry]
+        else:
+            stop = nearest_resistance * 1.02 if nearest_resistance else price + self.atr_stop * self.atr[entry]
+            target = nearest_support if nearest_support else price - self.atr_target * self.atr[entry]
+
+        end = min(entry + 1 + self.max_hold, len(self.close))
+        if direction > 0:
+            hit_stop = self.low[entry + 1:end] <= stop
+            hit_target = self.high[entry + 1:end] >= target
+        else:
+            hit_stop = self.high[entry + 1:end] >= stop
+            hit_target = self.low[entry + 1:end] <= target
+
+        hits = hit_stop | hit_target
+        if hits.any():
+            j = int(hits.argmax())
+            exit_index = entry + 1 + j
+            # A bar touching both levels is counted as a stop (worst case)
+            exit_price, reason = (stop, "stop") if hit_stop[j] else (target, "target")
+        else:
+            exit_index = end - 1
+            exit_price, reason = self.close[exit_index], "timeout"
+
+        trade_return = direction * (exit_price / price - 1.0) - 2 * self.fee
+        result = self._outcomes[key] = (exit_index, exit_price, stop, target, reason, trade_return)
+        return result
+
+    def walk(self, side):
+        # Yields (entry, direction, outcome) for non-overlapping trades in time order
+        candidates = np.flatnonzero(side != 0 if self.allow_short else side > 0)
+        last_bar = len(self.close) - 1
+        next_free = 0
+        while True:
+            k = np.searchsorted(candidates, next_free)
+            if k >= len(candidates) or candidates[k] >= last_bar:
+                return
+            entry = int(candidates[k])
+            direction = int(side[entry])
+            outcome = self.outcome(entry, direction)
+            yield entry, direction, outcome
+            next_free = outcome[0] + 1
+
+    def returns(self, side):
+        return np.array([outcome[5] for _entry, _direction, outcome in self.walk(side)])
+
+    def exits(self, side):
+        # (exit times, returns) of the trades, in exit-time order
+        outcomes = [outcome for _entry, _direction, outcome in self.walk(side)]
+        times = np.asarray(self.index[[outcome[0] for outcome in outcomes]])
+        return times, np.array([outcome[5] for outcome in outcomes])
+
+    def trades(self, side):
+        rows = [
+            (self.index[entry], self.index[exit_index], direction, self.close[entry], exit_price,
+             stop, target, reason, exit_index - entry, trade_return)
+            for entry, direction, (exit_index, exit_price, stop, target, reason, trade_return) in self.walk(side)
+        ]
+        return pd.DataFrame(rows, columns=[
+            "entry_time", "exit_time", "side", "entry_price", "exit_price",
+            "stop", "target", "exit_reason", "bars_held", "return",
+        ])
+
+
+def simulate_trades(df, side, **trade_params):
+    return TradeSimulator(df, **trade_params).trades(side)
+
+
+def summarize_returns(returns):
+    # returns must be in exit-time order
+    if len(returns) == 0:
+        return {"trades": 0, "hit_rate": float("nan"), "avg_return": float("nan"),
+                "total_return": 0.0, "max_drawdown": 0.0}
+
+    equity = np.cumprod(1.0 + returns)
+    peaks = np.maximum.accumulate(np.concatenate([[1.0], equity]))[1:]
+    return {
+        "trades": len(returns),
+        "hit_rate": float((returns > 0).mean()),
+        "avg_return": float(returns.mean()),
+        "total_return": float(equity[-1] - 1.0),
+        "max_drawdown": float((equity / peaks - 1.0).min()),
+    }
+
+
+def portfolio_returns(sleeves):
+    # Equal-weight portfolio of one sleeve per symbol, each sleeve an (exit times, returns)
+    # pair in exit-time order; symbols without trades hold their share in cash
+    sleeves = list(sleeves)
+    times, steps = [], []
+    for exit_times, returns in sleeves:
+        if len(returns):
+            equity = np.cumprod(1.0 + np.asarray(returns, dtype=float))
+            times.append(np.asarray(exit_times))
+            steps.append(np.diff(equity, prepend=1.0) / len(sleeves))
+    if not times:
+        return {"total_return": 0.0, "max_drawdown": 0.0}
+
+    times, steps = np.concatenate(times), np.concatenate(steps)
+    order = np.argsort(times, kind="stable")
+    times, equity = times[order], 1.0 + np.cumsum(steps[order])
+    # Trades exiting at the same time settle together
+    last = np.append(times[1:] != times[:-1], True)
+    equity = equity[last]
+    peaks = np.maximum.accumulate(np.concatenate([[1.0], equity]))[1:]
+    return {"total_return": float(equity[-1] - 1.0), "max_drawdown": float((equity / peaks - 1.0).min())}
+
+
+def summarize(trades):
+    if trades.empty:
+        return summarize_returns([])
+    return summarize_returns(trades.sort_values("exit_time")["return"].to_numpy())
+
+
+def summarize_portfolio(trades_by_symbol):
+    # The "ALL" row: trade stats over every trade, total_return / max_drawdown of the equal-weight portfolio
+    frames = [trades for trades in trades_by_symbol.values() if not trades.empty]
+    metrics = summarize(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame())
+    metrics.update(portfolio_returns(
+        (trades["exit_time"].to_numpy(), trades["return"].to_numpy()) if not trades.empty else ([], [])
+        for trades in (trades.sort_values("exit_time") for trades in trades_by_symbol.values())
+    ))
+    return metrics
+
+
+def backtest(df, rules="crypto", rule_params=None, **trade_params):
+    # df holds raw bars; returns (trades, metrics)
+    df = add_indicators(df)
+    side = signal_sides(df, rules, **(rule_params or {}))
+    trades = simulate_trades(df, side, **trade_params)
+    return trades, summarize(trades)
+
+
+def backtest_files(paths, rules="crypto", rule_params=None, **trade_params):
+    results = {}
+    all_trades = {}
+    for path in paths:
+        symbol = os.path.splitext(os.path.basename(path))[0]
+        try:
+            trades, metrics = backtest(load_bars(path), rules, rule_params, **trade_params)
+        except Exception as e:
+            print(f"❌ Error backtesting {symbol}: {e}")
+            continue
+        results[symbol] = metrics
+        all_trades[symbol] = trades.assign(symbol=symbol)
+
+    report = pd.DataFrame.from_dict(results, orient="index")
+    trades = pd.concat(all_trades.values(), ignore_index=True) if all_trades else pd.DataFrame()
+    if not trades.empty:
+        report.loc["ALL"] = summarize_portfolio(all_trades)
+    return report, trades
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the signal rules on local OHLCV files")
+    parser.add_argument("paths", nargs="+", help="CSV / Parquet / Feather bar files, one symbol each")
+    parser.add_argument("--rules", choices=sorted(RULE_SETS), default="crypto")
+    parser.add_argument("--lookback", type=int, default=60)
+    parser.add_argument("--sr-window", type=int, default=390)
+    parser.add_argument("--atr-stop", type=float, default=2.0)
+    parser.add_argument("--atr-target", type=float, default=3.0)
+    parser.add_argument("--max-hold", type=int, default=500)
+    parser.add_argument("--fee", type=float, default=0.0, help="fee per side, as a fraction")
+    parser.add_argument("--long-only", action="store_true")
+    parser.add_argument("--trades-out", help="write every trade to this CSV")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report, trades = backtest_files(
+        args.paths, args.rules, lookback=args.lookback, sr_window=args.sr_window,
+        atr_stop=args.atr_stop, atr_target=args.atr_target, max_hold=args.max_hold,
+        fee=args.fee, allow_short=not args.long_only,
+    )
+    print(report.to_string(float_format=lambda v: f"{v:.4f}"))
+    if "ALL" in report.index:
+        print(f"📊 ALL: trade stats pool every trade; total_return and max_drawdown are an equal-weight "
+              f"portfolio (1/{len(report) - 1} of the capital per symbol, marked at trade exits)")
+    print(f"⏱ Backtested {len(args.paths)} files in {time.perf_counter() - started:.2f}s")
+    if args.trades_out and not trades.empty:
+        trades.to_csv(args.trades_out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+
+from signal_pipeline.indicator_engine import CRYPTO_COLUMNS, IndicatorEngine
+
+# Per-symbol bars and indicators in preallocated NumPy buffers, kept across scans.
+# Each symbol owns an int64 timestamp array and one column-major float block
+# (OHLCV followed by the indicator columns) sized capacity + slack. New candles
+# are written in place and the oldest bar falls out of the window; when the slack
+# is used up the window is compacted to the front, so every column is always a
+# contiguous zero-copy view. Indicators come from the streaming IndicatorEngine,
+# one update per new bar, so a scan costs a few new rows instead of a DataFrame
+# build plus a full pandas_ta recomputation. Memory is fixed per symbol (see
+# bytes_per_symbol) and symbols that leave the watchlist can be dropped with retain().
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class LatestBar:
+    # The newest bar of a symbol, read like a DataFrame row: latest["close"], latest.name
+    __slots__ = ("name", "timestamp", "_index", "_values")
+
+    def __init__(self, timestamp, index, values):
+        self.timestamp = timestamp
+        self.name = pd.Timestamp(timestamp, unit="ms")
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._index[key]]
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def get(self, key, default=None):
+        return self[key] if key in self._index else default
+
+    def keys(self):
+        return self._index.keys()
+
+    def to_dict(self):
+        return {key: float(self._values[i]) for key, i in self._index.items()}
+
+
+class SymbolBars:
+    __slots__ = ("timestamps", "values", "start", "end", "capacity", "engine")
+
+    def __init__(self, capacity, n_columns, slack, dtype):
+        self.timestamps = np.zeros(capacity + slack, dtype=np.int64)
+        self.values = np.full((n_columns, capacity + slack), np.nan, dtype=dtype)
+        self.start = 0
+        self.end = 0
+        self.capacity = capacity
+        self.engine = IndicatorEngine()
+
+    def __len__(self):
+        return self.end - self.start
+
+    @property
+    def last_timestamp(self):
+        return int(self.timestamps[self.end - 1]) if self.end > self.start else None
+
+    def _next_row(self):
+        if self.end == len(self.timestamps):
+            # Slack used up: move the newest capacity - 1 bars to the front
+            keep = self.capacity - 1
+            self.timestamps[:keep] = self.timestamps[self.end - keep:self.end]
+            self.values[:, :keep] = self.values[:, self.end - keep:self.end]
+            self.start, self.end = 0, keep
+        row = self.end
+        self.end += 1
+        if self.end - self.start > self.capacity:
+            self.start += 1
+        return row
+
+    @property
+    def nbytes(self):
+        return self.timestamps.nbytes + self.values.nbytes
+
+
+class BarStore:
+    def __init__(self, capacity=200, indicator_columns=CRYPTO_COLUMNS, timeframe_ms=None, dtype=np.float64, slack=None):
+        # indicator_columns maps column names to IndicatorEngine keys (CRYPTO_COLUMNS or EQUITY_COLUMNS)
+        self.capacity = capacity
+        self.slack = slack or max(1, capacity // 4)
+        self.timeframe_ms = timeframe_ms
+        self.dtype = np.dtype(dtype)
+        self.indicator_columns = dict(indicator_columns)
+        self.columns = OHLCV_FIELDS + tuple(self.indicator_columns)
+        self.index = {name: i for i, name in enumerate(self.columns)}
+        self._engine_keys = tuple(self.indicator_columns.values())
+        self.symbols = {}
+
+    @property
+    def bytes_per_symbol(self):
+        rows = self.capacity + self.slack
+        return rows * (8 + len(self.columns) * self.dtype.itemsize)
+
+    @property
+    def nbytes(self):
+        return sum(bars.nbytes for bars in self.symbols.values())
+
+    def _new_bars(self):
+        return SymbolBars(self.capacity, len(self.columns), self.slack, self.dtype)
+
+    def bars(self, symbol):
+        return self.symbols.get(symbol)
+
+    def retain(self, symbols):
+        # Drops every symbol not in `symbols`
+        keep = set(symbols)
+        for symbol in [s for s in self.symbols if s not in keep]:
+            del self.symbols[symbol]
+
+    def update(self, symbol, ohlcv):
+        # ohlcv: ccxt rows [timestamp, open, high, low, close, volume], oldest first.
+        # Only bars at or after the last stored one are applied (that one may have been revised).
+        # Returns the LatestBar once the indicators are warmed up, otherwise None.
+        bars = self.symbols.get(symbol)
+        if bars is None:
+            bars = self.symbols[symbol] = self._new_bars()
+        if len(ohlcv) == 0:
+            return self.latest(symbol)
+
+        rows = np.asarray(ohlcv, dtype=np.float64)
+        timestamps = rows[:, 0].astype(np.int64)
+        last = bars.last_timestamp
+        if last is not None:
+            if self.timeframe_ms and timestamps[0] > last + self.timeframe_ms:
+                # The new rows do not continue the stored series: start over
+                bars = self.symbols[symbol] = self._new_bars()
+            else:
+                fresh = timestamps >= last
+                rows, timestamps = rows[fresh], timestamps[fresh]
+
+        engine = bars.engine
+        keys = self._engine_keys
+        for i in range(len(timestamps)):
+            timestamp = int(timestamps[i])
+            row = bars.end - 1 if timestamp == bars.last_timestamp else bars._next_row()
+            _ts, _open, high, low, close, _volume = rows[i]
+            values = engine.update(timestamp, high, low, close)
+            bars.timestamps[row] = timestamp
+            bars.values[:5, row] = rows[i, 1:]
+            bars.values[5:, row] = [values[key] for key in keys]
+        return self.latest(symbol)
+
+    def latest(self, symbol):
+        bars = self.symbols.get(symbol)
+        if bars is None or not len(bars) or not bars.engine.ready(self.indicator_columns):
+            return None
+        row = bars.end - 1
+        return LatestBar(int(bars.timestamps[row]), self.index, bars.values[:, row].copy())
+
+    def timestamps(self, symbol, n=None):
+        bars = self.symbols[symbol]
+        start = bars.start if n is None else max(bars.start, bars.end - n)
+        return bars.timestamps[start:bars.end]
+
+    def column(self, symbol, name, n=None):
+        # Zero-copy view of the last n values (all stored bars by default)
+        bars = self.symbols[symbol]
+        start = bars.start if n is None else max(bars.start, bars.end - n)
+        return bars.values[self.index[name], start:bars.end]
+
+    def to_frame(self, symbol):
+        # A copy as a DataFrame, for code that still needs one
+        bars = self.symbols[symbol]
+        data = bars.values[:, bars.start:bars.end].T
+        index = pd.to_datetime(self.timestamps(symbol), unit="ms")
+        return pd.DataFrame(data, index=pd.Index(index, name="timestamp"), columns=list(self.columns))
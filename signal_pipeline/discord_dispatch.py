@@ -0,0 +1,216 @@
+import atexit
+import queue
+import threading
+import time
+
+import requests
+
+from signal_pipeline.metrics import observe_alert, observe_rate_limit
+
+# Background Discord webhook sender. Alerts are queued (bounded) and posted from
+# one worker thread over a pooled keep-alive session, so a slow webhook never
+# stalls a scan. Alerts arriving within `batch_window` seconds are packed into
+# as few messages as Discord's 2000-character content limit allows, and 429s are
+# retried after the Retry-After delay Discord asks for. An alert's on_delivered
+# callback runs on the worker thread once the payload carrying it is accepted.
+
+DISCORD_CONTENT_LIMIT = 2000
+SEPARATOR = "\n\n"
+
+
+def pack_groups(messages, limit=DISCORD_CONTENT_LIMIT):
+    # Greedy packing in arrival order: lists of consecutive messages that fit in one
+    # payload each; an oversized single alert is truncated
+    groups = []
+    current, size = [], 0
+    for message in messages:
+        if len(message) > limit:
+            message = message[:limit - 1] + "…"
+        added = len(message) + (len(SEPARATOR) if current else 0)
+        if current and size + added > limit:
+            groups.append(current)
+            current, size = [], 0
+            added = len(message)
+        current.append(message)
+        size += added
+    if current:
+        groups.append(current)
+    return groups
+
+
+def pack_messages(messages, limit=DISCORD_CONTENT_LIMIT):
+    return [SEPARATOR.join(group) for group in pack_groups(messages, limit)]
+
+
+def _retry_after(response):
+    header = response.headers.get("Retry-After")
+    if header is not None:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    try:
+        return float(response.json().get("retry_after", 1.0))
+    except Exception:
+        return 1.0
+
+
+class DiscordDispatcher:
+    def __init__(self, webhook_url, max_queue=1000, batch_window=2.0, timeout=10.0, max_retries=5, session=None):
+        self.webhook_url = webhook_url
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = session or requests.Session()
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._flush_requested = threading.Event()
+        self._stopping = False
+        self._lock = threading.Lock()
+        self._latencies = []
+        self.counters = {"queued": 0, "delivered": 0, "posts": 0, "dropped": 0, "failed": 0, "rate_limited": 0, "retries": 0}
+
+        self._worker = threading.Thread(target=self._run, name="discord-dispatcher", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def send(self, message, on_delivered=None):
+        try:
+            self.queue.put_nowait((time.monotonic(), message, on_delivered))
+        except queue.Full:
+            self._count("dropped")
+            print("⚠️ Alert queue full — dropping alert")
+            return False
+        self._count("queued")
+        return True
+
+    def flush(self, timeout=None):
+        # Sends whatever is batched right away and waits for the queue to drain
+        self._flush_requested.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout=30.0):
+        if self._stopping:
+            return
+        self.flush(timeout)
+        self._stopping = True
+        self.queue.put((None, None, None))
+        self._worker.join(timeout)
+        self.session.close()
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = dict(self.counters)
+        stats["queue_depth"] = self.queue.qsize()
+        if latencies:
+            stats["latency_p50"] = latencies[len(latencies) // 2]
+            stats["latency_p95"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            stats["latency_max"] = latencies[-1]
+        return stats
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def _next_batch(self):
+        item = self.queue.get()
+        if item[1] is None:
+            self.queue.task_done()
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.batch_window
+        while True:
+            flushing = self._flush_requested.is_set()
+            remaining = deadline - time.monotonic()
+            if not flushing and remaining <= 0:
+                break
+            try:
+                # While flushing, take only what is already queued
+                item = self.queue.get_nowait() if flushing else self.queue.get(timeout=min(remaining, 0.05))
+            except queue.Empty:
+                if flushing:
+                    break
+                continue
+            if item[1] is None:
+                # Stop marker: put it back behind this batch
+                self.queue.task_done()
+                self.queue.put(item)
+                break
+            batch.append(item)
+        if self.queue.empty():
+            self._flush_requested.clear()
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                # Every payload is posted even if an earlier one was rejected, and settles only its own alerts
+                start = 0
+                for group in pack_groups([message for _t, message, _callback in batch]):
+                    items = batch[start:start + len(group)]
+                    start += len(group)
+                    self._settle(items, self._post(SEPARATOR.join(group)))
+            finally:
+                for _item in batch:
+                    self.queue.task_done()
+
+    def _settle(self, items, delivered):
+        now = time.monotonic()
+        if delivered:
+            with self._lock:
+                self.counters["delivered"] += len(items)
+                self._latencies.extend(now - enqueued_at for enqueued_at, _m, _callback in items)
+                del self._latencies[:-10_000]
+            for enqueued_at, _m, on_delivered in items:
+                observe_alert("queued", "delivered", now - enqueued_at)
+                if on_delivered is not None:
+                    try:
+                        on_delivered()
+                    except Exception as e:
+                        print(f"❌ Error after delivering alert: {e}")
+        else:
+            self._count("failed", len(items))
+            for _item in items:
+                observe_alert("queued", "failed")
+
+    def _post(self, content):
+        backoff = 1.0
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+            try:
+                response = self.session.post(self.webhook_url, json={"content": content}, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                print(f"❌ Failed to send alert: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+
+            if response.status_code == 429:
+                self._count("rate_limited")
+                wait = _retry_after(response)
+                print(f"⏳ Discord rate limit hit — retrying in {wait:.2f}s")
+                time.sleep(wait)
+                observe_rate_limit("discord", wait)
+                continue
+            if response.status_code >= 500:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+            if response.status_code >= 400:
+                print(f"❌ Failed to send alert: HTTP {response.status_code} {response.text[:200]}")
+                return False
+
+            self._count("posts")
+            return True
+
+        print(f"❌ Giving up on alert after {self.max_retries} retries")
+        return False
@@ -0,0 +1,125 @@
+import time
+
+from signal_pipeline.ohlcv_cache import timeframe_to_ms
+
+# Funding rates for a whole watchlist through ccxt's unified API.
+# Rates are cached per symbol until the funding timestamp the exchange reports,
+# so hourly scans hit the exchange at most once per funding interval. Exchanges
+# with fetchFundingRates are asked for every tracked symbol in one call; the rest
+# fall back to fetchFundingRate for the symbol being reported. Watchlist symbols
+# like "BTC/USDT" are mapped to their linear perpetual ("BTC/USDT:USDT").
+
+DEFAULT_FUNDING_INTERVAL_MS = 8 * 3_600_000
+RETRY_AFTER_MS = 5 * 60_000
+
+
+def _next_boundary(now_ms, interval_ms):
+    return (now_ms // interval_ms + 1) * interval_ms
+
+
+class FundingRateProvider:
+    def __init__(self, exchange, symbols=None, clock=time.time):
+        self.exchange = exchange
+        self.clock = clock
+        self.tracked = list(symbols or [])
+        self._rates = {}
+        self._swap_symbols = {}
+        self.requests = 0
+        has = getattr(exchange, "has", {})
+        self.bulk = bool(has.get("fetchFundingRates"))
+        self.single = bool(has.get("fetchFundingRate"))
+        if not (self.bulk or self.single):
+            print(f"⚠️ {exchange.id} has no funding-rate API — funding will show as N/A")
+
+    def _now_ms(self):
+        return int(self.clock() * 1000)
+
+    def track(self, symbols):
+        # Symbols fetched together on the next bulk refresh
+        for symbol in symbols:
+            if symbol not in self.tracked:
+                self.tracked.append(symbol)
+
+    def swap_symbol(self, symbol):
+        if symbol not in self._swap_symbols:
+            markets = self.exchange.load_markets()
+            quote = symbol.split("/")[-1].split(":")[0]
+            candidates = [symbol, f"{symbol}:{quote}"]
+            self._swap_symbols[symbol] = next(
+                (s for s in candidates if s in markets and markets[s].get("swap")), None
+            )
+        return self._swap_symbols[symbol]
+
+    def _expiry(self, rate, now_ms):
+        for key in ("fundingTimestamp", "nextFundingTimestamp"):
+            stamp = rate.get(key)
+            if stamp and stamp > now_ms:
+                return stamp
+        interval = rate.get("interval")
+        try:
+            interval_ms = timeframe_to_ms(interval) if interval else DEFAULT_FUNDING_INTERVAL_MS
+        except ValueError:
+            interval_ms = DEFAULT_FUNDING_INTERVAL_MS
+        return _next_boundary(now_ms, interval_ms)
+
+    def _store(self, symbol, value, expires_at):
+        self._rates[symbol] = (value, expires_at)
+
+    def refresh(self, symbols):
+        now_ms = self._now_ms()
+        swaps = {}
+        for symbol in symbols:
+            try:
+                swap = self.swap_symbol(symbol)
+            except Exception as e:
+                print(f"⚠️ Could not load markets for funding rates: {e}")
+                swap = None
+            if swap is None:
+                # Not a perpetual on this exchange; no point asking again this interval
+                self._store(symbol, None, _next_boundary(now_ms, DEFAULT_FUNDING_INTERVAL_MS))
+            else:
+                swaps[swap] = symbol
+        if not swaps:
+            return
+
+        if self.bulk:
+            try:
+                self.requests += 1
+                rates = self.exchange.fetch_funding_rates(list(swaps))
+            except Exception as e:
+                print(f"⚠️ Funding rate fetch failed: {e}")
+                for symbol in swaps.values():
+                    self._store(symbol, None, now_ms + RETRY_AFTER_MS)
+                return
+        else:
+            # One request per symbol; a failing one (e.g. a delisted swap) only loses its own rate
+            rates = {}
+            for swap in swaps:
+                try:
+                    self.requests += 1
+                    rates[swap] = self.exchange.fetch_funding_rate(swap)
+                except Exception as e:
+                    print(f"⚠️ Funding rate fetch failed for {swap}: {e}")
+
+        for swap, symbol in swaps.items():
+            rate = rates.get(swap)
+            if rate is None or rate.get("fundingRate") is None:
+                self._store(symbol, None, now_ms + RETRY_AFTER_MS)
+            else:
+                self._store(symbol, float(rate["fundingRate"]), self._expiry(rate, now_ms))
+
+    def get(self, symbol):
+        if not (self.bulk or self.single):
+            return None
+        entry = self._rates.get(symbol)
+        if entry is not None and self._now_ms() < entry[1]:
+            return entry[0]
+
+        if self.bulk:
+            # One request refreshes every tracked symbol that is missing or past its funding time
+            now_ms = self._now_ms()
+            stale = [s for s in self.tracked if s not in self._rates or now_ms >= self._rates[s][1]]
+            self.refresh(list(dict.fromkeys(stale + [symbol])))
+        else:
+            self.refresh([symbol])
+        return self._rates.get(symbol, (None, 0))[0]
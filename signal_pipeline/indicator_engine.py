@@ -0,0 +1,345 @@
+import json
+import math
+import os
+import sys
+from collections import deque
+
+import pandas as pd
+
+# Streaming versions of the pandas_ta indicators the bots use. Each indicator
+# keeps only its running EMA/Wilder state or a fixed-size window, so updating a
+# symbol with a new bar costs the same whether it has 200 or 200k bars of history.
+# The formulas follow pandas_ta's defaults (not its TA-Lib code path):
+#   rsi / atr   -> rma, i.e. ewm(alpha=1/n, adjust=True, min_periods=n)
+#   ema         -> seeded with the SMA of the first n values, then ewm(span=n, adjust=False)
+#   bbands      -> rolling mean ± k * rolling std (ddof=0)
+#   stoch(rsi)  -> rolling min/max, then SMA smoothing
+
+NAN = float("nan")
+_EPSILON = sys.float_info.epsilon
+
+CRYPTO_COLUMNS = {
+    "RSI": "RSI",
+    "MACD_Hist": "MACD_Hist",
+    "EMA_50": "EMA_50",
+    "ATR_14": "ATR_14",
+    "BBL": "BBL",
+    "BBM": "BBM",
+    "BBU": "BBU",
+    "StochRSI_K": "StochRSI_K",
+    "StochRSI_D": "StochRSI_D",
+}
+
+EQUITY_COLUMNS = {
+    "RSI": "RSI",
+    "MACD_Hist": "MACD_Hist",
+    "EMA_50": "EMA_50",
+    "BB_Lower": "BBL",
+    "BB_Upper": "BBU",
+    "Stoch_K": "Stoch_K",
+    "Stoch_D": "Stoch_D",
+}
+
+
+def _non_zero(value):
+    # pandas_ta's non_zero_range swaps a zero range for machine epsilon
+    return _EPSILON if value == 0 else value
+
+
+class RMA:
+    def __init__(self, length):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self.numerator = 0.0
+        self.denominator = 0.0
+        self.count = 0
+
+    def update(self, value):
+        if value is None or math.isnan(value):
+            return self.value
+        self.numerator = value + self.decay * self.numerator
+        self.denominator = 1.0 + self.decay * self.denominator
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        return self.numerator / self.denominator if self.count >= self.length else NAN
+
+    def to_state(self):
+        return [self.numerator, self.denominator, self.count]
+
+    def load_state(self, state):
+        self.numerator, self.denominator, self.count = state
+
+
+class EMA:
+    def __init__(self, length):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.seed = []
+        self.current = NAN
+
+    def update(self, value):
+        if value is None or math.isnan(value):
+            return self.current
+        if len(self.seed) < self.length:
+            self.seed.append(value)
+            if len(self.seed) == self.length:
+                self.current = sum(self.seed) / self.length
+        else:
+            self.current = self.alpha * value + (1.0 - self.alpha) * self.current
+        return self.current
+
+    @property
+    def value(self):
+        return self.current
+
+    def to_state(self):
+        return [list(self.seed), self.current]
+
+    def load_state(self, state):
+        self.seed, self.current = list(state[0]), state[1]
+
+
+class Window:
+    def __init__(self, length):
+        self.length = length
+        self.values = deque(maxlen=length)
+
+    def update(self, value):
+        self.values.append(value)
+
+    @property
+    def full(self):
+        return len(self.values) == self.length and not any(math.isnan(v) for v in self.values)
+
+    def mean(self):
+        return sum(self.values) / self.length if self.full else NAN
+
+    def std(self):
+        if not self.full:
+            return NAN
+        mean = sum(self.values) / self.length
+        return math.sqrt(sum((v - mean) ** 2 for v in self.values) / self.length)
+
+    def min(self):
+        return min(self.values) if self.full else NAN
+
+    def max(self):
+        return max(self.values) if self.full else NAN
+
+    def to_state(self):
+        return list(self.values)
+
+    def load_state(self, state):
+        self.values = deque(state, maxlen=self.length)
+
+
+class SMA:
+    # Skips leading NaNs like pandas_ta's `.loc[first_valid_index():]` slicing
+    def __init__(self, length):
+        self.window = Window(length)
+
+    def update(self, value):
+        if math.isnan(value) and not self.window.values:
+            return NAN
+        self.window.update(value)
+        return self.window.mean()
+
+    @property
+    def value(self):
+        return self.window.mean()
+
+    def to_state(self):
+        return self.window.to_state()
+
+    def load_state(self, state):
+        self.window.load_state(state)
+
+
+class IndicatorEngine:
+    def __init__(self):
+        self.rsi_gain = RMA(14)
+        self.rsi_loss = RMA(14)
+        self.ema_fast = EMA(12)
+        self.ema_slow = EMA(26)
+        self.macd_signal = EMA(9)
+        self.ema_50 = EMA(50)
+        self.atr = RMA(14)
+        self.bb_window = Window(20)
+        self.rsi_window = Window(14)
+        self.stochrsi_k = SMA(3)
+        self.stochrsi_d = SMA(3)
+        self.high_window = Window(14)
+        self.low_window = Window(14)
+        self.stoch_k = SMA(3)
+        self.stoch_d = SMA(3)
+        self.prev_close = NAN
+        self.last_timestamp = None
+        self.values = {}
+        self._undo = None
+
+    _PARTS = (
+        "rsi_gain", "rsi_loss", "ema_fast", "ema_slow", "macd_signal", "ema_50", "atr",
+        "bb_window", "rsi_window", "stochrsi_k", "stochrsi_d", "high_window", "low_window",
+        "stoch_k", "stoch_d",
+    )
+
+    def update(self, timestamp, high, low, close):
+        # A bar with the same timestamp as the last one is the still-forming
+        # candle being revised: roll back to the state before it, then re-apply
+        if timestamp is not None and timestamp == self.last_timestamp and self._undo is not None:
+            self.load_state(self._undo)
+        self._undo = self.to_state()
+        self.last_timestamp = timestamp
+
+        prev_close = self.prev_close
+        self.prev_close = close
+
+        change = close - prev_close
+        rsi_gain = self.rsi_gain.update(max(change, 0.0) if not math.isnan(change) else NAN)
+        rsi_loss = self.rsi_loss.update(abs(min(change, 0.0)) if not math.isnan(change) else NAN)
+        rsi = 100.0 * rsi_gain / (rsi_gain + rsi_loss) if rsi_gain + rsi_loss != 0 else NAN
+
+        macd = self.ema_fast.update(close) - self.ema_slow.update(close)
+        macd_hist = macd - self.macd_signal.update(macd)
+
+        ema_50 = self.ema_50.update(close)
+
+        if math.isnan(prev_close):
+            true_range = NAN
+        else:
+            true_range = max(abs(_non_zero(high - low)), abs(high - prev_close), abs(prev_close - low))
+        atr = self.atr.update(true_range)
+
+        self.bb_window.update(close)
+        bb_mid = self.bb_window.mean()
+        bb_std = self.bb_window.std()
+
+        self.rsi_window.update(rsi)
+        stochrsi = 100.0 * (rsi - self.rsi_window.min()) / _non_zero(self.rsi_window.max() - self.rsi_window.min())
+        stochrsi_k = self.stochrsi_k.update(stochrsi)
+        stochrsi_d = self.stochrsi_d.update(stochrsi_k)
+
+        self.high_window.update(high)
+        self.low_window.update(low)
+        lowest = self.low_window.min()
+        stoch = 100.0 * (close - lowest) / _non_zero(self.high_window.max() - lowest)
+        stoch_k = self.stoch_k.update(stoch)
+        stoch_d = self.stoch_d.update(stoch_k)
+
+        self.values = {
+            "RSI": rsi,
+            "MACD_Hist": macd_hist,
+            "EMA_50": ema_50,
+            "ATR_14": atr,
+            "BBL": bb_mid - 2.0 * bb_std,
+            "BBM": bb_mid,
+            "BBU": bb_mid + 2.0 * bb_std,
+            "StochRSI_K": stochrsi_k,
+            "StochRSI_D": stochrsi_d,
+            "Stoch_K": stoch_k,
+            "Stoch_D": stoch_d,
+        }
+        return self.values
+
+    def ready(self, columns=CRYPTO_COLUMNS):
+        return bool(self.values) and not any(math.isnan(self.values[key]) for key in columns.values())
+
+    def latest(self, columns=CRYPTO_COLUMNS):
+        return {name: self.values.get(key, NAN) for name, key in columns.items()}
+
+    def to_state(self):
+        state = {name: getattr(self, name).to_state() for name in self._PARTS}
+        state["prev_close"] = self.prev_close
+        state["last_timestamp"] = self.last_timestamp
+        state["values"] = dict(self.values)
+        return state
+
+    def load_state(self, state):
+        for name in self._PARTS:
+            getattr(self, name).load_state(state[name])
+        self.prev_close = state["prev_close"]
+        self.last_timestamp = state["last_timestamp"]
+        self.values = dict(state["values"])
+
+    def save(self, path):
+        state = self.to_state()
+        state["undo"] = self._undo
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            # NaN round-trips through Python's json module
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            state = json.load(f)
+        engine = cls()
+        engine.load_state(state)
+        engine._undo = state.get("undo")
+        return engine
+
+
+class IndicatorEngineStore:
+    # One engine per symbol, restored from state_dir so restarts skip the warm-up
+    def __init__(self, state_dir=None):
+        self.state_dir = state_dir
+        self.engines = {}
+
+    def _path(self, key):
+        safe_key = "".join(c if c.isalnum() else "-" for c in key)
+        return os.path.join(self.state_dir, f"{safe_key}.json")
+
+    def get(self, key):
+        engine = self.engines.get(key)
+        if engine is None:
+            path = self._path(key) if self.state_dir else None
+            if path and os.path.exists(path):
+                try:
+                    engine = IndicatorEngine.load(path)
+                except Exception as e:
+                    print(f"⚠️ Ignoring unreadable indicator state for {key}: {e}")
+            self.engines[key] = engine = engine or IndicatorEngine()
+        return engine
+
+    def update_from_frame(self, key, df, price_columns=("high", "low", "close"), columns=CRYPTO_COLUMNS):
+        # Feeds only the bars the engine has not seen (plus the last seen one,
+        # which may have been revised) and returns a one-row frame holding the
+        # latest bar with its indicator columns — or an empty frame while warming up
+        if df.empty:
+            return pd.DataFrame()
+        engine = self.get(key)
+        timestamps = df.index.asi8
+        high_col, low_col, close_col = price_columns
+
+        start = 0
+        if engine.last_timestamp is not None:
+            seen = timestamps.searchsorted(engine.last_timestamp)
+            if seen < len(timestamps) and timestamps[seen] == engine.last_timestamp:
+                start = seen
+            elif seen == len(timestamps):
+                start = len(timestamps)
+            else:
+                # The engine's last bar is not in this frame: history has a gap, start over
+                engine = self.engines[key] = IndicatorEngine()
+
+        highs = df[high_col].to_numpy(dtype=float)
+        lows = df[low_col].to_numpy(dtype=float)
+        closes = df[close_col].to_numpy(dtype=float)
+        for i in range(start, len(timestamps)):
+            engine.update(int(timestamps[i]), highs[i], lows[i], closes[i])
+
+        if self.state_dir:
+            engine.save(self._path(key))
+
+        if not engine.ready(columns) or engine.last_timestamp != timestamps[-1]:
+            return pd.DataFrame()
+        latest = df.iloc[[-1]].copy()
+        for name, value in engine.latest(columns).items():
+            latest[name] = value
+        return latest
+
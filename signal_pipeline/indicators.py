@@ -0,0 +1,54 @@
+import pandas as pd
+
+# pandas_ta indicator columns shared by the bots, named as the signal rules
+# expect them. pandas_ta is imported on first use so that only the markets
+# actually being scanned pay for it.
+
+CRYPTO_INDICATOR_COLUMNS = ["RSI", "MACD_Hist", "EMA_50", "ATR_14", "BBL", "BBM", "BBU", "StochRSI_K", "StochRSI_D"]
+EQUITY_INDICATOR_COLUMNS = ["RSI", "MACD_Hist", "EMA_50", "BB_Lower", "BB_Upper", "Stoch_K", "Stoch_D"]
+
+
+def add_crypto_indicators(df, dropna=True):
+    # Lower-case OHLCV columns (ccxt); used by the spot and futures bots
+    import pandas_ta as ta
+
+    df["RSI"] = ta.rsi(df["close"], length=14)
+    macd = ta.macd(df["close"])
+    df["MACD_Hist"] = macd["MACDh_12_26_9"]
+    df["EMA_50"] = ta.ema(df["close"], length=50)
+    df["ATR_14"] = ta.atr(df["high"], df["low"], df["close"], length=14)
+    bbands = ta.bbands(df["close"], length=20, std=2)
+    df["BBL"] = bbands["BBL_20_2.0"]
+    df["BBM"] = bbands["BBM_20_2.0"]
+    df["BBU"] = bbands["BBU_20_2.0"]
+    stochrsi = ta.stochrsi(df["close"], length=14)
+    df["StochRSI_K"] = stochrsi.iloc[:, 0]
+    df["StochRSI_D"] = stochrsi.iloc[:, 1]
+    if dropna:
+        df.dropna(inplace=True)
+    return df
+
+
+def add_equity_indicators(df, dropna=True):
+    # Capitalised OHLCV columns (yfinance); used by the equities and options bots
+    import pandas_ta as ta
+
+    df["RSI"] = ta.rsi(df["Close"], length=14)
+    macd = ta.macd(df["Close"])
+    if macd is not None and "MACDh_12_26_9" in macd.columns:
+        df["MACD_Hist"] = macd["MACDh_12_26_9"]
+    else:
+        df["MACD_Hist"] = pd.NA
+    df["EMA_50"] = ta.ema(df["Close"], length=50)
+
+    bbands = ta.bbands(df["Close"], length=20)
+    df["BB_Lower"] = bbands["BBL_20_2.0"]
+    df["BB_Upper"] = bbands["BBU_20_2.0"]
+
+    stoch = ta.stoch(df["High"], df["Low"], df["Close"])
+    df["Stoch_K"] = stoch["STOCHk_14_3_3"]
+    df["Stoch_D"] = stoch["STOCHd_14_3_3"]
+
+    if dropna:
+        df.dropna(inplace=True)
+    return df
@@ -0,0 +1,60 @@
+from bisect import bisect_left, bisect_right, insort
+
+import numpy as np
+import pandas as pd
+
+# Support/resistance pivots without a per-bar Python loop.
+# A bar is a support pivot when its low is strictly below every low in the
+# `lookback` bars on each side (resistance: high strictly above every high).
+# Rolling min/max over the lows/highs gives both side windows for all bars at once.
+
+
+def _rolling(values, lookback, how):
+    rolled = pd.Series(values).rolling(lookback)
+    # rolled[k] covers values[k - lookback + 1 : k + 1]
+    return (rolled.min() if how == "min" else rolled.max()).to_numpy()
+
+
+def pivot_indices(values, lookback, how):
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n < 2 * lookback + 1:
+        return np.empty(0, dtype=np.int64)
+
+    rolled = _rolling(values, lookback, how)
+    centre = np.arange(lookback, n - lookback)
+    before = rolled[centre - 1]          # values[i - lookback : i]
+    after = rolled[centre + lookback]    # values[i + 1 : i + lookback + 1]
+    current = values[centre]
+    if how == "min":
+        mask = (current < before) & (current < after)
+    else:
+        mask = (current > before) & (current > after)
+    return centre[mask]
+
+
+def find_pivots(values, lookback, how):
+    values = np.asarray(values, dtype=float)
+    return values[pivot_indices(values, lookback, how)]
+
+
+def filter_levels(levels, threshold=0.02):
+    # Keeps a level only if it is more than `threshold` away from every level
+    # kept before it (in detection order). Kept levels sit in a sorted list, so
+    # only the neighbours inside the ±threshold band need the exact check.
+    kept = []
+    for lvl in levels:
+        lvl = float(lvl)
+        # Slightly widened band; the original comparison decides the edge cases
+        low = lvl / (1 + threshold) * (1 - 1e-9)
+        high = lvl / (1 - threshold) * (1 + 1e-9)
+        neighbours = kept[bisect_left(kept, low):bisect_right(kept, high)]
+        if all(abs(lvl - f) / f > threshold for f in neighbours):
+            insort(kept, lvl)
+    return kept
+
+
+def detect_support_resistance(df, lookback=60, threshold=0.02):
+    support_levels = find_pivots(df["Low"].to_numpy(), lookback, "min")
+    resistance_levels = find_pivots(df["High"].to_numpy(), lookback, "max")
+    return filter_levels(support_levels, threshold), filter_levels(resistance_levels, threshold)
@@ -0,0 +1,143 @@
+import datetime
+import math
+
+from signal_pipeline.yf_batch import interval_ms
+
+# Offline exchange calendar for the stock bots: regular sessions, holidays and
+# early closes from the bundled table below, so nothing is looked up online.
+# Times are seconds since the epoch, as in scheduler.py. Session hours are in
+# US Eastern time, converted with the US daylight-saving rule (second Sunday
+# of March to first Sunday of November), so no tz database is needed either.
+# Intraday bars are anchored at the open like Yahoo's (9:30, 9:35, ... for 5m;
+# 9:30, 10:30, ... for 1h) and the last bar of a session ends at its close;
+# daily and longer intervals get one bar per session. Outside the years in
+# the table only weekends count as closed.
+
+NYSE_HOLIDAYS = {
+    2024: ["01-01", "01-15", "02-19", "03-29", "05-27", "06-19", "07-04", "09-02", "11-28", "12-25"],
+    2025: ["01-01", "01-09", "01-20", "02-17", "04-18", "05-26", "06-19", "07-04", "09-01", "11-27", "12-25"],
+    2026: ["01-01", "01-19", "02-16", "04-03", "05-25", "06-19", "07-03", "09-07", "11-26", "12-25"],
+    2027: ["01-01", "01-18", "02-15", "03-26", "05-31", "06-18", "07-05", "09-06", "11-25", "12-24"],
+    2028: ["01-17", "02-21", "04-14", "05-29", "06-19", "07-04", "09-04", "11-23", "12-25"],
+}
+NYSE_EARLY_CLOSES = {
+    2024: ["07-03", "11-29", "12-24"],
+    2025: ["07-03", "11-28", "12-24"],
+    2026: ["11-27", "12-24"],
+    2027: ["11-26"],
+    2028: ["07-03", "11-24"],
+}
+
+
+def _dates(table):
+    return {datetime.date.fromisoformat(f"{year}-{day}") for year, days in table.items() for day in days}
+
+
+def _nth_sunday(year, month, n):
+    first = datetime.date(year, month, 1)
+    return first + datetime.timedelta(days=(6 - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def eastern_utc_offset(day):
+    # Hours from UTC to US Eastern on `day` (the switch happens at 2am, outside any session)
+    return -4 if _nth_sunday(day.year, 3, 2) <= day < _nth_sunday(day.year, 11, 1) else -5
+
+
+class MarketCalendar:
+    def __init__(self, name, holidays, early_closes, years, open_time=(9, 30), close_time=(16, 0), early_close_time=(13, 0)):
+        self.name = name
+        self.holidays = _dates(holidays)
+        self.early_closes = _dates(early_closes)
+        self.years = set(years)
+        self.open_time = open_time
+        self.close_time = close_time
+        self.early_close_time = early_close_time
+        self._warned = set()
+
+    def _timestamp(self, day, hour_minute):
+        hour, minute = hour_minute
+        local = datetime.datetime(day.year, day.month, day.day, hour, minute, tzinfo=datetime.timezone.utc)
+        return local.timestamp() - eastern_utc_offset(day) * 3600
+
+    def session(self, day):
+        # (open, close) of the session on `day`, or None when the market is closed all day
+        if day.year not in self.years and day.year not in self._warned:
+            self._warned.add(day.year)
+            print(f"⚠️ {self.name} calendar has no holidays for {day.year}, only weekends are treated as closed")
+        if day.weekday() >= 5 or day in self.holidays:
+            return None
+        close = self.early_close_time if day in self.early_closes else self.close_time
+        return self._timestamp(day, self.open_time), self._timestamp(day, close)
+
+    def _day(self, now):
+        return datetime.datetime.fromtimestamp(now, datetime.timezone.utc).date()
+
+    def sessions(self, start, end):
+        # Sessions overlapping [start, end], in order
+        day = self._day(start) - datetime.timedelta(days=1)
+        while True:
+            session = self.session(day)
+            if session is not None and session[0] > end:
+                return
+            if session is not None and session[1] >= start:
+                yield session
+            day += datetime.timedelta(days=1)
+
+    def is_open(self, now):
+        return any(open_ <= now < close for open_, close in self.sessions(now, now))
+
+    def next_open(self, now):
+        # The next session open after `now` (or the current session's open, if it has not started yet)
+        return next(open_ for open_, _close in self.sessions(now, math.inf) if open_ > now)
+
+    def bar_closes(self, start, end, interval):
+        # Bar close times in (start, end], in order; end may be math.inf
+        period = interval_ms(interval) / 1000
+        for open_, close in self.sessions(start, end):
+            if period >= 86_400:
+                closes = [close]
+            else:
+                closes = [open_ + period * k for k in range(1, math.ceil((close - open_) / period))] + [close]
+            for bar_close in closes:
+                if bar_close > end:
+                    return
+                if bar_close > start:
+                    yield bar_close
+
+    def next_bar_close(self, now, interval):
+        return next(self.bar_closes(now, math.inf, interval))
+
+    def last_bar_close(self, now, interval, lookback_days=14):
+        # The latest bar close at or before `now`, or None
+        closes = list(self.bar_closes(now - lookback_days * 86_400, now, interval))
+        return closes[-1] if closes else None
+
+
+CALENDARS = {
+    "NYSE": MarketCalendar("NYSE", NYSE_HOLIDAYS, NYSE_EARLY_CLOSES, NYSE_HOLIDAYS),
+}
+
+
+def get_calendar(name):
+    if name is None:
+        return None
+    if name not in CALENDARS:
+        raise ValueError(f"Unknown market calendar {name!r} (bundled: {', '.join(CALENDARS)})")
+    return CALENDARS[name]
+
+
+def _utc(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+
+
+def scan_gate(calendar, now, interval, last_scanned=None, grace_seconds=0.0):
+    # (bar close to scan, None) when there is a new bar to download, else (None, reason). Outside a
+    # session only the run right after the close (within one bar and the grace period) downloads.
+    bar_close = calendar.last_bar_close(now, interval)
+    if bar_close is None:
+        return None, f"no {calendar.name} session in the last two weeks"
+    if bar_close == last_scanned:
+        return None, f"no new {interval} bar since the one closed at {_utc(bar_close)}"
+    if not calendar.is_open(now) and now - bar_close > min(interval_ms(interval) / 1000, 3600) + grace_seconds:
+        return None, f"{calendar.name} is closed until {_utc(calendar.next_open(now))}"
+    return bar_close, None
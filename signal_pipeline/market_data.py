@@ -0,0 +1,227 @@
+import argparse
+import collections
+import contextlib
+import json
+import os
+import re
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+
+from signal_pipeline.yf_batch import DEFAULT_CHUNK_SIZE, download_bars, interval_ms, prepare_stock_frames
+
+# A local market-data service shared by the equities and options bots, so
+# tickers both of them watch are downloaded and get their indicators computed
+# once per bar instead of once per bot.
+# Requests come over a Unix socket, one JSON line per connection: the tickers,
+# period, interval and whether indicator columns are wanted. Each (period,
+# interval) is downloaded at most once per bar with bulk yf.download calls;
+# later requests in the same bar only fetch the tickers nobody asked for yet.
+# Every frame is written once as an Arrow IPC file in shared memory
+# (/dev/shm), and the reply lists the file paths. Clients memory-map the files,
+# so every consumer reads the same pages without copying or re-parsing them.
+# Files of a finished bar are unlinked when the next bar is first requested;
+# a client still holding a mapping keeps its data until it lets go of it.
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "signal-market-data.sock")
+
+
+def default_data_dir():
+    root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(root, f"signal-market-data-{os.getuid()}")
+
+
+def write_frame(df, path):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with pa.OSFile(temporary, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(temporary, path)
+
+
+def read_frame(path):
+    # Columns without nulls stay views on the mapped file (read-only arrays)
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+class MarketDataService:
+    def __init__(self, socket_path=DEFAULT_SOCKET, data_dir=None, chunk_size=DEFAULT_CHUNK_SIZE, pool=None, clock=time.time):
+        self.socket_path = socket_path
+        self.data_dir = data_dir or default_data_dir()
+        self.chunk_size = chunk_size
+        self.pool = pool
+        self.clock = clock
+        self.counters = collections.Counter()
+        self._raw = {}
+        self._files = {}
+        self._locks = collections.defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+        self._server = None
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def _bar(self, interval):
+        period = interval_ms(interval)
+        return int(self.clock() * 1000) // period * period
+
+    def _series_lock(self, period, interval):
+        with self._lock:
+            return self._locks[(period, interval)]
+
+    def _raw_frames(self, period, interval, bar, tickers):
+        # Raw bars of this bar for `tickers`, downloading only the ones not fetched yet; None for no data
+        bar_frames = self._raw.get((period, interval))
+        if bar_frames is None or bar_frames[0] != bar:
+            bar_frames = self._raw[(period, interval)] = (bar, {})
+        frames = bar_frames[1]
+        missing = [ticker for ticker in tickers if ticker not in frames]
+        if missing:
+            downloaded = download_bars(missing, period=period, interval=interval, chunk_size=self.chunk_size)
+            self.counters["downloaded"] += len(missing)
+            for ticker in missing:
+                frames[ticker] = downloaded.get(ticker)
+        return {ticker: frames[ticker] for ticker in tickers}
+
+    def _path(self, period, interval, indicators, bar, ticker):
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return os.path.join(self.data_dir, f"{interval}-{period}-{'ind' if indicators else 'raw'}-{bar}-{name}.arrow")
+
+    def _drop_files(self, paths):
+        for path in paths.values():
+            if path:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+
+    def frames(self, tickers, period="5d", interval="5m", indicators=True):
+        # {ticker: Arrow file path} for this bar; tickers without data (or unusable bars, with indicators) are left out
+        tickers = list(dict.fromkeys(tickers))
+        key = (period, interval, bool(indicators))
+        with self._series_lock(period, interval):
+            bar = self._bar(interval)
+            entry = self._files.get(key)
+            if entry is None or entry[0] != bar:
+                if entry is not None:
+                    self._drop_files(entry[1])
+                entry = self._files[key] = (bar, {})
+            paths = entry[1]
+            missing = [ticker for ticker in tickers if ticker not in paths]
+            if missing:
+                raw = {ticker: df for ticker, df in self._raw_frames(period, interval, bar, missing).items() if df is not None}
+                if indicators:
+                    frames = prepare_stock_frames({ticker: df.copy() for ticker, df in raw.items()}, pool=self.pool)
+                    self.counters["computed"] += len(frames)
+                else:
+                    frames = raw
+                for ticker in missing:
+                    df = frames.get(ticker)
+                    if df is None or df.empty:
+                        paths[ticker] = None
+                        continue
+                    paths[ticker] = self._path(period, interval, indicators, bar, ticker)
+                    write_frame(df, paths[ticker])
+            self.counters["requests"] += 1
+            self.counters["served"] += len(tickers)
+            self.counters["shared"] += len(tickers) - len(missing)
+            return {ticker: paths[ticker] for ticker in tickers if paths[ticker]}
+
+    def handle(self, request):
+        op = request.get("op", "frames")
+        if op == "frames":
+            return {"frames": self.frames(request["tickers"], request.get("period", "5d"), request.get("interval", "5m"),
+                                          request.get("indicators", True))}
+        if op == "stats":
+            return {"stats": dict(self.counters)}
+        return {"error": f"unknown op {op!r}"}
+
+    def start(self):
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    reply = service.handle(json.loads(self.rfile.readline()))
+                except Exception as e:
+                    reply = {"error": f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="market-data", daemon=True).start()
+        print(f"🛰 Market data service on {self.socket_path}, frames in {self.data_dir}")
+        return self
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+        for _bar, paths in self._files.values():
+            self._drop_files(paths)
+        self._files.clear()
+
+
+class MarketDataClient:
+    def __init__(self, socket_path=DEFAULT_SOCKET, timeout=300.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def request(self, payload):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            with sock.makefile("rb") as reply:
+                response = json.loads(reply.readline())
+        if "error" in response:
+            raise RuntimeError(f"Market data service: {response['error']}")
+        return response
+
+    def frames(self, tickers, period="5d", interval="5m", indicators=True):
+        # {ticker: DataFrame}, or None when the service cannot be reached (callers then fetch directly)
+        try:
+            response = self.request({"op": "frames", "tickers": list(tickers), "period": period,
+                                     "interval": interval, "indicators": indicators})
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Market data service at {self.socket_path} unavailable ({e}), downloading directly")
+            return None
+        return {ticker: read_frame(path) for ticker, path in response["frames"].items()}
+
+    def stats(self):
+        return self.request({"op": "stats"})["stats"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared market-data service for the equities and options bots")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"Unix socket to listen on (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--data-dir", help=f"where frames are written (default: {default_data_dir()})")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="tickers per yf.download call")
+    parser.add_argument("--workers", type=int, default=0, help="indicator process pool size (0 = in this process)")
+    args = parser.parse_args()
+
+    pool = None
+    if args.workers:
+        from signal_pipeline.parallel_indicators import IndicatorPool
+        pool = IndicatorPool("equity", workers=args.workers)
+    service = MarketDataService(args.socket, args.data_dir, args.chunk_size, pool).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        if pool is not None:
+            pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+# Watchlists built from the exchange's own market list instead of a hand-kept one.
+
+
+def quote_markets(exchange, quote="USDT", market_type="spot", linear_only=True):
+    # Active markets quoted in `quote`; market_type is ccxt's "spot", "swap" or "future"
+    markets = exchange.load_markets()
+    symbols = []
+    for symbol, market in markets.items():
+        if market.get("quote") != quote or market.get("type") != market_type:
+            continue
+        if market.get("active") is False:
+            continue
+        if linear_only and market.get("contract") and not market.get("linear"):
+            continue
+        symbols.append(symbol)
+    return sorted(symbols)
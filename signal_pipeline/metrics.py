@@ -0,0 +1,308 @@
+import bisect
+import cProfile
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Process-wide metrics in Prometheus text format, off until a bot configures them.
+# Stages are timed by decorating the bots' own functions; while metrics are
+# disabled the decorator costs one attribute check per call. Stage histograms
+# are observed once per call, so per-symbol stages (fetch, indicators, signals,
+# report) give per-symbol latency distributions without a per-symbol label.
+# Exceptions escaping a stage are counted by type before they propagate.
+# Exposition: http://host:port/metrics and/or a file rewritten after every
+# scan (e.g. for node_exporter's textfile collector). A bot can also ask for a
+# cProfile capture of its next scan.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SCAN_BUCKETS = (1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            for key, value in items:
+                lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                # [per-bucket counts (last one is +Inf), sum, count]
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def _render_sample(self, key, value):
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = f'le="{_format_value(float(bound))}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.enabled = False
+        self._metrics = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()):
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram("signal_stage_seconds", "Duration of one call of a bot stage", ("bot", "stage"))
+SCAN_SECONDS = registry.histogram("signal_scan_seconds", "Duration of a whole scan", ("bot",), SCAN_BUCKETS)
+SCAN_SYMBOLS = registry.gauge("signal_scan_symbols", "Watchlist size of the last scan", ("bot",))
+LAST_SCAN = registry.gauge("signal_last_scan_timestamp_seconds", "Unix time the last scan finished", ("bot",))
+ERRORS = registry.counter("signal_errors_total", "Exceptions raised by a stage, by type", ("bot", "stage", "type"))
+REQUEST_SECONDS = registry.histogram("signal_fetch_request_seconds", "Latency of one market-data request", ("source",))
+FETCH_BODY_BYTES = registry.counter(
+    "signal_fetch_body_bytes_total", "Decoded response body bytes (UTF-8) received from the exchange API", ("source",),
+)
+FETCH_ROWS = registry.counter("signal_fetch_rows_total", "Bars received from bulk downloads", ("source",))
+RATE_LIMIT_WAIT = registry.counter("signal_rate_limit_wait_seconds_total", "Time spent waiting for rate limits", ("source",))
+ALERT_SECONDS = registry.histogram(
+    "signal_alert_delivery_seconds", "Alert delivery latency (queued alerts: from enqueue to post)", ("mode",),
+)
+ALERTS = registry.counter("signal_alerts_total", "Alerts by delivery mode and outcome", ("mode", "outcome"))
+
+_lock = threading.Lock()
+_servers = {}
+_paths = {}
+_profiles = {}
+
+
+def enabled():
+    return registry.enabled
+
+
+def configure_metrics(bot, port=None, path=None, profile=None, host="127.0.0.1"):
+    # Returns True when metrics are being collected for this process
+    with _lock:
+        if port or path:
+            registry.enabled = True
+        if port and port not in _servers:
+            _servers[port] = serve_metrics(port, host)
+            print(f"📈 Metrics on http://{host}:{port}/metrics")
+        if path:
+            _paths[bot] = path
+        if profile:
+            _profiles[bot] = profile
+    return registry.enabled
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=f"metrics-{port}", daemon=True).start()
+    return server
+
+
+def write_metrics(path):
+    # Atomic replace, so a scraper never reads a half-written file
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
+
+
+def timed(bot, stage):
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                ERRORS.inc(1, bot, stage, type(e).__name__)
+                raise
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - started, bot, stage)
+        return wrapper
+    return decorate
+
+
+def scan(bot):
+    # For a bot's run function: times the scan, refreshes the metrics file and runs a requested profile
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(symbols, *args, **kwargs):
+            with _lock:
+                profile_path = _profiles.pop(bot, None)
+            if not registry.enabled and profile_path is None:
+                return func(symbols, *args, **kwargs)
+
+            profiler = cProfile.Profile() if profile_path else None
+            started = time.perf_counter()
+            try:
+                if profiler is not None:
+                    return profiler.runcall(func, symbols, *args, **kwargs)
+                return func(symbols, *args, **kwargs)
+            finally:
+                if profiler is not None:
+                    os.makedirs(os.path.dirname(profile_path) or ".", exist_ok=True)
+                    profiler.dump_stats(profile_path)
+                    print(f"🔬 Profile of the {bot} scan saved to {profile_path} (python -m pstats {profile_path})")
+                if registry.enabled:
+                    SCAN_SECONDS.observe(time.perf_counter() - started, bot)
+                    SCAN_SYMBOLS.set(len(symbols), bot)
+                    LAST_SCAN.set(time.time(), bot)
+                    if bot in _paths:
+                        write_metrics(_paths[bot])
+        return wrapper
+    return decorate
+
+
+def observe_request(source, seconds, rows=None, body_bytes=None):
+    if not registry.enabled:
+        return
+    REQUEST_SECONDS.observe(seconds, source)
+    if rows is not None:
+        FETCH_ROWS.inc(rows, source)
+    if body_bytes is not None:
+        FETCH_BODY_BYTES.inc(body_bytes, source)
+
+
+def observe_alert(mode, outcome, seconds=None):
+    if not registry.enabled:
+        return
+    ALERTS.inc(1, mode, outcome)
+    if seconds is not None:
+        ALERT_SECONDS.observe(seconds, mode)
+
+
+def observe_rate_limit(source, seconds):
+    if registry.enabled and seconds > 0:
+        RATE_LIMIT_WAIT.inc(seconds, source)
+
+
+def _body_bytes(body):
+    # ccxt keeps the decoded response text, so its size is counted in UTF-8 bytes, not characters
+    if body is None:
+        return 0
+    return len(body.encode("utf-8")) if isinstance(body, str) else len(body)
+
+
+def instrument_exchange(exchange):
+    # Wraps a sync ccxt exchange's throttle (rate-limit sleeps) and fetch (each HTTP request)
+    source = exchange.id
+    throttle, fetch = exchange.throttle, exchange.fetch
+
+    def timed_throttle(cost=None):
+        started = time.perf_counter()
+        try:
+            return throttle(cost)
+        finally:
+            observe_rate_limit(source, time.perf_counter() - started)
+
+    def timed_fetch(url, method="GET", headers=None, body=None):
+        started = time.perf_counter()
+        response = fetch(url, method, headers, body)
+        observe_request(source, time.perf_counter() - started, body_bytes=_body_bytes(exchange.last_http_response))
+        return response
+
+    exchange.throttle = timed_throttle
+    exchange.fetch = timed_fetch
+    return exchange
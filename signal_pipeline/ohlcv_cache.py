@@ -0,0 +1,144 @@
+import os
+import re
+import time
+
+import pandas as pd
+
+# On-disk candle cache keyed by exchange / symbol / timeframe.
+# Each series is stored as one columnar file (Parquet or Feather). A run only
+# asks the exchange for bars from the last cached timestamp onwards; that last
+# bar is re-fetched on purpose because it was probably still forming when cached.
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+_TIMEFRAME_UNITS_MS = {
+    "m": 60_000,
+    "h": 3_600_000,
+    "d": 86_400_000,
+    "w": 604_800_000,
+    "M": 2_592_000_000,
+}
+
+
+def timeframe_to_ms(timeframe):
+    match = re.fullmatch(r"(\d+)([mhdwM])", timeframe)
+    if not match:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(match.group(1)) * _TIMEFRAME_UNITS_MS[match.group(2)]
+
+
+def _empty_frame():
+    return pd.DataFrame({col: pd.Series(dtype="int64" if col == "timestamp" else "float64") for col in OHLCV_COLUMNS})
+
+
+def merge_ohlcv(cached, ohlcv):
+    fresh = pd.DataFrame(ohlcv, columns=OHLCV_COLUMNS)
+    if fresh.empty:
+        return cached
+    fresh["timestamp"] = fresh["timestamp"].astype("int64")
+    merged = fresh if cached.empty else pd.concat([cached, fresh], ignore_index=True)
+    # The newest copy of a bar wins, so a forming candle is replaced by its final values
+    merged = merged.drop_duplicates("timestamp", keep="last").sort_values("timestamp")
+    return merged.reset_index(drop=True)
+
+
+class OHLCVCache:
+    def __init__(self, root=".cache/ohlcv", fmt="parquet", max_bars=5000):
+        if fmt not in ("parquet", "feather"):
+            raise ValueError(f"Unsupported cache format: {fmt}")
+        self.root = root
+        self.fmt = fmt
+        self.max_bars = max_bars
+        self._frames = {}
+        try:
+            import pyarrow  # noqa: F401
+            self.persistent = True
+        except ImportError:
+            print("⚠️ pyarrow not installed — OHLCV cache will only live in memory")
+            self.persistent = False
+
+    def path(self, exchange_id, symbol, timeframe):
+        safe_symbol = re.sub(r"[^A-Za-z0-9]+", "-", symbol).strip("-")
+        return os.path.join(self.root, exchange_id, timeframe, f"{safe_symbol}.{self.fmt}")
+
+    def load(self, exchange_id, symbol, timeframe):
+        key = (exchange_id, symbol, timeframe)
+        if key in self._frames:
+            return self._frames[key]
+
+        frame = _empty_frame()
+        path = self.path(exchange_id, symbol, timeframe)
+        if self.persistent and os.path.exists(path):
+            try:
+                frame = pd.read_parquet(path) if self.fmt == "parquet" else pd.read_feather(path)
+                frame = frame[OHLCV_COLUMNS]
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable cache file {path}: {e}")
+                frame = _empty_frame()
+        self._frames[key] = frame
+        return frame
+
+    def save(self, exchange_id, symbol, timeframe, frame):
+        self._frames[(exchange_id, symbol, timeframe)] = frame
+        if not self.persistent:
+            return
+        path = self.path(exchange_id, symbol, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so a crash never leaves a half-written cache file
+        tmp_path = f"{path}.tmp"
+        if self.fmt == "parquet":
+            frame.to_parquet(tmp_path, index=False)
+        else:
+            frame.to_feather(tmp_path)
+        os.replace(tmp_path, path)
+
+    def since(self, exchange_id, symbol, timeframe, limit, now_ms=None):
+        # Returns the `since` to pass to fetch_ohlcv, or None when a full fetch is needed
+        cached = self.load(exchange_id, symbol, timeframe)
+        if cached.empty:
+            return None
+        last_ts = int(cached["timestamp"].iloc[-1])
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        if now_ms - last_ts >= limit * timeframe_to_ms(timeframe):
+            # Too far behind for one request to close the gap
+            return None
+        return last_ts
+
+    def update(self, exchange_id, symbol, timeframe, ohlcv, limit, replace=False):
+        # replace=True follows a full fetch: the old bars would leave a gap in the series
+        cached = _empty_frame() if replace else self.load(exchange_id, symbol, timeframe)
+        merged = merge_ohlcv(cached, ohlcv)
+        if len(merged) > self.max_bars:
+            merged = merged.iloc[-self.max_bars:].reset_index(drop=True)
+        self.save(exchange_id, symbol, timeframe, merged)
+        # Row by row, so timestamps stay int ms as in ccxt (to_numpy() would make them floats)
+        return [[int(ts), *map(float, values)] for ts, *values in merged.iloc[-limit:].itertuples(index=False)]
+
+
+def fetch_ohlcv_cached(exchange, cache, symbol, timeframe="1h", limit=200, exchange_id=None):
+    # exchange_id overrides the cache namespace, e.g. to keep spot and futures candles apart
+    exchange_id = exchange_id or getattr(exchange, "id", type(exchange).__name__)
+    since = cache.since(exchange_id, symbol, timeframe, limit)
+    if since is None:
+        ohlcv = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+    else:
+        ohlcv = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
+    return cache.update(exchange_id, symbol, timeframe, ohlcv, limit, replace=since is None)
+
+
+_shared_caches = {}
+
+
+def shared_ohlcv_cache(root=".cache/ohlcv", fmt="parquet"):
+    # Bots running in one process share one cache object per directory
+    key = (root, fmt)
+    if key not in _shared_caches:
+        _shared_caches[key] = OHLCVCache(root, fmt)
+    return _shared_caches[key]
+
+
+def ohlcv_to_df(ohlcv):
+    df = pd.DataFrame(ohlcv, columns=OHLCV_COLUMNS)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    df.set_index("timestamp", inplace=True)
+    return df
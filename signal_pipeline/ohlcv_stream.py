@@ -0,0 +1,173 @@
+import asyncio
+import concurrent.futures
+import time
+
+from signal_pipeline.async_ohlcv import fetch_ohlcv_many
+from signal_pipeline.ohlcv_cache import timeframe_to_ms
+
+# Live candles over WebSocket through ccxt.pro's watch_ohlcv, for a whole watchlist.
+# History is seeded once over REST; after that the exchange pushes updates of the
+# forming candle. Exchanges with watchOHLCVForSymbols get one multiplexed
+# subscription per batch of symbols, the rest one watch_ohlcv loop per symbol
+# (ccxt shares the connection between them). A candle counts as closed when a
+# newer one starts, or `grace_seconds` after its end if the symbol is quiet.
+# Each closed candle hands the symbol's closed history (oldest first, up to
+# `limit` rows of ccxt OHLCV) to on_close(symbol, ohlcv) on one worker thread,
+# so evaluation never stalls the socket reads; the optional on_seed(symbol,
+# ohlcv) gets the seeded history there first, to warm indicator state up. The exchange's milliseconds()
+# is the clock, which lets a replaying fake exchange drive the close timer.
+
+
+def make_pro_exchange(exchange_id, config=None):
+    import ccxt.pro as ccxt_pro
+
+    config = dict(config or {})
+    config.setdefault("enableRateLimit", True)
+    return getattr(ccxt_pro, exchange_id)(config)
+
+
+class OHLCVStream:
+    def __init__(self, exchange_factory, symbols, timeframe, on_close, limit=200, grace_seconds=1.0,
+                 batch_size=50, concurrency=8, on_seed=None):
+        self.exchange_factory = exchange_factory
+        self.symbols = list(dict.fromkeys(symbols))
+        self.timeframe = timeframe
+        self.timeframe_ms = timeframe_to_ms(timeframe)
+        self.on_close = on_close
+        self.on_seed = on_seed
+        self.limit = limit
+        self.grace_ms = int(grace_seconds * 1000)
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.exchange = None
+        self.history = {}
+        self.forming = {}
+        self.closed = 0
+        self._executor = None
+        self._stopping = None
+
+    def _now_ms(self):
+        return self.exchange.milliseconds()
+
+    async def _seed(self):
+        results, errors, _timings = await fetch_ohlcv_many(
+            self.exchange, self.symbols, self.timeframe, self.limit + 1, self.concurrency,
+        )
+        for symbol, error in errors.items():
+            print(f"⚠️ No history for {symbol}: {error}")
+        boundary = self._now_ms() // self.timeframe_ms * self.timeframe_ms
+        for symbol, ohlcv in results.items():
+            self.history[symbol] = [list(row) for row in ohlcv if row[0] < boundary][-self.limit:]
+            if ohlcv and ohlcv[-1][0] >= boundary:
+                self.forming[symbol] = list(ohlcv[-1])
+        if self.on_seed is not None:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(
+                loop.run_in_executor(self._executor, self._evaluate, symbol, history, self.on_seed)
+                for symbol, history in self.history.items() if history
+            ))
+        print(f"📡 Seeded {len(results)}/{len(self.symbols)} symbols, streaming {self.timeframe} candles")
+
+    def update(self, symbol, row):
+        history = self.history.setdefault(symbol, [])
+        if history and row[0] <= history[-1][0]:
+            return  # late update of a candle already closed
+        forming = self.forming.get(symbol)
+        if forming is not None and row[0] > forming[0]:
+            self._close(symbol, forming)
+        self.forming[symbol] = list(row)
+
+    def _close(self, symbol, row):
+        history = self.history.setdefault(symbol, [])
+        history.append(row)
+        del history[:-self.limit]
+        self.forming.pop(symbol, None)
+        self.closed += 1
+        ohlcv = [list(r) for r in history]
+        asyncio.get_running_loop().run_in_executor(self._executor, self._evaluate, symbol, ohlcv)
+
+    def _evaluate(self, symbol, ohlcv, callback=None):
+        try:
+            (callback or self.on_close)(symbol, ohlcv)
+        except Exception as e:
+            print(f"❌ Error processing {symbol}: {e}")
+
+    def close_due(self):
+        # Quiet symbols: their candle closes grace_ms after its end without a newer update
+        now = self._now_ms()
+        for symbol, row in list(self.forming.items()):
+            if row[0] + self.timeframe_ms + self.grace_ms <= now:
+                self._close(symbol, row)
+
+    async def _retrying(self, label, watch):
+        delay = 1.0
+        while not self._stopping.is_set():
+            try:
+                await watch()
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Stream {label} failed ({type(e).__name__}: {e}), reconnecting in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    async def _watch_batch(self, batch):
+        pairs = [[symbol, self.timeframe] for symbol in batch]
+
+        async def watch():
+            update = await self.exchange.watch_ohlcv_for_symbols(pairs)
+            for symbol, frames in update.items():
+                for row in frames.get(self.timeframe, [])[-2:]:
+                    self.update(symbol, row)
+
+        await self._retrying(f"batch of {len(batch)}", watch)
+
+    async def _watch_symbol(self, symbol):
+        async def watch():
+            for row in (await self.exchange.watch_ohlcv(symbol, self.timeframe))[-2:]:
+                self.update(symbol, row)
+
+        await self._retrying(symbol, watch)
+
+    async def _close_timer(self):
+        while not self._stopping.is_set():
+            self.close_due()
+            await asyncio.sleep(0.25)
+
+    async def run_async(self, duration=None):
+        self._stopping = asyncio.Event()
+        self.exchange = self.exchange_factory()
+        self._executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="stream-eval")
+        try:
+            await self._seed()
+            if self.exchange.has.get("watchOHLCVForSymbols"):
+                batches = [self.symbols[i:i + self.batch_size] for i in range(0, len(self.symbols), self.batch_size)]
+                watchers = [self._watch_batch(batch) for batch in batches]
+            else:
+                watchers = [self._watch_symbol(symbol) for symbol in self.symbols]
+            tasks = [asyncio.create_task(w) for w in watchers + [self._close_timer()]]
+            try:
+                if duration is None:
+                    await asyncio.gather(*tasks)
+                else:
+                    await asyncio.sleep(duration)
+            finally:
+                self._stopping.set()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._executor.shutdown(wait=True)
+            close = getattr(self.exchange, "close", None)
+            if close is not None:
+                await close()
+
+    def run(self, duration=None):
+        # Streams until interrupted (or for `duration` seconds)
+        started = time.perf_counter()
+        try:
+            asyncio.run(self.run_async(duration))
+        except KeyboardInterrupt:
+            pass
+        print(f"📡 Stream stopped after {time.perf_counter() - started:.0f}s, {self.closed} candles closed")
@@ -0,0 +1,175 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Option-chain cache keyed by (ticker, expiration), with a TTL and LRU eviction.
+# Expiration lists are cached per ticker as well, and the yf.Ticker they came
+# from is reused for that ticker's chains (a fresh Ticker re-downloads the
+# expiration list before every chain). With `root` set, chains are also written
+# to disk so back-to-back runs within the TTL skip Yahoo entirely.
+
+
+def _default_ticker_factory(ticker):
+    import yfinance as yf
+    return yf.Ticker(ticker)
+
+
+class OptionChainCache:
+    def __init__(self, ttl=300.0, max_entries=256, root=None, ticker_factory=None, clock=time.time):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.root = root
+        self.ticker_factory = ticker_factory or _default_ticker_factory
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._tickers = {}
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            fetched_at, value = entry
+            if self.clock() - fetched_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return value
+
+    def _put(self, key, value, fetched_at=None):
+        with self._lock:
+            self._entries[key] = (self.clock() if fetched_at is None else fetched_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _ticker(self, ticker, refresh=False):
+        with self._lock:
+            if refresh or ticker not in self._tickers:
+                self._tickers[ticker] = self.ticker_factory(ticker)
+            return self._tickers[ticker]
+
+    def path(self, ticker, expiration=None):
+        safe_ticker = re.sub(r"[^A-Za-z0-9]+", "-", ticker).strip("-")
+        name = "expirations.json" if expiration is None else f"{expiration}.parquet"
+        return os.path.join(self.root, safe_ticker, name)
+
+    def _load_disk(self, ticker, expiration=None):
+        if self.root is None:
+            return None
+        path = self.path(ticker, expiration)
+        try:
+            fetched_at = os.path.getmtime(path)
+            if self.clock() - fetched_at > self.ttl:
+                return None
+            if expiration is None:
+                with open(path) as f:
+                    value = tuple(json.load(f))
+            else:
+                frame = pd.read_parquet(path)
+                kind = frame.pop("_kind")
+                value = (frame[kind == "call"].reset_index(drop=True), frame[kind == "put"].reset_index(drop=True))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable option cache file {path}: {e}")
+            return None
+        self._count("disk_hits")
+        self._put((ticker, expiration), value, fetched_at)
+        return value
+
+    def _save_disk(self, ticker, expiration, value):
+        if self.root is None:
+            return
+        path = self.path(ticker, expiration)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        try:
+            if expiration is None:
+                with open(tmp_path, "w") as f:
+                    json.dump(list(value), f)
+            else:
+                calls, puts = value
+                frame = pd.concat([calls.assign(_kind="call"), puts.assign(_kind="put")], ignore_index=True)
+                frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ Could not write option cache file {path}: {e}")
+
+    def expirations(self, ticker):
+        key = (ticker, None)
+        value = self._get(key)
+        if value is None:
+            value = self._load_disk(ticker)
+        if value is None:
+            self._count("misses")
+            # A new expiration list also means a new Ticker, so its internal copy is fresh too
+            value = tuple(self._ticker(ticker, refresh=True).options)
+            self._put(key, value)
+            self._save_disk(ticker, None, value)
+        return value
+
+    def chain(self, ticker, expiration):
+        # Returns (calls, puts); both are None when Yahoo has no chain for that date
+        key = (ticker, expiration)
+        value = self._get(key)
+        if value is None:
+            value = self._load_disk(ticker, expiration)
+        if value is None:
+            self._count("misses")
+            chain = self._ticker(ticker).option_chain(expiration)
+            value = (chain.calls, chain.puts)
+            if chain.calls is not None and chain.puts is not None:
+                self._put(key, value)
+                self._save_disk(ticker, expiration, value)
+        return value
+
+    def nearest_chains(self, ticker, count=1):
+        # [(expiration, calls, puts)] for the `count` nearest expirations
+        return [(expiration, *self.chain(ticker, expiration)) for expiration in self.expirations(ticker)[:count]]
+
+    def prefetch(self, tickers, count=1, workers=8):
+        # Expiration lists for every ticker, then every chain, each stage on a thread pool
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        started = time.perf_counter()
+        errors = {}
+
+        def safe(func, *args):
+            try:
+                return func(*args)
+            except Exception as e:
+                errors[args[0]] = e
+                return ()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            expirations = dict(zip(tickers, pool.map(lambda t: safe(self.expirations, t), tickers)))
+            pairs = [(ticker, expiration) for ticker in tickers for expiration in expirations[ticker][:count]]
+            list(pool.map(lambda pair: safe(self.chain, *pair), pairs))
+
+        for ticker, e in errors.items():
+            print(f"❌ Error fetching option chain for {ticker}: {e}")
+        print(f"⏱ Option chains for {len(tickers)} tickers ready in {time.perf_counter() - started:.2f}s "
+              f"(hits: {self.counters['hits']}, disk: {self.counters['disk_hits']}, fetched: {self.counters['misses']})")
+        return errors
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats["entries"] = len(self._entries)
+        return stats
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+
+# Ranks every contract of a ticker across all loaded expirations in one pass.
+# Chains are concatenated once into a flat table; implied volatility (Newton
+# steps inside a shrinking bisection bracket), Black-Scholes delta / gamma /
+# theta and spread metrics are then computed on whole NumPy columns, so tens of
+# thousands of contracts cost a few milliseconds. Contracts are picked by their
+# distance to a target delta and DTE, penalised by a wide bid/ask spread.
+
+YEAR_DAYS = 365.0
+SQRT_2PI = np.sqrt(2.0 * np.pi)
+
+NUMERIC_COLUMNS = ["strike", "lastPrice", "bid", "ask", "volume", "openInterest", "impliedVolatility"]
+
+
+def norm_pdf(x):
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def norm_cdf(x):
+    # erfc rational approximation (Numerical Recipes erfcc), fractional error < 1.2e-7
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = -z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277))))))))
+    erfc = t * np.exp(poly)
+    return np.where(x >= 0, 1.0 - 0.5 * erfc, 0.5 * erfc)
+
+
+def _d1_d2(spot, strike, years, sigma, rate):
+    vol_time = sigma * np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * sigma * sigma) * years) / vol_time
+    return d1, d1 - vol_time
+
+
+def bs_price(spot, strike, years, sigma, rate, kind):
+    # kind is +1 for calls and -1 for puts
+    d1, d2 = _d1_d2(spot, strike, years, sigma, rate)
+    discount = np.exp(-rate * years)
+    return kind * (spot * norm_cdf(kind * d1) - strike * discount * norm_cdf(kind * d2))
+
+
+def implied_volatility(price, spot, strike, years, rate, kind, low=1e-4, high=5.0, iterations=50, tol=1e-10):
+    # NaN where the price sits outside the no-arbitrage bounds
+    price, strike, years, kind = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (price, strike, years, kind)))
+    discount = np.exp(-rate * years)
+    intrinsic = np.maximum(kind * (spot - strike * discount), 0.0)
+    upper = np.where(kind > 0, spot, strike * discount)
+    valid = (price > intrinsic) & (price < upper) & (years > 0) & (strike > 0)
+
+    result = np.full(price.shape, np.nan)
+    # Only unsolved contracts are carried into the next iteration
+    active = np.flatnonzero(valid)
+    price, strike, years, kind = price[active], strike[active], years[active], kind[active]
+    lo = np.full(len(active), low)
+    hi = np.full(len(active), high)
+    sigma = np.full(len(active), 0.3)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(iterations):
+            d1, _d2 = _d1_d2(spot, strike, years, sigma, rate)
+            diff = bs_price(spot, strike, years, sigma, rate, kind) - price
+            done = (np.abs(diff) < tol * np.maximum(price, 1.0)) | (hi - lo < tol)
+            result[active[done]] = sigma[done]
+            keep = ~done
+            if not keep.any():
+                break
+            active, price, strike, years, kind = active[keep], price[keep], strike[keep], years[keep], kind[keep]
+            sigma, lo, hi, diff, d1 = sigma[keep], lo[keep], hi[keep], diff[keep], d1[keep]
+
+            # Price increases with sigma, so the sign of diff says which side of the root we are on
+            hi = np.where(diff > 0, sigma, hi)
+            lo = np.where(diff <= 0, sigma, lo)
+            vega = spot * norm_pdf(d1) * np.sqrt(years)
+            newton = sigma - diff / vega
+            inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+            sigma = np.where(inside, newton, 0.5 * (lo + hi))
+    result[active] = sigma
+    return result
+
+
+def build_contract_table(chains, now=None):
+    # chains: [(expiration "YYYY-MM-DD", calls, puts)] as returned by OptionChainCache.nearest_chains.
+    # Each chain is read as one float block plus its labels, and everything is concatenated once.
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    if now.tzinfo is None:
+        now = now.tz_localize("UTC")
+    numeric, symbols, traded, expirations, kinds, years = [], [], [], [], [], []
+    for expiration, calls, puts in chains:
+        # Yahoo expirations settle at the US close (~20:00 UTC)
+        expires_at = pd.Timestamp(expiration, tz="UTC") + pd.Timedelta(hours=20)
+        t = max((expires_at - now).total_seconds(), 0.0) / (YEAR_DAYS * 86400)
+        for kind, chain in ((1, calls), (-1, puts)):
+            if chain is None or chain.empty:
+                continue
+            n = len(chain)
+            numeric.append(np.column_stack([
+                chain[name].to_numpy(dtype=float) if name in chain.columns else np.full(n, np.nan)
+                for name in NUMERIC_COLUMNS
+            ]))
+            symbols.append(chain["contractSymbol"].to_numpy(dtype=object))
+            # Naive UTC datetime64; tz-aware columns would otherwise become arrays of Timestamp objects
+            traded.append(chain["lastTradeDate"].to_numpy(dtype="datetime64[ns]"))
+            expirations.append(np.full(n, expiration, dtype=object))
+            kinds.append(np.full(n, kind))
+            years.append(np.full(n, t))
+
+    columns = ["contractSymbol", "lastTradeDate"] + NUMERIC_COLUMNS + ["expiration", "kind", "years"]
+    if not kinds:
+        return pd.DataFrame(columns=columns)
+    block = np.concatenate(numeric)
+    table = {"contractSymbol": np.concatenate(symbols), "lastTradeDate": np.concatenate(traded)}
+    table.update({name: block[:, i] for i, name in enumerate(NUMERIC_COLUMNS)})
+    table.update({"expiration": np.concatenate(expirations), "kind": np.concatenate(kinds), "years": np.concatenate(years)})
+    return pd.DataFrame(table, columns=columns)
+
+
+def add_greeks(table, spot, rate=0.04):
+    # Adds mid, spread_pct, iv, delta, gamma, theta (per calendar day) and dte columns
+    strike = table["strike"].to_numpy(dtype=float)
+    years = table["years"].to_numpy(dtype=float)
+    kind = table["kind"].to_numpy(dtype=float)
+    bid = table["bid"].to_numpy(dtype=float)
+    ask = table["ask"].to_numpy(dtype=float)
+    last = table["lastPrice"].to_numpy(dtype=float)
+
+    quoted = (bid > 0) & (ask >= bid)
+    mid = np.where(quoted, 0.5 * (bid + ask), last)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread_pct = np.where(quoted, (ask - bid) / mid, np.nan)
+
+    iv = implied_volatility(mid, spot, strike, years, rate, kind)
+    # Fall back to Yahoo's own estimate where the quote could not be inverted
+    iv = np.where(np.isnan(iv), table["impliedVolatility"].to_numpy(dtype=float), iv)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1, d2 = _d1_d2(spot, strike, years, iv, rate)
+        pdf = norm_pdf(d1)
+        delta = np.where(kind > 0, norm_cdf(d1), norm_cdf(d1) - 1.0)
+        gamma = pdf / (spot * iv * np.sqrt(years))
+        theta = (-spot * pdf * iv / (2.0 * np.sqrt(years))
+                 - kind * rate * strike * np.exp(-rate * years) * norm_cdf(kind * d2)) / YEAR_DAYS
+
+    table = table.copy()
+    table["mid"] = mid
+    table["spread_pct"] = spread_pct
+    table["iv"] = iv
+    table["delta"] = delta
+    table["gamma"] = gamma
+    table["theta"] = theta
+    table["dte"] = years * YEAR_DAYS
+    return table
+
+
+def rank_contracts(table, signal, target_delta=0.30, target_dte=21, min_dte=2, max_dte=60,
+                   min_volume=1, min_open_interest=0, max_spread_pct=0.25, spread_weight=0.5, dte_weight=0.25):
+    # BUY ranks calls, SHORT ranks puts; lower score is better
+    kind = 1 if signal == "BUY" else -1
+    delta = table["delta"].to_numpy(dtype=float)
+    dte = table["dte"].to_numpy(dtype=float)
+    spread_pct = table["spread_pct"].to_numpy(dtype=float)
+    volume = np.nan_to_num(table["volume"].to_numpy(dtype=float))
+    open_interest = np.nan_to_num(table["openInterest"].to_numpy(dtype=float))
+
+    eligible = (
+        (table["kind"].to_numpy() == kind)
+        & np.isfinite(delta)
+        & (dte >= min_dte) & (dte <= max_dte)
+        & (volume >= min_volume)
+        & (open_interest >= min_open_interest)
+        & ~(spread_pct > max_spread_pct)
+    )
+    score = (
+        np.abs(np.abs(delta) - target_delta)
+        + spread_weight * np.nan_to_num(spread_pct, nan=max_spread_pct)
+        + dte_weight * np.abs(dte - target_dte) / max(target_dte, 1)
+    )
+    rows = np.flatnonzero(eligible)
+    rows = rows[np.argsort(score[rows], kind="stable")]
+    return table.iloc[rows].assign(rank_score=score[rows])
+
+
+def pick_contract(chains, spot, signal, rate=0.04, now=None, **rank_params):
+    ranked = rank_contracts(add_greeks(build_contract_table(chains, now), spot, rate), signal, **rank_params)
+    return ranked.iloc[0] if not ranked.empty else None
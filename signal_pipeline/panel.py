@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+# Signal rules evaluated on whole columns instead of one `df.iloc[-1]` Series.
+# The condition functions take a mapping of column name -> array, so the same
+# code scores the latest bar of every symbol at once (a stacked panel) or every
+# bar of one symbol's history. Thresholds may also be arrays shaped (P, 1) to
+# score P parameter sets in one broadcast pass. Defaults reproduce check_signals /
+# check_futures_signals (crypto) and check_signal (equities/options) exactly.
+
+CRYPTO_COLUMNS = ["close", "RSI", "MACD_Hist", "EMA_50", "StochRSI_K", "StochRSI_D", "BBL", "BBU", "ATR_14"]
+EQUITY_COLUMNS = ["Close", "RSI", "MACD_Hist", "EMA_50", "BB_Lower", "BB_Upper", "Stoch_K"]
+
+CRYPTO_RULES = {"rsi_buy": 40, "rsi_short": 60, "min_score": 3}
+EQUITY_RULES = {"rsi_buy": 40, "rsi_short": 60, "bb_buffer": 0.02, "stoch_buy": 30, "stoch_short": 70, "min_score": 2}
+
+
+def _stack(conditions):
+    return np.stack(np.broadcast_arrays(*conditions), axis=-1)
+
+
+def crypto_conditions(cols, rsi_buy=40, rsi_short=60):
+    close = cols["close"]
+    buy = _stack([
+        cols["RSI"] < rsi_buy,
+        cols["MACD_Hist"] > 0,
+        close > cols["EMA_50"],
+        cols["StochRSI_K"] > cols["StochRSI_D"],
+        close < cols["BBL"],
+        cols["ATR_14"] > 0,
+    ])
+    short = _stack([
+        cols["RSI"] > rsi_short,
+        cols["MACD_Hist"] < 0,
+        close < cols["EMA_50"],
+        cols["StochRSI_K"] < cols["StochRSI_D"],
+        close > cols["BBU"],
+        cols["ATR_14"] > 0,
+    ])
+    return buy, short
+
+
+def equity_conditions(cols, rsi_buy=40, rsi_short=60, bb_buffer=0.02, stoch_buy=30, stoch_short=70):
+    close = cols["Close"]
+    buy = _stack([
+        cols["RSI"] < rsi_buy,
+        cols["MACD_Hist"] >= 0,
+        close >= cols["EMA_50"],
+        close <= cols["BB_Lower"] * (1 + bb_buffer),
+        cols["Stoch_K"] < stoch_buy,
+    ])
+    short = _stack([
+        cols["RSI"] > rsi_short,
+        cols["MACD_Hist"] <= 0,
+        close <= cols["EMA_50"],
+        close >= cols["BB_Upper"] * (1 - bb_buffer),
+        cols["Stoch_K"] > stoch_short,
+    ])
+    return buy, short
+
+
+def score_signals(buy, short, min_score):
+    # side is +1 (buy/long), -1 (short) or 0; buy wins when both reach min_score
+    buy_score = buy.sum(axis=-1)
+    short_score = short.sum(axis=-1)
+    is_buy = buy_score >= min_score
+    is_short = ~is_buy & (short_score >= min_score)
+    side = np.where(is_buy, 1, np.where(is_short, -1, 0))
+    score = np.where(is_buy, buy_score, np.where(is_short, short_score, 0))
+    return side, score
+
+
+def stack_latest(frames, columns):
+    symbols = list(frames)
+    if not symbols:
+        return symbols, np.empty((0, len(columns)))
+    matrix = np.vstack([frames[symbol][columns].iloc[-1:].to_numpy(dtype=float) for symbol in symbols])
+    return symbols, matrix
+
+
+def _evaluate(frames, columns, conditions, labels, min_score, thresholds):
+    symbols, matrix = stack_latest(frames, columns)
+    cols = {name: matrix[:, i] for i, name in enumerate(columns)}
+    buy, short = conditions(cols, **thresholds)
+    side, score = score_signals(buy, short, min_score)
+    signal = np.array([None, labels[0], labels[1]], dtype=object)[np.where(side == -1, 2, side)]
+    index = pd.Index(symbols, name="symbol")
+    return pd.DataFrame({
+        # object dtype keeps None for "no signal" (a string dtype would turn it into NaN)
+        "signal": pd.Series(signal, index=index, dtype=object),
+        "score": score,
+        "buy_score": buy.sum(axis=-1),
+        "short_score": short.sum(axis=-1),
+    }, index=index)
+
+
+def evaluate_crypto_panel(frames, labels=("BUY", "SHORT"), min_score=3, **thresholds):
+    return _evaluate(frames, CRYPTO_COLUMNS, crypto_conditions, labels, min_score, thresholds)
+
+
+def evaluate_equity_panel(frames, labels=("BUY", "SHORT"), min_score=2, **thresholds):
+    return _evaluate(frames, EQUITY_COLUMNS, equity_conditions, labels, min_score, thresholds)
+
+
+def _check_latest(df, columns, conditions, labels, min_score, thresholds):
+    # Single-symbol form used by the per-symbol bot loops: (signal, latest, score)
+    return _check_bar(df.iloc[-1], columns, conditions, labels, min_score, thresholds)
+
+
+def _check_bar(latest, columns, conditions, labels, min_score, thresholds):
+    # latest: a DataFrame row or a bar_store.LatestBar
+    cols = {name: np.asarray(latest[name], dtype=float) for name in columns}
+    buy, short = conditions(cols, **thresholds)
+    side, score = score_signals(buy, short, min_score)
+    if side == 1:
+        return labels[0], latest, int(score)
+    if side == -1:
+        return labels[1], latest, int(score)
+    return None, latest, 0
+
+
+def check_crypto_signal(df, labels=("BUY", "SHORT"), min_score=3, **thresholds):
+    return _check_latest(df, CRYPTO_COLUMNS, crypto_conditions, labels, min_score, thresholds)
+
+
+def check_crypto_bar(latest, labels=("BUY", "SHORT"), min_score=3, **thresholds):
+    return _check_bar(latest, CRYPTO_COLUMNS, crypto_conditions, labels, min_score, thresholds)
+
+
+def check_equity_signal(df, labels=("BUY", "SHORT"), min_score=2, **thresholds):
+    return _check_latest(df, EQUITY_COLUMNS, equity_conditions, labels, min_score, thresholds)
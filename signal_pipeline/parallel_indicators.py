@@ -0,0 +1,139 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from signal_pipeline.indicators import (
+    CRYPTO_INDICATOR_COLUMNS, EQUITY_INDICATOR_COLUMNS, add_crypto_indicators, add_equity_indicators,
+)
+
+# Indicator computation for large watchlists on a process pool.
+# The high/low/close columns of every symbol are packed into one float64 block
+# in shared memory, and workers write their indicator columns into a second
+# shared block, so only offsets and segment names cross the process boundary
+# (no pickled DataFrames). Workers reuse the bots' pandas_ta code, and the main
+# process rebuilds per-symbol frames identical to the serial path.
+
+KINDS = {
+    "crypto": (["high", "low", "close"], CRYPTO_INDICATOR_COLUMNS, add_crypto_indicators),
+    "equity": (["High", "Low", "Close"], EQUITY_INDICATOR_COLUMNS, add_equity_indicators),
+}
+
+
+def _warm_worker():
+    import pandas_ta  # noqa: F401
+
+
+def _compute_chunk(task):
+    # Runs in a worker: fills out[start:stop] for every (start, stop) in bounds
+    kind, in_name, out_name, n_rows, bounds = task
+    price_columns, indicator_columns, add_indicators = KINDS[kind]
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    errors = []
+    try:
+        prices = np.ndarray((n_rows, len(price_columns)), dtype=np.float64, buffer=shm_in.buf)
+        out = np.ndarray((n_rows, len(indicator_columns)), dtype=np.float64, buffer=shm_out.buf)
+        for position, start, stop in bounds:
+            try:
+                df = pd.DataFrame(prices[start:stop], columns=price_columns, copy=True)
+                df = add_indicators(df, dropna=False)
+                out[start:stop] = df[indicator_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+            except Exception as e:
+                out[start:stop] = np.nan
+                errors.append((position, str(e)))
+        del prices, out
+    finally:
+        shm_in.close()
+        shm_out.close()
+    return errors
+
+
+def _chunk_bounds(offsets, n_chunks):
+    # Splits symbols into contiguous runs of roughly equal row counts
+    n_symbols = len(offsets) - 1
+    targets = np.linspace(0, offsets[-1], n_chunks + 1)[1:-1]
+    cuts = np.unique(np.concatenate([[0], np.searchsorted(offsets[1:], targets, side="right"), [n_symbols]]))
+    return [
+        [(i, int(offsets[i]), int(offsets[i + 1])) for i in range(a, b)]
+        for a, b in zip(cuts[:-1], cuts[1:]) if b > a
+    ]
+
+
+class IndicatorPool:
+    def __init__(self, kind="crypto", workers=None, chunks_per_worker=4, min_symbols=32):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown indicator kind: {kind}")
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self.min_symbols = min_symbols
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def compute(self, frames):
+        # frames: {symbol: OHLCV DataFrame}; returns {symbol: frame with indicators, NaN rows dropped}
+        price_columns, indicator_columns, add_indicators = KINDS[self.kind]
+        symbols = [symbol for symbol, df in frames.items() if not df.empty]
+        if self.workers <= 1 or len(symbols) < self.min_symbols:
+            return self._compute_serial(frames, symbols, add_indicators)
+
+        started = time.perf_counter()
+        lengths = np.array([len(frames[symbol]) for symbol in symbols])
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        n_rows = int(offsets[-1])
+        item = np.dtype(np.float64).itemsize
+        shm_in = shared_memory.SharedMemory(create=True, size=max(1, n_rows * len(price_columns) * item))
+        shm_out = shared_memory.SharedMemory(create=True, size=max(1, n_rows * len(indicator_columns) * item))
+        try:
+            prices = np.ndarray((n_rows, len(price_columns)), dtype=np.float64, buffer=shm_in.buf)
+            for symbol, start, stop in zip(symbols, offsets[:-1], offsets[1:]):
+                prices[start:stop] = frames[symbol][price_columns].to_numpy(dtype=np.float64)
+
+            tasks = [
+                (self.kind, shm_in.name, shm_out.name, n_rows, bounds)
+                for bounds in _chunk_bounds(offsets, self.workers * self.chunks_per_worker)
+            ]
+            errors = [error for chunk_errors in self._pool().map(_compute_chunk, tasks) for error in chunk_errors]
+
+            out = np.ndarray((n_rows, len(indicator_columns)), dtype=np.float64, buffer=shm_out.buf)
+            failed = {position for position, _message in errors}
+            results = {}
+            for position, (symbol, start, stop) in enumerate(zip(symbols, offsets[:-1], offsets[1:])):
+                if position in failed:
+                    continue
+                df = frames[symbol].copy()
+                df[indicator_columns] = out[start:stop]
+                results[symbol] = df.dropna()
+            del prices, out
+        finally:
+            shm_in.close()
+            shm_in.unlink()
+            shm_out.close()
+            shm_out.unlink()
+
+        for position, message in errors:
+            print(f"❌ Error calculating indicators for {symbols[position]}: {message}")
+        print(f"🧮 Indicators for {len(symbols)} symbols on {self.workers} processes in {time.perf_counter() - started:.2f}s")
+        return results
+
+    def _compute_serial(self, frames, symbols, add_indicators):
+        results = {}
+        for symbol in symbols:
+            try:
+                results[symbol] = add_indicators(frames[symbol].copy())
+            except Exception as e:
+                print(f"❌ Error calculating indicators for {symbol}: {e}")
+        return results
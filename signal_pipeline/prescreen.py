@@ -0,0 +1,98 @@
+import math
+
+from signal_pipeline.yf_batch import DEFAULT_CHUNK_SIZE, download_bars
+
+# Liquidity pre-screen of a whole watchlist from bulk requests, before any
+# per-symbol history is fetched. Crypto uses ccxt fetch_tickers (24h quote
+# volume, last price, bid/ask spread); equities use one daily-bar yf.download
+# per chunk (average daily volume and last close; Yahoo has no batched bid/ask).
+# A symbol is only dropped on evidence: one without a quote, or a failed bulk
+# request, leaves the symbols in the watchlist for the usual per-symbol checks.
+
+
+def _number(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def ticker_liquidity(ticker):
+    # (price, quote volume, spread as a fraction of the mid) from a ccxt ticker; any of them may be None
+    price = _number(ticker.get("last")) or _number(ticker.get("close"))
+    volume = _number(ticker.get("quoteVolume"))
+    base_volume = _number(ticker.get("baseVolume"))
+    if volume is None and base_volume is not None and price is not None:
+        volume = base_volume * price
+    bid, ask = _number(ticker.get("bid")), _number(ticker.get("ask"))
+    spread = (ask - bid) / ((ask + bid) / 2) if bid and ask and ask >= bid else None
+    return price, volume, spread
+
+
+def screen_reason(price, volume, spread, min_volume=None, min_price=None, max_spread=None):
+    # Why a symbol fails the screen, or None; missing values never fail it
+    if min_volume is not None and volume is not None and volume < min_volume:
+        return f"volume {volume:,.0f} < {min_volume:,.0f}"
+    if min_price is not None and price is not None and price < min_price:
+        return f"price {price:g} < {min_price:g}"
+    if max_spread is not None and spread is not None and spread > max_spread:
+        return f"spread {spread:.2%} > {max_spread:.2%}"
+    return None
+
+
+def _report(rejected, total):
+    if rejected:
+        dropped = list(rejected)
+        print(f"🔎 Pre-screen dropped {len(dropped)}/{total} illiquid symbols "
+              f"({', '.join(dropped[:5])}{', ...' if len(dropped) > 5 else ''})")
+
+
+def prescreen_exchange(exchange, symbols, min_volume=None, min_price=None, max_spread=None, chunk_size=None):
+    # Returns (kept, rejected), rejected mapping symbol -> reason
+    symbols = list(symbols)
+    if not symbols or all(limit is None for limit in (min_volume, min_price, max_spread)):
+        return symbols, {}
+    if not getattr(exchange, "has", {}).get("fetchTickers"):
+        print(f"⚠️ {exchange.id} has no fetchTickers — pre-screen skipped")
+        return symbols, {}
+
+    tickers = {}
+    step = chunk_size or len(symbols)
+    for start in range(0, len(symbols), step):
+        try:
+            tickers.update(exchange.fetch_tickers(symbols[start:start + step]))
+        except Exception as e:
+            print(f"⚠️ Pre-screen ticker fetch failed, keeping those symbols: {e}")
+
+    kept, rejected = [], {}
+    for symbol in symbols:
+        ticker = tickers.get(symbol)
+        reason = screen_reason(*ticker_liquidity(ticker), min_volume, min_price, max_spread) if ticker else None
+        if reason:
+            rejected[symbol] = reason
+        else:
+            kept.append(symbol)
+    _report(rejected, len(symbols))
+    return kept, rejected
+
+
+def prescreen_stocks(tickers, min_volume=None, min_price=None, period="5d", chunk_size=DEFAULT_CHUNK_SIZE):
+    # Returns (kept, rejected); min_volume is the average daily share volume over `period`
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers or (min_volume is None and min_price is None):
+        return tickers, {}
+
+    frames = download_bars(tickers, period=period, interval="1d", chunk_size=chunk_size)
+    kept, rejected = [], {}
+    for ticker in tickers:
+        df = frames.get(ticker)
+        reason = None
+        if df is not None and not df.empty and {"Close", "Volume"} <= set(df.columns):
+            reason = screen_reason(_number(df["Close"].iloc[-1]), _number(df["Volume"].mean()), None, min_volume, min_price)
+        if reason:
+            rejected[ticker] = reason
+        else:
+            kept.append(ticker)
+    _report(rejected, len(tickers))
+    return kept, rejected
@@ -0,0 +1,93 @@
+import argparse
+import importlib
+import os
+import sys
+import time
+
+from signal_pipeline.market_calendar import get_calendar
+from signal_pipeline.scheduler import BarCloseScheduler
+
+# Runs any set of the four bots in one process: python -m signal_pipeline.runner spot equities [--daemon]
+# Each bot script is the adapter for its market (fetch -> indicators -> rules ->
+# levels -> alert, built from the shared signal_pipeline stages). Bot modules are
+# imported only when selected, so an equities-only run never imports ccxt and a
+# crypto-only run never imports yfinance; pandas, pandas_ta, the alert session
+# and the candle cache are loaded once and shared by every bot in the process.
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class BotAdapter:
+    __slots__ = ("label", "module", "run", "watchlist", "timeframe")
+
+    def __init__(self, label, module, run, watchlist, timeframe):
+        self.label = label
+        self.module = module
+        self.run = run
+        self.watchlist = watchlist
+        self.timeframe = timeframe
+
+
+BOTS = {
+    "spot": BotAdapter("Crypto spot", "crypto_spot_market_signal_bot", "run_crypto_bot", "crypto_watchlist", "TIMEFRAME"),
+    "futures": BotAdapter("Crypto futures", "crypto_futures_market_signal_bot", "run_futures_bot", "futures_watchlist", "TIMEFRAME"),
+    "equities": BotAdapter("Equities", "equities_market_signal_bot", "run_equities_bot", "stock_watchlist", "INTERVAL"),
+    "options": BotAdapter("Options", "options_market_signal_bot", "run_options_bot", "stock_watchlist", "INTERVAL"),
+}
+
+
+def load_bots(names):
+    # Returns [(adapter, module)] in the requested order
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    loaded = []
+    for name in names:
+        adapter = BOTS[name]
+        started = time.perf_counter()
+        module = importlib.import_module(adapter.module)
+        print(f"📦 Loaded {adapter.label} bot in {time.perf_counter() - started:.2f}s")
+        loaded.append((adapter, module))
+    return loaded
+
+
+def run_once(names):
+    for adapter, module in load_bots(names):
+        started = time.perf_counter()
+        try:
+            getattr(module, adapter.run)(getattr(module, adapter.watchlist))
+        except Exception as e:
+            print(f"❌ {adapter.label} bot failed: {e}")
+        print(f"✅ {adapter.label}: scan finished in {time.perf_counter() - started:.1f}s")
+
+
+def run_daemon(names, grace_seconds=None):
+    # One scheduler for every bot; the grace period defaults to the largest of the bots' own
+    loaded = load_bots(names)
+    if grace_seconds is None:
+        grace_seconds = max(getattr(module, "DAEMON_GRACE_SECONDS", 5.0) for _adapter, module in loaded)
+    scheduler = BarCloseScheduler(grace_seconds)
+    for adapter, module in loaded:
+        scheduler.add_job(adapter.label, getattr(module, adapter.timeframe), getattr(module, adapter.run),
+                          getattr(module, adapter.watchlist), get_calendar(getattr(module, "MARKET_CALENDAR", None)))
+    scheduler.run_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run several signal bots in one process")
+    parser.add_argument("bots", nargs="*", help=f"any of {', '.join(BOTS)} or all (default: all)")
+    parser.add_argument("--daemon", action="store_true", help="scan after every bar close instead of once")
+    parser.add_argument("--grace", type=float, default=None, help="seconds to wait after a bar close")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.bots) - set(BOTS) - {"all"})
+    if unknown:
+        parser.error(f"unknown bots: {', '.join(unknown)}")
+
+    names = list(BOTS) if not args.bots or "all" in args.bots else list(dict.fromkeys(args.bots))
+    if args.daemon:
+        run_daemon(names, args.grace)
+    else:
+        run_once(names)
+
+
+if __name__ == "__main__":
+    main()
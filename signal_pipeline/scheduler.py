@@ -0,0 +1,99 @@
+import math
+import time
+
+from signal_pipeline.ohlcv_cache import timeframe_to_ms
+
+# Long-running scheduler that wakes right after each candle close.
+# Jobs are grouped by timeframe; at every wake-up only the jobs whose timeframe
+# just closed run, each with its own symbol list. Candles are aligned to the
+# Unix epoch (UTC), which is how exchanges and Yahoo bucket intraday bars.
+# A job with a market calendar only wakes on bar closes inside its sessions
+# (anchored at the open), so it sleeps through nights, weekends and holidays.
+
+
+def next_bar_close(now, timeframe):
+    # First close strictly after `now` (seconds since the epoch)
+    period = timeframe_to_ms(timeframe) / 1000
+    return (math.floor(now / period) + 1) * period
+
+
+class ScheduledJob:
+    __slots__ = ("name", "timeframe", "func", "symbols", "calendar", "last_close")
+
+    def __init__(self, name, timeframe, func, symbols, calendar=None):
+        self.name = name
+        self.timeframe = timeframe
+        self.func = func
+        self.symbols = symbols
+        self.calendar = calendar
+        self.last_close = None
+
+    def next_close(self, now):
+        if self.calendar is not None:
+            return self.calendar.next_bar_close(now, self.timeframe)
+        return next_bar_close(now, self.timeframe)
+
+    def missed_closes(self, bar_close):
+        # Closes between the previous run and this one that got no scan
+        if self.last_close is None:
+            return 0
+        if self.calendar is not None:
+            return sum(1 for _close in self.calendar.bar_closes(self.last_close, bar_close, self.timeframe)) - 1
+        period = timeframe_to_ms(self.timeframe) / 1000
+        return max(0, int(round((bar_close - self.last_close) / period)) - 1)
+
+
+class BarCloseScheduler:
+    def __init__(self, grace_seconds=5.0, clock=time.time, sleep=time.sleep):
+        self.grace_seconds = grace_seconds
+        self.clock = clock
+        self.sleep = sleep
+        self.jobs = []
+
+    def add_job(self, name, timeframe, func, symbols, calendar=None):
+        # func(symbols) is called after every `timeframe` close (with a market calendar, every close in a session)
+        if calendar is None:
+            timeframe_to_ms(timeframe)
+        self.jobs.append(ScheduledJob(name, timeframe, func, symbols, calendar))
+
+    def next_wake(self, now=None):
+        # Returns (wake_time, bar_close, due_jobs) for the earliest upcoming close
+        now = self.clock() if now is None else now
+        closes = [(job.next_close(now - self.grace_seconds), job) for job in self.jobs]
+        bar_close = min(close for close, _job in closes)
+        due = [job for close, job in closes if close == bar_close]
+        return bar_close + self.grace_seconds, bar_close, due
+
+    def run_due(self, bar_close, jobs):
+        for job in jobs:
+            missed = job.missed_closes(bar_close)
+            if missed:
+                print(f"⚠️ {job.name}: skipped {missed} {job.timeframe} close(s) — previous scan overran")
+            job.last_close = bar_close
+
+            started = self.clock()
+            closed_at = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(bar_close))
+            print(f"\n⏰ {job.name}: {job.timeframe} bar closed at {closed_at} UTC — scanning {len(job.symbols)} symbols")
+            try:
+                job.func(job.symbols)
+            except Exception as e:
+                print(f"❌ {job.name} scan failed: {e}")
+            print(f"✅ {job.name}: scan finished in {self.clock() - started:.1f}s")
+
+    def run_forever(self, max_runs=None):
+        if not self.jobs:
+            raise ValueError("No jobs scheduled")
+        runs = 0
+        try:
+            while max_runs is None or runs < max_runs:
+                wake, bar_close, due = self.next_wake()
+                delay = wake - self.clock()
+                if delay > 3600 and any(job.calendar is not None for job in due):
+                    waking = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(wake))
+                    print(f"💤 Market closed — {', '.join(job.name for job in due)} sleeping until {waking} UTC")
+                if delay > 0:
+                    self.sleep(delay)
+                self.run_due(bar_close, due)
+                runs += 1
+        except KeyboardInterrupt:
+            print("👋 Scheduler stopped")
@@ -0,0 +1,229 @@
+import bisect
+import contextlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+
+# Sharded scans across worker processes or hosts, coordinated through one SQLite
+# file (on a shared filesystem for several hosts), with no broker.
+# Symbols map to a fixed number of shards by a stable hash, and shards map to
+# the live workers through a consistent-hash ring, so a worker joining or
+# leaving only moves its neighbours' shards. A worker leases the shards it owns,
+# a heartbeat thread keeps its leases alive while it scans, and every finished
+# shard is marked done for the scan period (the bar being scanned). When a worker
+# dies its leases expire; the survivors recompute the ring without it and pick
+# its unfinished shards up in the same period. A worker whose scan of a batch
+# fails releases the batch's leases for any other worker to take, whichever of
+# them the ring gives the shards to. Workers sharing a host split the
+# exchange's rate limit between them (rate_limit_share). Each bot coordinates in
+# its own scope, so several bots can share one file.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workers (scope TEXT, worker TEXT, host TEXT, seen REAL, PRIMARY KEY (scope, worker));
+CREATE TABLE IF NOT EXISTS leases (scope TEXT, shard INTEGER, owner TEXT, expires REAL, PRIMARY KEY (scope, shard));
+CREATE TABLE IF NOT EXISTS done (scope TEXT, period INTEGER, shard INTEGER, worker TEXT, finished REAL, PRIMARY KEY (scope, period, shard));
+"""
+
+
+def _hash(value):
+    return zlib.crc32(str(value).encode())
+
+
+def shard_of(symbol, shard_count):
+    return _hash(symbol) % shard_count
+
+
+def split_shards(symbols, shard_count):
+    shards = {}
+    for symbol in symbols:
+        shards.setdefault(shard_of(symbol, shard_count), []).append(symbol)
+    return shards
+
+
+class HashRing:
+    def __init__(self, nodes, replicas=64):
+        self._points = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas))
+        self._keys = [point for point, _node in self._points]
+
+    def owner(self, key):
+        if not self._points:
+            return None
+        index = bisect.bisect(self._keys, _hash(f"shard-{key}")) % len(self._points)
+        return self._points[index][1]
+
+
+class ShardCoordinator:
+    def __init__(self, path, scope="scan", shard_count=64, lease_seconds=120.0, worker=None, clock=time.time):
+        self.path = path
+        self.scope = scope
+        self.shard_count = shard_count
+        self.lease_seconds = lease_seconds
+        self.host = socket.gethostname()
+        self.worker = worker or f"{self.host}:{os.getpid()}"
+        self.clock = clock
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with contextlib.closing(self._connect()) as db:
+            db.executescript(SCHEMA)
+        self._heartbeat = None
+        self._stop = threading.Event()
+
+    def _connect(self):
+        # isolation_level=None: transactions are opened explicitly with BEGIN IMMEDIATE
+        db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        db.execute("PRAGMA busy_timeout = 30000")
+        return db
+
+    def _beat(self, db):
+        now = self.clock()
+        db.execute("INSERT OR REPLACE INTO workers (scope, worker, host, seen) VALUES (?, ?, ?, ?)",
+                   (self.scope, self.worker, self.host, now))
+        db.execute("UPDATE leases SET expires = ? WHERE scope = ? AND owner = ?", (now + self.lease_seconds, self.scope, self.worker))
+
+    def live_workers(self, db=None):
+        if db is None:
+            with contextlib.closing(self._connect()) as db:
+                return self.live_workers(db)
+        cutoff = self.clock() - self.lease_seconds
+        rows = db.execute("SELECT worker, host FROM workers WHERE scope = ? AND seen >= ?", (self.scope, cutoff))
+        return {worker: host for worker, host in rows}
+
+    def rate_limit_share(self):
+        # Live workers on this host, i.e. how many ways the exchange's rate limit is split
+        return max(1, sum(1 for host in self.live_workers().values() if host == self.host))
+
+    def claim(self, period, limit=None, exclude=()):
+        # Leases up to `limit` unfinished shards the ring of live workers gives this worker, unless
+        # another worker still holds an unexpired lease on them, plus shards released after a failed
+        # scan, whoever owns them on the ring. Shards in `exclude` are skipped. Returns a list of shard numbers.
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            self._beat(db)
+            now = self.clock()
+            ring = HashRing(sorted(self.live_workers(db)))
+            done = {shard for (shard,) in db.execute("SELECT shard FROM done WHERE scope = ? AND period = ?", (self.scope, period))}
+            rows = db.execute("SELECT shard, owner, expires FROM leases WHERE scope = ?", (self.scope,))
+            leases = {shard: (owner, expires) for shard, owner, expires in rows}
+            claimed = []
+            for shard in range(self.shard_count):
+                if shard in done or shard in exclude:
+                    continue
+                owner, expires = leases.get(shard, (None, 0.0))
+                held_by_other = owner not in (None, self.worker) and expires > now
+                released = owner is None and expires < 0
+                if not held_by_other and (released or ring.owner(shard) == self.worker):
+                    claimed.append(shard)
+                    if limit and len(claimed) >= limit:
+                        break
+            db.executemany(
+                "INSERT OR REPLACE INTO leases (scope, shard, owner, expires) VALUES (?, ?, ?, ?)",
+                [(self.scope, shard, self.worker, now + self.lease_seconds) for shard in claimed],
+            )
+            db.execute("COMMIT")
+            return claimed
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def mark_done(self, period, shards):
+        with contextlib.closing(self._connect()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            now = self.clock()
+            db.executemany("INSERT OR REPLACE INTO done (scope, period, shard, worker, finished) VALUES (?, ?, ?, ?, ?)",
+                           [(self.scope, period, shard, self.worker, now) for shard in shards])
+            db.executemany("UPDATE leases SET owner = NULL WHERE scope = ? AND shard = ? AND owner = ?",
+                           [(self.scope, shard, self.worker) for shard in shards])
+            db.execute("DELETE FROM done WHERE scope = ? AND period < ?", (self.scope, period - 7 * 86_400_000))
+            db.execute("COMMIT")
+
+    def release(self, shards):
+        # Gives leases up unfinished, for any worker to claim (expires = -1 marks them released)
+        with contextlib.closing(self._connect()) as db:
+            db.executemany("UPDATE leases SET owner = NULL, expires = -1 WHERE scope = ? AND shard = ? AND owner = ?",
+                           [(self.scope, shard, self.worker) for shard in shards])
+
+    def remaining(self, period):
+        with contextlib.closing(self._connect()) as db:
+            (count,) = db.execute("SELECT COUNT(*) FROM done WHERE scope = ? AND period = ? AND shard < ?",
+                                  (self.scope, period, self.shard_count)).fetchone()
+        return self.shard_count - count
+
+    def start_heartbeat(self):
+        if self._heartbeat is not None:
+            return
+
+        def beat():
+            while not self._stop.wait(self.lease_seconds / 3):
+                try:
+                    with contextlib.closing(self._connect()) as db:
+                        self._beat(db)
+                except sqlite3.Error as e:
+                    print(f"⚠️ Shard heartbeat failed: {e}")
+
+        with contextlib.closing(self._connect()) as db:
+            self._beat(db)
+        self._heartbeat = threading.Thread(target=beat, name="shard-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def leave(self):
+        # Gives this worker's leases up so the others can take over without waiting for expiry
+        self._stop.set()
+        with contextlib.closing(self._connect()) as db:
+            db.execute("UPDATE leases SET owner = NULL WHERE scope = ? AND owner = ?", (self.scope, self.worker))
+            db.execute("DELETE FROM workers WHERE scope = ? AND worker = ?", (self.scope, self.worker))
+
+    def run(self, symbols, scan, period, batch_shards=4, poll_seconds=5.0, max_wait=None):
+        # Scans this worker's shards of `symbols` for `period`, then keeps picking up shards
+        # left by dead workers until every shard of the period is done (or max_wait passes).
+        # Shards are claimed a few at a time, so workers starting together still split the
+        # ring between them. scan(symbols) is called once per claimed batch; if it raises, the
+        # error is logged and the batch's shards are released unfinished for another worker to
+        # scan, and this worker does not claim them again this run. Returns the symbols scanned here.
+        self.start_heartbeat()
+        shards = split_shards(symbols, self.shard_count)
+        max_wait = self.lease_seconds * 2 if max_wait is None else max_wait
+        deadline = None
+        scanned = []
+        failed = set()
+        while True:
+            claimed = self.claim(period, batch_shards, failed)
+            if claimed:
+                batch = [symbol for shard in claimed for symbol in shards.get(shard, [])]
+                try:
+                    if batch:
+                        scan(batch)
+                except Exception as e:
+                    print(f"❌ Scan of shards {claimed} failed, releasing them to other workers: {e}")
+                    self.release(claimed)
+                    failed.update(claimed)
+                    continue
+                self.mark_done(period, claimed)
+                scanned.extend(batch)
+                deadline = None
+                continue
+            if not self.remaining(period):
+                break
+            deadline = deadline or self.clock() + max_wait
+            if self.clock() >= deadline:
+                print(f"⚠️ {self.remaining(period)} shards still unfinished by other workers")
+                break
+            time.sleep(poll_seconds)
+        return scanned
+
+
+def base_rate_limit(exchange):
+    # The exchange's own rateLimit (ms between requests), before any share_rate_limit
+    return getattr(exchange, "_unshared_rate_limit", None) or getattr(exchange, "rateLimit", None)
+
+
+def share_rate_limit(exchange, share):
+    # Spaces a sync ccxt exchange's requests so `share` workers together stay within its rate limit
+    base = base_rate_limit(exchange)
+    if base:
+        exchange._unshared_rate_limit = base
+        exchange.rateLimit = base * share
@@ -0,0 +1,117 @@
+import contextlib
+import datetime
+import os
+import sqlite3
+import threading
+import time
+
+# Remembers the alerts each bot has sent, so a signal that keeps holding is not
+# re-sent every run. One row per (bot, symbol) holds the last alert (side,
+# score, bar time, when it was sent) and whether the signal is still active;
+# every alert is also appended to an alert log. A bot's rows are loaded into a
+# dict on first use, so checks are dict lookups and only state changes write.
+# An alert is recorded only once it has actually been delivered (see
+# send_alert's on_delivered), so an alert lost to a webhook error is re-sent on
+# the next run instead of being suppressed as a repeat.
+# Rules, checked before any option-chain or support/resistance work:
+#   - the same side on the same bar is never sent twice
+#   - the same side is not sent again within `cooldown` seconds of the last one,
+#     even if the signal went away in between
+#   - with score_change_only, a signal that is still holding is only re-sent
+#     when its score changed
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signal_state (
+    bot TEXT, symbol TEXT, side TEXT, score REAL, bar_time INTEGER, alerted REAL, active INTEGER,
+    PRIMARY KEY (bot, symbol)
+);
+CREATE TABLE IF NOT EXISTS alert_log (bot TEXT, symbol TEXT, side TEXT, score REAL, bar_time INTEGER, alerted REAL);
+"""
+
+
+def bar_time_ms(bar_time):
+    # Epoch milliseconds from a bar label (pandas Timestamp, datetime or ms); naive times are UTC
+    if isinstance(bar_time, (int, float)):
+        return int(bar_time)
+    if bar_time.tzinfo is None:
+        # A naive datetime's timestamp() would use the host's local time
+        bar_time = bar_time.replace(tzinfo=datetime.timezone.utc)
+    return int(bar_time.timestamp() * 1000)
+
+
+class SignalStateStore:
+    def __init__(self, path, cooldown=0.0, score_change_only=False, clock=time.time):
+        self.path = path
+        self.cooldown = cooldown
+        self.score_change_only = score_change_only
+        self.clock = clock
+        self._state = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(SCHEMA)
+
+    def _bot_state(self, bot):
+        state = self._state.get(bot)
+        if state is None:
+            rows = self._db.execute(
+                "SELECT symbol, side, score, bar_time, alerted, active FROM signal_state WHERE bot = ?", (bot,)
+            )
+            state = self._state[bot] = {symbol: list(values) for symbol, *values in rows}
+        return state
+
+    def suppress_reason(self, bot, symbol, side, score, bar_time):
+        # Why this alert should not be sent, or None
+        with self._lock:
+            last = self._bot_state(bot).get(symbol)
+        if last is None:
+            return None
+        last_side, last_score, last_bar, alerted, active = last
+        if side != last_side:
+            return None
+        if bar_time_ms(bar_time) == last_bar:
+            return "already sent for this bar"
+        if self.cooldown and self.clock() - alerted < self.cooldown:
+            return f"cooldown, last sent {(self.clock() - alerted) / 60:.0f} min ago"
+        if self.score_change_only and active and float(score) == last_score:
+            return f"score unchanged at {score}"
+        return None
+
+    def record(self, bot, symbol, side, score, bar_time):
+        row = [side, float(score), bar_time_ms(bar_time), self.clock(), 1]
+        with self._lock:
+            self._bot_state(bot)[symbol] = row
+            with self._db:
+                self._db.execute("BEGIN")
+                self._db.execute("INSERT OR REPLACE INTO signal_state VALUES (?, ?, ?, ?, ?, ?, ?)", (bot, symbol, *row))
+                self._db.execute("INSERT INTO alert_log VALUES (?, ?, ?, ?, ?, ?)", (bot, symbol, *row[:4]))
+
+    def clear(self, bot, symbol):
+        # The symbol has no signal this run; only the transition is written
+        with self._lock:
+            last = self._bot_state(bot).get(symbol)
+            if last is None or not last[4]:
+                return
+            last[4] = 0
+            self._db.execute("UPDATE signal_state SET active = 0 WHERE bot = ? AND symbol = ?", (bot, symbol))
+
+    def check(self, bot, symbol, side, score, bar_time):
+        # The bots' gate: False (and the reason printed) when the alert is a repeat, else True; the
+        # alert is recorded later, by recorder(), once delivered. No side clears the symbol's active signal.
+        if not side:
+            self.clear(bot, symbol)
+            return True
+        reason = self.suppress_reason(bot, symbol, side, score, bar_time)
+        if reason:
+            print(f"🔁 {side} for {symbol} not re-sent: {reason}")
+            return False
+        return True
+
+    def recorder(self, bot, symbol, side, score, bar_time):
+        # Callback recording the alert, for send_alert's on_delivered
+        return lambda: self.record(bot, symbol, side, score, bar_time)
+
+    def close(self):
+        with contextlib.suppress(sqlite3.Error):
+            self._db.close()
@@ -0,0 +1,157 @@
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from signal_pipeline.backtest import (
+    RULE_SETS, TradeSimulator, add_indicators, load_bars, portfolio_returns, summarize_returns,
+)
+from signal_pipeline.panel import score_signals
+
+# Threshold sweep over the signal rules. Each symbol's indicator columns and
+# pivots are computed once; a chunk of parameter sets is then scored in one
+# broadcast pass (thresholds shaped (P, 1) against the (n,) indicator columns),
+# and trade outcomes are shared between parameter sets through TradeSimulator.
+# Symbols are spread over a process pool. Across symbols, each parameter set is
+# scored like backtest's "ALL" row: pooled trade stats, and the total return and
+# drawdown of an equal-weight portfolio of the symbols (backtest.portfolio_returns).
+
+DEFAULT_GRIDS = {
+    "crypto": {
+        "rsi_buy": [30, 35, 40, 45],
+        "rsi_short": [55, 60, 65, 70],
+        "min_score": [2, 3, 4],
+    },
+    "equity": {
+        "rsi_buy": [30, 35, 40, 45],
+        "rsi_short": [55, 60, 65, 70],
+        "bb_buffer": [0.0, 0.01, 0.02, 0.03],
+        "stoch_buy": [20, 30],
+        "stoch_short": [70, 80],
+        "min_score": [2, 3],
+    },
+}
+
+# Upper bound on booleans held per broadcast chunk (P * bars * conditions)
+MAX_CHUNK_CELLS = 50_000_000
+
+
+def expand_grid(grid, rules="crypto"):
+    defaults = RULE_SETS[rules][1]
+    grid = {name: list(grid.get(name, [value])) for name, value in defaults.items()}
+    combos = pd.DataFrame(list(itertools.product(*grid.values())), columns=list(grid))
+    combos.index.name = "combo"
+    return combos
+
+
+def sweep_frame(df, combos, rules="crypto", **trade_params):
+    # df already holds the indicator columns; returns one metrics row per combo and,
+    # per combo, the (exit times, returns) of its trades for the portfolio metrics
+    conditions = RULE_SETS[rules][0]
+    cols = {name: df[name].to_numpy() for name in df.columns}
+    simulator = TradeSimulator(df, **trade_params)
+
+    threshold_names = [name for name in combos.columns if name != "min_score"]
+    n_conditions = 6 if rules == "crypto" else 5
+    chunk = max(1, MAX_CHUNK_CELLS // max(1, len(df) * n_conditions * 2))
+
+    rows, exits = [], []
+    for start in range(0, len(combos), chunk):
+        part = combos.iloc[start:start + chunk]
+        thresholds = {name: part[name].to_numpy()[:, None] for name in threshold_names}
+        buy, short = conditions(cols, **thresholds)
+        sides, _scores = score_signals(buy, short, part["min_score"].to_numpy()[:, None])
+        for side in sides:
+            exit_times, returns = simulator.exits(side)
+            rows.append(summarize_returns(returns))
+            exits.append((exit_times, returns))
+
+    return pd.DataFrame(rows, index=combos.index).astype({"trades": int}), exits
+
+
+def _sweep_file(args):
+    path, combos, rules, trade_params = args
+    started = time.perf_counter()
+    df = add_indicators(load_bars(path))
+    metrics, exits = sweep_frame(df, combos, rules, **trade_params)
+    symbol = os.path.splitext(os.path.basename(path))[0]
+    print(f"✅ {symbol}: {len(combos)} parameter sets on {len(df)} bars in {time.perf_counter() - started:.1f}s")
+    return symbol, (metrics, exits)
+
+
+def combine_metrics(per_symbol):
+    # per_symbol: {symbol: (metrics, exits)} from sweep_frame. Counts and averages are
+    # trade-weighted over every symbol's trades; total_return and max_drawdown are those
+    # of the equal-weight portfolio, as in backtest's "ALL" row
+    frames = [metrics for metrics, _exits in per_symbol.values()]
+    exits = [symbol_exits for _metrics, symbol_exits in per_symbol.values()]
+    trades = sum(frame["trades"] for frame in frames)
+    weights = [frame["trades"] for frame in frames]
+
+    def weighted(column):
+        total = sum(frame[column].fillna(0) * w for frame, w in zip(frames, weights))
+        return total / trades.replace(0, np.nan)
+
+    portfolio = pd.DataFrame([portfolio_returns(sleeves) for sleeves in zip(*exits)], index=frames[0].index)
+    return pd.DataFrame({
+        "trades": trades,
+        "hit_rate": weighted("hit_rate"),
+        "avg_return": weighted("avg_return"),
+        "total_return": portfolio["total_return"],
+        "max_drawdown": portfolio["max_drawdown"],
+    }, index=frames[0].index)
+
+
+def sweep_files(paths, rules="crypto", grid=None, workers=None, rank_by="total_return", min_trades=1, **trade_params):
+    combos = expand_grid(grid or DEFAULT_GRIDS[rules], rules)
+    tasks = [(path, combos, rules, trade_params) for path in paths]
+
+    per_symbol = {}
+    if workers == 1:
+        results = map(_sweep_file, tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_sweep_file, tasks)
+    try:
+        for symbol, metrics in results:
+            per_symbol[symbol] = metrics
+    finally:
+        if workers != 1:
+            executor.shutdown()
+
+    if not per_symbol:
+        return combos.iloc[:0]
+    ranked = combos.join(combine_metrics(per_symbol))
+    ranked = ranked[ranked["trades"] >= min_trades]
+    # Drawdowns are negative, so "higher is better" holds for every metric
+    return ranked.sort_values(rank_by, ascending=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep signal-rule thresholds over local OHLCV files")
+    parser.add_argument("paths", nargs="+", help="CSV / Parquet / Feather bar files, one symbol each")
+    parser.add_argument("--rules", choices=sorted(RULE_SETS), default="crypto")
+    parser.add_argument("--rank-by", default="total_return",
+                        choices=["total_return", "avg_return", "hit_rate", "max_drawdown"])
+    parser.add_argument("--min-trades", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--fee", type=float, default=0.0, help="fee per side, as a fraction")
+    parser.add_argument("--out", help="write the full ranked table to this CSV")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    ranked = sweep_files(args.paths, args.rules, workers=args.workers, rank_by=args.rank_by,
+                         min_trades=args.min_trades, fee=args.fee)
+    print(ranked.head(args.top).to_string(float_format=lambda v: f"{v:.4f}"))
+    print(f"⏱ Swept {len(ranked)} parameter sets over {len(args.paths)} files in {time.perf_counter() - started:.1f}s")
+    if args.out:
+        ranked.to_csv(args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import pandas as pd
+
+from signal_pipeline.ohlcv_cache import timeframe_to_ms
+
+# Higher timeframes resampled locally from one base-resolution fetch.
+# Bins are aligned to the Unix epoch like exchange candles (equities can pass
+# offset="30min" so hourly bars start at the 9:30 open, as Yahoo's do). A bin
+# is only kept when it is complete: the first bin is dropped when the fetch
+# window starts inside it, and the last one while it is still forming.
+# Confluence compares each timeframe's signal with the primary timeframe's.
+
+_AGGREGATIONS = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def _now_like(index, now=None):
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    if index.tz is None:
+        return now.tz_convert("UTC").tz_localize(None) if now.tzinfo is not None else now
+    return now.tz_localize("UTC").tz_convert(index.tz) if now.tzinfo is None else now.tz_convert(index.tz)
+
+
+def resample_ohlcv(df, timeframe, now=None, partial="drop", offset=None):
+    # df: OHLCV bars with a DatetimeIndex; column names may be lower-case (ccxt) or capitalised (yfinance)
+    if partial not in ("drop", "keep"):
+        raise ValueError(f"partial must be 'drop' or 'keep', not {partial!r}")
+    period = pd.Timedelta(milliseconds=timeframe_to_ms(timeframe))
+    aggregations = {column: _AGGREGATIONS.get(column.lower(), "last") for column in df.columns}
+    close = next(column for column in df.columns if column.lower() == "close")
+
+    bars = df.resample(period, origin="epoch", offset=offset, label="left", closed="left").agg(aggregations)
+    # Bins without any base bar (weekends, overnight, gaps) are not bars
+    bars = bars.dropna(subset=[close])
+    if bars.empty or partial == "keep":
+        return bars
+
+    if df.index[0] > bars.index[0]:
+        bars = bars.iloc[1:]
+    return bars[bars.index + period <= _now_like(df.index, now)]
+
+
+def ordered_timeframes(primary, timeframes):
+    # Primary plus confirmation timeframes, finest first; the finest one is what gets fetched
+    return sorted({primary, *timeframes}, key=timeframe_to_ms)
+
+
+def timeframe_frames(df, base_timeframe, timeframes, now=None, partial="drop", offset=None):
+    # {timeframe: bars}; the base timeframe is passed through untouched
+    base_ms = timeframe_to_ms(base_timeframe)
+    frames = {}
+    for timeframe in timeframes:
+        ms = timeframe_to_ms(timeframe)
+        if ms == base_ms:
+            frames[timeframe] = df
+        elif ms < base_ms or ms % base_ms:
+            raise ValueError(f"{timeframe} cannot be built from {base_timeframe} bars")
+        else:
+            frames[timeframe] = resample_ohlcv(df, timeframe, now=now, partial=partial, offset=offset)
+    return frames
+
+
+def evaluate_timeframes(frames, prepare, check):
+    # prepare(df) -> indicator frame, check(df) -> (signal, latest, score), as in the bots
+    results = {}
+    for timeframe, df in frames.items():
+        try:
+            prepared = prepare(df.copy())
+        except Exception as e:
+            print(f"⚠️ Indicators unavailable on {timeframe}: {e}")
+            continue
+        if prepared is None or prepared.empty:
+            print(f"⚠️ Not enough {timeframe} bars for indicators")
+            continue
+        results[timeframe] = (prepared, *check(prepared))
+    return results
+
+
+def confluence(results, primary, timeframes):
+    # Returns (agreeing, available, summary) for the primary timeframe's signal
+    signal = results[primary][1] if primary in results else None
+    parts = []
+    agreeing = available = 0
+    for timeframe in timeframes:
+        if timeframe not in results:
+            parts.append(f"{timeframe} n/a")
+            continue
+        other = results[timeframe][1]
+        available += 1
+        if signal and other == signal:
+            agreeing += 1
+        parts.append(f"{timeframe} {other or '—'}")
+    return agreeing, available, f"{agreeing}/{available} ({', '.join(parts)})"
+
+
+def analyze_timeframes(df, primary, timeframes, prepare, check, min_confluence=1, now=None, offset=None):
+    # df holds bars of the finest of primary/timeframes; returns (df, signal, latest, score, confluence)
+    # for the primary timeframe, or None when its indicators cannot be computed.
+    # The signal is cleared when fewer than min_confluence timeframes (primary included) agree.
+    ordered = ordered_timeframes(primary, timeframes)
+    frames = timeframe_frames(df, ordered[0], ordered, now=now, offset=offset)
+    results = evaluate_timeframes(frames, prepare, check)
+    if primary not in results:
+        return None
+
+    agreeing, _available, summary = confluence(results, primary, ordered)
+    prepared, signal, latest, score = results[primary]
+    if signal and agreeing < min_confluence:
+        print(f"🧭 {signal} on {primary} lacks confluence: {summary}")
+        signal = None
+    return prepared, signal, latest, score, summary
@@ -0,0 +1,124 @@
+import datetime
+import time
+
+import pandas as pd
+
+from signal_pipeline.indicator_engine import EQUITY_COLUMNS
+from signal_pipeline.indicators import add_equity_indicators
+from signal_pipeline.metrics import observe_request
+from signal_pipeline.ohlcv_cache import timeframe_to_ms
+
+# One yf.download call per chunk of tickers instead of one per ticker.
+# yfinance fans the chunk out over its own thread pool and returns a single
+# (ticker, field) MultiIndex frame, which is split back into per-ticker frames.
+# prepare_stock_frame is the equities/options step from raw bars to indicators.
+
+DEFAULT_CHUNK_SIZE = 50
+
+
+def interval_ms(interval):
+    # Yahoo intervals ("5m", "1h", "1d", "1wk", "1mo") in milliseconds
+    return timeframe_to_ms(interval.replace("wk", "w").replace("mo", "M"))
+
+
+def split_ticker_frame(df, tickers):
+    frames = {}
+    if df is None or df.empty:
+        return frames
+
+    if not isinstance(df.columns, pd.MultiIndex):
+        # Only a single ticker can come back flat
+        if len(tickers) == 1:
+            frames[tickers[0]] = df.dropna(how="all")
+        return frames
+
+    available = set(df.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        # Tickers with a shorter history (or a failed download) are NaN-padded
+        # to the shared index, so drop rows that carry no data for this ticker
+        frame = df[ticker].dropna(how="all")
+        if not frame.empty:
+            frames[ticker] = frame.copy()
+    return frames
+
+
+def download_bars(tickers, period="5d", interval="5m", chunk_size=DEFAULT_CHUNK_SIZE):
+    import yfinance as yf
+
+    tickers = list(dict.fromkeys(tickers))
+    frames = {}
+    for start in range(0, len(tickers), chunk_size):
+        chunk = tickers[start:start + chunk_size]
+        print(f"📥 Downloading historical data for {len(chunk)} tickers ({', '.join(chunk[:5])}{', ...' if len(chunk) > 5 else ''})")
+        started = time.perf_counter()
+        df = yf.download(
+            chunk, period=period, interval=interval, auto_adjust=True,
+            group_by="ticker", threads=True, progress=False,
+        )
+        elapsed = time.perf_counter() - started
+        chunk_frames = split_ticker_frame(df, chunk)
+        observe_request("yfinance", elapsed, rows=sum(len(frame) for frame in chunk_frames.values()))
+        frames.update(chunk_frames)
+
+    missing = [ticker for ticker in tickers if ticker not in frames]
+    if missing:
+        print(f"⚠️ No data returned for: {', '.join(missing)}")
+    return frames
+
+
+def download_ticker(ticker, period="5d", interval="5m"):
+    import yfinance as yf
+
+    print(f"📥 Downloading historical data for {ticker}...")
+    df = yf.download(ticker, period=period, interval=interval, auto_adjust=True, group_by="ticker")
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df[ticker]
+    return df
+
+
+def usable_stock_frame(ticker, df, min_volume=500_000):
+    if df.empty or "Close" not in df.columns:
+        print(f"⚠️ No usable 'Close' data for {ticker}")
+        return False
+
+    if "Volume" not in df.columns or df["Volume"].iloc[-1] < min_volume:
+        print(f"⚠️ Low volume for {ticker} ({df['Volume'].iloc[-1] if 'Volume' in df.columns else 'N/A'}), skipping")
+        return False
+    return True
+
+
+def prepare_stock_frame(ticker, df, indicator_store=None, min_volume=500_000):
+    if not usable_stock_frame(ticker, df, min_volume):
+        return pd.DataFrame()
+
+    if indicator_store is not None:
+        # Keeps the full bars for support/resistance; indicator columns land on the latest bar
+        latest = indicator_store.update_from_frame(ticker, df, price_columns=("High", "Low", "Close"), columns=EQUITY_COLUMNS)
+        if latest.empty:
+            print(f"⚠️ Indicators still warming up for {ticker}")
+            return pd.DataFrame()
+        return df.join(latest[list(EQUITY_COLUMNS)])
+
+    try:
+        return add_equity_indicators(df)
+    except Exception as e:
+        print(f"❌ Error calculating indicators for {ticker}: {e}")
+        return pd.DataFrame()
+
+
+def prepare_stock_frames(frames, indicator_store=None, pool=None, min_volume=500_000):
+    # pool: a parallel_indicators.IndicatorPool("equity") to compute the whole batch at once
+    if pool is None or indicator_store is not None:
+        return {ticker: prepare_stock_frame(ticker, df, indicator_store, min_volume) for ticker, df in frames.items()}
+
+    usable = {ticker: df for ticker, df in frames.items() if usable_stock_frame(ticker, df, min_volume)}
+    computed = pool.compute(usable)
+    return {ticker: computed.get(ticker, pd.DataFrame()) for ticker in frames}
+
+
+def is_data_fresh(df, tolerance_days=2):
+    last_date = df.index[-1].date()
+    today = datetime.date.today()
+    return (today - last_date).days <= tolerance_days
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from signal_pipeline.async_ohlcv import fetch_ohlcv_many, scan_ohlcv
+
+
+class FakeAsyncExchange:
+    # fetch_ohlcv sleeps for the symbol's latency; tracks how many requests are in flight
+    def __init__(self, latencies, failures=()):
+        self.latencies = latencies
+        self.failures = set(failures)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+        self.closed = False
+
+    async def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=None):
+        self.calls.append((symbol, timeframe, since, limit))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latencies[symbol])
+            if symbol in self.failures:
+                raise ConnectionError("exchange unavailable")
+            return [[0, 1.0, 2.0, 0.5, 1.5, 10.0]] * (limit or 1)
+        finally:
+            self.in_flight -= 1
+
+    async def close(self):
+        self.closed = True
+
+
+def test_wall_time_tracks_the_slowest_symbol():
+    latencies = {f"S{i}/USDT": 0.05 + 0.01 * i for i in range(10)}
+    exchange = FakeAsyncExchange(latencies)
+    started = time.perf_counter()
+    results, errors, timings = asyncio.run(fetch_ohlcv_many(exchange, list(latencies), limit=5, concurrency=10))
+    elapsed = time.perf_counter() - started
+
+    assert errors == {}
+    assert set(results) == set(latencies) and all(len(rows) == 5 for rows in results.values())
+    assert max(latencies.values()) <= elapsed < sum(latencies.values()) / 2
+    assert all(timings[symbol] >= latency for symbol, latency in latencies.items())
+
+
+def test_timeout_and_errors_keep_the_other_results():
+    latencies = {"FAST/USDT": 0.01, "SLOW/USDT": 1.0, "BAD/USDT": 0.01, "OK/USDT": 0.02}
+    exchange = FakeAsyncExchange(latencies, failures={"BAD/USDT"})
+    started = time.perf_counter()
+    results, errors, _timings = asyncio.run(fetch_ohlcv_many(exchange, list(latencies), timeout=0.1))
+
+    assert time.perf_counter() - started < 0.5
+    assert set(results) == {"FAST/USDT", "OK/USDT"}
+    assert errors["SLOW/USDT"] == "timed out after 0.1s"
+    assert errors["BAD/USDT"] == "ConnectionError: exchange unavailable"
+
+
+def test_semaphore_caps_concurrency():
+    latencies = {f"S{i}/USDT": 0.02 for i in range(20)}
+    exchange = FakeAsyncExchange(latencies)
+    started = time.perf_counter()
+    results, _errors, _timings = asyncio.run(fetch_ohlcv_many(exchange, list(latencies), concurrency=4))
+
+    assert len(results) == 20
+    assert exchange.max_in_flight == 4
+    assert time.perf_counter() - started >= 5 * 0.02
+
+
+def test_since_is_passed_per_symbol():
+    exchange = FakeAsyncExchange({"A/USDT": 0, "B/USDT": 0})
+    asyncio.run(fetch_ohlcv_many(exchange, ["A/USDT", "B/USDT"], "5m", 3, since={"B/USDT": 1234}))
+    assert sorted(exchange.calls) == [("A/USDT", "5m", None, 3), ("B/USDT", "5m", 1234, 3)]
+
+
+def test_scan_ohlcv_closes_the_exchange():
+    exchanges = []
+
+    def factory():
+        exchanges.append(FakeAsyncExchange({"A/USDT": 0.01}))
+        return exchanges[-1]
+
+    results, errors = scan_ohlcv(factory, ["A/USDT"])
+    assert set(results) == {"A/USDT"} and errors == {}
+    assert exchanges[0].closed
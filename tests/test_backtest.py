@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from signal_pipeline.backtest import backtest_files, portfolio_returns, summarize_portfolio
+from signal_pipeline.sweep import sweep_files
+
+T = pd.to_datetime(["2024-01-01 10:00", "2024-01-02 10:00", "2024-01-03 10:00"]).to_numpy()
+
+
+def trades(times, returns):
+    return pd.DataFrame({"exit_time": pd.to_datetime(times), "return": returns})
+
+
+def test_overlapping_trades_on_two_symbols_are_not_compounded():
+    result = portfolio_returns([(T[:1], [0.10]), (T[:1], [0.10])])
+    assert result["total_return"] == pytest.approx(0.10)
+    assert result["max_drawdown"] == 0.0
+
+
+def test_each_symbol_compounds_its_own_share():
+    # Half the capital makes +10% then +10%, the other half loses 20% in between
+    result = portfolio_returns([(T[[0, 2]], [0.10, 0.10]), (T[1:2], [-0.20])])
+    assert result["total_return"] == pytest.approx((1.21 + 0.8) / 2 - 1.0)
+    assert result["max_drawdown"] == pytest.approx((0.55 + 0.4) / (0.55 + 0.5) - 1.0)
+
+
+def test_symbols_without_trades_hold_cash():
+    assert portfolio_returns([(T[:1], [0.10]), ([], [])])["total_return"] == pytest.approx(0.05)
+    assert portfolio_returns([([], []), ([], [])]) == {"total_return": 0.0, "max_drawdown": 0.0}
+
+
+def test_simultaneous_exits_settle_together():
+    result = portfolio_returns([(T[:1], [-0.10]), (T[:1], [0.10])])
+    assert result == {"total_return": pytest.approx(0.0), "max_drawdown": 0.0}
+
+
+def test_all_row_pools_trade_stats():
+    metrics = summarize_portfolio({
+        "A": trades(T[[0, 2]], [0.10, -0.05]),
+        "B": trades(T[1:2], [0.20]),
+        "C": trades([], []),
+    })
+    assert metrics["trades"] == 3
+    assert metrics["hit_rate"] == pytest.approx(2 / 3)
+    assert metrics["avg_return"] == pytest.approx(0.25 / 3)
+    assert metrics["total_return"] == pytest.approx((1.1 * 0.95 + 1.2 + 1.0) / 3 - 1.0)
+
+
+def bars(seed, count=1500):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    spread = np.abs(rng.normal(0, 0.004, count)) * close
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=count, freq="1h"),
+        "open": close, "high": close + spread, "low": close - spread, "close": close, "volume": 1000.0,
+    })
+
+
+def test_sweep_ranks_with_the_backtest_portfolio(tmp_path):
+    pytest.importorskip("pandas_ta")
+    paths = []
+    for seed in range(3):
+        paths.append(str(tmp_path / f"S{seed}.csv"))
+        bars(seed).to_csv(paths[-1], index=False)
+
+    report, _trades = backtest_files(paths)
+    grid = {"rsi_buy": [40], "rsi_short": [60], "min_score": [3]}
+    ranked = sweep_files(paths, grid=grid, workers=1, min_trades=0)
+
+    assert report.loc["ALL", "trades"] > 0
+    for column in ("trades", "hit_rate", "avg_return", "total_return", "max_drawdown"):
+        assert ranked.iloc[0][column] == pytest.approx(report.loc["ALL", column]), column
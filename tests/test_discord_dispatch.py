@@ -0,0 +1,107 @@
+import threading
+
+from signal_pipeline.discord_dispatch import DISCORD_CONTENT_LIMIT, SEPARATOR, DiscordDispatcher, pack_messages
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ""
+
+    def json(self):
+        return {}
+
+
+class FakeWebhookSession:
+    # Stands in for requests.Session: replies with queued (status, headers), then 204s
+    def __init__(self, replies=(), block=None):
+        self.replies = list(replies)
+        self.block = block
+        self.posts = []
+        self.posting = threading.Event()
+
+    def post(self, url, json=None, timeout=None):
+        self.posts.append(json["content"])
+        self.posting.set()
+        if self.block is not None:
+            self.block.wait(5)
+        status, headers = self.replies.pop(0) if self.replies else (204, None)
+        return FakeResponse(status, headers)
+
+    def close(self):
+        pass
+
+
+def make_dispatcher(session, **kwargs):
+    kwargs.setdefault("batch_window", 0.05)
+    return DiscordDispatcher("http://webhook.invalid", session=session, **kwargs)
+
+
+def test_pack_messages_fills_payloads_up_to_the_limit():
+    messages = [f"alert {i} " + "x" * 290 for i in range(20)]
+    payloads = pack_messages(messages)
+    assert all(len(payload) <= DISCORD_CONTENT_LIMIT for payload in payloads)
+    assert SEPARATOR.join(payloads).split(SEPARATOR) == messages
+    assert len(payloads) == 4
+    assert pack_messages(["y" * 2500]) == ["y" * (DISCORD_CONTENT_LIMIT - 1) + "…"]
+
+
+def test_batch_is_posted_as_packed_payloads():
+    session = FakeWebhookSession()
+    dispatcher = make_dispatcher(session)
+    messages = [f"alert {i} " + "x" * 490 for i in range(9)]
+    for message in messages:
+        assert dispatcher.send(message)
+    assert dispatcher.flush(5)
+    dispatcher.close()
+    assert all(len(payload) <= DISCORD_CONTENT_LIMIT for payload in session.posts)
+    assert SEPARATOR.join(session.posts).split(SEPARATOR) == messages
+    assert len(session.posts) == 3
+    assert dispatcher.stats()["delivered"] == 9
+
+
+def test_rejected_payload_does_not_stop_the_rest_of_the_batch():
+    session = FakeWebhookSession(replies=[(400, None)])
+    dispatcher = make_dispatcher(session)
+    for i in range(6):
+        dispatcher.send(f"alert {i} " + "x" * 990)
+    assert dispatcher.flush(5)
+    dispatcher.close()
+    assert len(session.posts) == 3
+    stats = dispatcher.stats()
+    assert stats["failed"] == 2
+    assert stats["delivered"] == 4
+    assert stats["posts"] == 2
+
+
+def test_rate_limited_post_is_retried_after_retry_after():
+    session = FakeWebhookSession(replies=[(429, {"Retry-After": "0.2"})])
+    dispatcher = make_dispatcher(session)
+    dispatcher.send("breakout")
+    assert dispatcher.flush(5)
+    dispatcher.close()
+    assert session.posts == ["breakout", "breakout"]
+    stats = dispatcher.stats()
+    assert stats["rate_limited"] == 1
+    assert stats["retries"] == 1
+    assert stats["delivered"] == 1
+    assert stats["latency_max"] >= 0.2
+
+
+def test_full_queue_drops_new_alerts():
+    release = threading.Event()
+    session = FakeWebhookSession(block=release)
+    dispatcher = make_dispatcher(session, max_queue=2, batch_window=0)
+    assert dispatcher.send("first")
+    assert session.posting.wait(5)
+    assert dispatcher.send("second")
+    assert dispatcher.send("third")
+    assert not dispatcher.send("fourth")
+    release.set()
+    assert dispatcher.flush(5)
+    dispatcher.close()
+    stats = dispatcher.stats()
+    assert stats["dropped"] == 1
+    assert stats["delivered"] == 3
+    assert "fourth" not in SEPARATOR.join(session.posts)
@@ -0,0 +1,38 @@
+from signal_pipeline.funding import RETRY_AFTER_MS, FundingRateProvider
+
+NOW_MS = 1_700_000_000_000
+
+
+class SingleRateExchange:
+    # Only fetchFundingRate; DEAD/USDT:USDT is listed but its rate request fails
+    id = "single"
+    has = {"fetchFundingRate": True, "fetchFundingRates": False}
+
+    def __init__(self):
+        self.calls = []
+
+    def load_markets(self):
+        return {f"{base}/USDT:USDT": {"swap": True} for base in ("BTC", "ETH", "DEAD")}
+
+    def fetch_funding_rate(self, symbol):
+        self.calls.append(symbol)
+        if symbol.startswith("DEAD"):
+            raise RuntimeError("market delisted")
+        return {"fundingRate": 0.0001 if symbol.startswith("BTC") else -0.0002,
+                "fundingTimestamp": NOW_MS + 3_600_000}
+
+
+def test_failing_symbol_keeps_the_other_rates():
+    exchange = SingleRateExchange()
+    funding = FundingRateProvider(exchange, clock=lambda: NOW_MS / 1000)
+    funding.refresh(["BTC/USDT", "DEAD/USDT", "ETH/USDT"])
+
+    assert funding.requests == 3
+    assert funding._rates["BTC/USDT"] == (0.0001, NOW_MS + 3_600_000)
+    assert funding._rates["ETH/USDT"] == (-0.0002, NOW_MS + 3_600_000)
+    assert funding._rates["DEAD/USDT"] == (None, NOW_MS + RETRY_AFTER_MS)
+
+    # Cached rates are served without new requests; only the failed one is retried later
+    assert funding.get("ETH/USDT") == -0.0002
+    assert funding.get("DEAD/USDT") is None
+    assert exchange.calls == ["BTC/USDT:USDT", "DEAD/USDT:USDT", "ETH/USDT:USDT"]
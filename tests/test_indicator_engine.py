@@ -0,0 +1,113 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signal_pipeline.indicator_engine import EQUITY_COLUMNS, IndicatorEngine, IndicatorEngineStore
+
+COLUMNS = ["RSI", "MACD_Hist", "EMA_50", "ATR_14", "BBL", "BBM", "BBU", "StochRSI_K", "StochRSI_D", "Stoch_K", "Stoch_D"]
+
+
+def price_frame(bars, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    spread = np.abs(rng.normal(0, 0.005, bars)) * close
+    index = pd.date_range("2024-01-01", periods=bars, freq="5min", tz="UTC")
+    return pd.DataFrame({"high": close + spread, "low": close - spread, "close": close}, index=index)
+
+
+def stream(engine, df, start=0):
+    rows = []
+    for ts, high, low, close in zip(df.index.asi8[start:], df["high"][start:], df["low"][start:], df["close"][start:]):
+        rows.append(dict(engine.update(int(ts), high, low, close)))
+    return pd.DataFrame(rows, index=df.index[start:])[COLUMNS]
+
+
+def assert_same(left, right):
+    assert left.keys() == right.keys()
+    for key in left:
+        assert (math.isnan(left[key]) and math.isnan(right[key])) or left[key] == right[key], key
+
+
+@pytest.mark.parametrize("seed, bars", [(0, 60), (1, 120), (2, 250), (3, 500), (4, 1000)])
+def test_matches_pandas_ta(seed, bars):
+    ta = pytest.importorskip("pandas_ta")
+    df = price_frame(bars, seed)
+    high, low, close = df["high"], df["low"], df["close"]
+    reference = pd.DataFrame(index=df.index)
+    reference["RSI"] = ta.rsi(close, length=14)
+    reference["MACD_Hist"] = ta.macd(close)["MACDh_12_26_9"]
+    reference["EMA_50"] = ta.ema(close, length=50)
+    reference["ATR_14"] = ta.atr(high, low, close, length=14)
+    bbands = ta.bbands(close, length=20, std=2)
+    reference["BBL"] = bbands["BBL_20_2.0"]
+    reference["BBM"] = bbands["BBM_20_2.0"]
+    reference["BBU"] = bbands["BBU_20_2.0"]
+    stochrsi = ta.stochrsi(close, length=14)
+    reference["StochRSI_K"] = stochrsi.iloc[:, 0]
+    reference["StochRSI_D"] = stochrsi.iloc[:, 1]
+    stoch = ta.stoch(high, low, close)
+    reference["Stoch_K"] = stoch["STOCHk_14_3_3"]
+    reference["Stoch_D"] = stoch["STOCHd_14_3_3"]
+
+    streamed = stream(IndicatorEngine(), df)
+    for column in COLUMNS:
+        # Same warm-up, then the same values within 1e-6
+        pd.testing.assert_series_equal(streamed[column].notna(), reference[column].notna(), check_names=False)
+        both = reference[column].notna()
+        assert (streamed[column][both] - reference[column][both]).abs().max() <= 1e-6, column
+
+
+def test_forming_bar_revisions_match_the_closed_bar():
+    df = price_frame(120, 5)
+    revised, closed = IndicatorEngine(), IndicatorEngine()
+    stream(revised, df.iloc[:-1])
+    stream(closed, df.iloc[:-1])
+
+    ts, (high, low, close) = int(df.index.asi8[-1]), df.iloc[-1]
+    revised.update(ts, high - 0.3, low + 0.2, close - 0.1)
+    revised.update(ts, high - 0.1, low + 0.1, close + 0.2)
+    assert_same(revised.update(ts, high, low, close), closed.update(ts, high, low, close))
+
+    # The next bar builds on the final values of the revised one
+    later = price_frame(121, 5).iloc[[-1]].set_axis([df.index[-1] + pd.Timedelta("5min")])
+    assert_same(stream(revised, later).iloc[0].to_dict(), stream(closed, later).iloc[0].to_dict())
+
+
+def test_state_round_trips_through_save_and_load(tmp_path):
+    df = price_frame(150, 6)
+    original = IndicatorEngine()
+    stream(original, df.iloc[:100])
+    ts, (high, low, close) = int(df.index.asi8[100]), df.iloc[100]
+    original.update(ts, high + 0.5, low, close + 0.5)  # a forming bar, revised after the restart
+
+    path = str(tmp_path / "state" / "BTC-USDT.json")
+    original.save(path)
+    restored = IndicatorEngine.load(path)
+    assert_same(restored.values, original.values)
+    pd.testing.assert_frame_equal(stream(restored, df, 100), stream(original, df, 100))
+
+
+def test_update_from_frame_matches_sequential_updates(tmp_path):
+    df = price_frame(300, 7)
+    sequential = stream(IndicatorEngine(), df)
+    store = IndicatorEngineStore(str(tmp_path))
+
+    for end in (30, 200, 200, 260, 300):
+        latest = store.update_from_frame("BTC/USDT", df.iloc[:end])
+        expected = sequential.iloc[end - 1]
+        if expected[COLUMNS[:9]].isna().any():
+            assert latest.empty
+            continue
+        assert list(latest.index) == [df.index[end - 1]]
+        for column in COLUMNS[:9]:
+            assert latest[column].iloc[0] == expected[column]
+
+    # A fresh store resumes from the saved state; a revised last bar replaces the old one
+    revised = df.iloc[:300].copy()
+    revised.iloc[-1, revised.columns.get_loc("close")] += 1.0
+    latest = IndicatorEngineStore(str(tmp_path)).update_from_frame("BTC/USDT", revised, columns=EQUITY_COLUMNS)
+    expected = stream(IndicatorEngine(), revised).iloc[-1]
+    for name, key in EQUITY_COLUMNS.items():
+        assert latest[name].iloc[0] == expected[key]
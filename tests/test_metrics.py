@@ -0,0 +1,44 @@
+import pytest
+
+from signal_pipeline import metrics
+
+
+class FakeCcxtExchange:
+    # Like a sync ccxt exchange: fetch keeps the decoded response text in last_http_response
+    id = "fake-utf8"
+
+    def __init__(self, body):
+        self.body = body
+        self.last_http_response = None
+
+    def throttle(self, cost=None):
+        pass
+
+    def fetch(self, url, method="GET", headers=None, body=None):
+        self.last_http_response = self.body
+        return {}
+
+
+@pytest.fixture
+def enabled_metrics(monkeypatch):
+    # Metrics are process-wide: start from empty values and put the old ones back afterwards
+    monkeypatch.setattr(metrics.registry, "enabled", True)
+    for metric in metrics.registry._metrics:
+        monkeypatch.setattr(metric, "_values", {})
+    return metrics.registry
+
+
+def test_fetch_body_bytes_counts_utf8_bytes_not_characters(enabled_metrics):
+    body = '{"symbol": "€URO/₿TC"}'
+    exchange = metrics.instrument_exchange(FakeCcxtExchange(body))
+    exchange.fetch("https://api.invalid/ticker")
+    exchange.fetch("https://api.invalid/ticker")
+
+    assert len(body) == 22 and len(body.encode("utf-8")) == 26
+    assert metrics.FETCH_BODY_BYTES._values[("fake-utf8",)] == 52
+    assert 'signal_fetch_body_bytes_total{source="fake-utf8"} 52' in enabled_metrics.render()
+
+
+def test_metric_values_do_not_leak_between_tests():
+    assert metrics.FETCH_BODY_BYTES._values == {}
+    assert metrics.REQUEST_SECONDS._values == {}
@@ -0,0 +1,54 @@
+import time
+
+from signal_pipeline.ohlcv_cache import OHLCVCache, fetch_ohlcv_cached
+
+HOUR = 3_600_000
+
+
+def bar(ts, close, volume=10.0):
+    return [ts, close - 1.0, close + 1.0, close - 2.0, close, volume]
+
+
+class ScriptedExchange:
+    # Returns the queued replies in order and records the `since` of every request
+    id = "scripted"
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=None):
+        self.calls.append(since)
+        return self.replies.pop(0)
+
+
+def test_delta_fetch_merges_and_revises_the_forming_candle(tmp_path):
+    now = int(time.time() * 1000) // HOUR * HOUR
+    history = [bar(now - i * HOUR, 100.0 + i) for i in range(5, 0, -1)]
+    forming = bar(now, 105.0, volume=1.0)
+    final, next_forming = bar(now, 107.0, volume=12.0), bar(now + HOUR, 108.0, volume=2.0)
+    exchange = ScriptedExchange(history + [forming], [final, next_forming])
+
+    cache = OHLCVCache(str(tmp_path), "parquet")
+    first = fetch_ohlcv_cached(exchange, cache, "BTC/USDT", "1h", limit=4)
+    assert first == (history + [forming])[-4:]
+
+    # A fresh cache object reads the file back and only asks from the last (forming) bar on
+    second = fetch_ohlcv_cached(exchange, OHLCVCache(str(tmp_path), "parquet"), "BTC/USDT", "1h", limit=4)
+    assert exchange.calls == [None, now]
+    assert second == history[-2:] + [final, next_forming]
+    assert all(type(row[0]) is int and all(type(v) is float for v in row[1:]) for row in first + second)
+
+
+def test_stale_cache_is_replaced_by_a_full_fetch(tmp_path):
+    now = int(time.time() * 1000) // HOUR * HOUR
+    old = [bar(now - (100 - i) * HOUR, 50.0 + i) for i in range(3)]
+    fresh = [bar(now - i * HOUR, 90.0 + i) for i in range(2, -1, -1)]
+    cache = OHLCVCache(str(tmp_path), "feather")
+    cache.update("scripted", "ETH/USDT", "1h", old, limit=3)
+
+    exchange = ScriptedExchange(fresh)
+    rows = fetch_ohlcv_cached(exchange, cache, "ETH/USDT", "1h", limit=3)
+    assert exchange.calls == [None]
+    assert rows == fresh
+    assert cache.load("scripted", "ETH/USDT", "1h")["timestamp"].tolist() == [row[0] for row in fresh]
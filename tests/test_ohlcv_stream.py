@@ -0,0 +1,139 @@
+import asyncio
+import concurrent.futures
+
+from signal_pipeline.ohlcv_stream import OHLCVStream
+
+MINUTE = 60_000
+T0 = 1_700_000_040_000  # a 1m boundary
+
+
+def candle(ts, close):
+    return [ts, close, close + 1, close - 1, close, 10.0]
+
+
+class FakeProExchange:
+    # The ccxt.pro surface OHLCVStream uses; the test sets `now` and pushes updates
+    def __init__(self, history, now, multiplexed=True):
+        self.history = history
+        self.now = now
+        self.has = {"watchOHLCVForSymbols": multiplexed}
+        self.updates = asyncio.Queue()
+        self.closed = False
+
+    def milliseconds(self):
+        return self.now
+
+    async def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None):
+        return [list(row) for row in self.history.get(symbol, [])][-limit:]
+
+    async def watch_ohlcv_for_symbols(self, pairs, since=None, limit=None, params=None):
+        now, symbol, rows = await self.updates.get()
+        self.now = now
+        return {symbol: {"1m": rows}}
+
+    async def close(self):
+        self.closed = True
+
+
+def make_stream(exchange, symbols=("BTC/USDT",), grace_seconds=2.0, on_seed=None):
+    closed = []
+    stream = OHLCVStream(lambda: exchange, list(symbols), "1m", lambda symbol, ohlcv: closed.append((symbol, ohlcv)),
+                         limit=5, grace_seconds=grace_seconds, on_seed=on_seed)
+    stream.exchange = exchange
+    return stream, closed
+
+
+def drive(stream, steps):
+    # Runs the update/close_due steps inside an event loop and waits for the evaluations
+    async def run():
+        stream._executor = concurrent.futures.ThreadPoolExecutor(1)
+        try:
+            steps()
+        finally:
+            stream._executor.shutdown(wait=True)
+
+    asyncio.run(run())
+
+
+def test_candle_closes_when_a_newer_one_starts():
+    stream, closed = make_stream(FakeProExchange({}, T0))
+
+    def steps():
+        stream.update("BTC/USDT", candle(T0, 100))
+        stream.update("BTC/USDT", candle(T0, 101))  # the forming candle revised
+        assert closed == [] and stream.closed == 0
+        stream.update("BTC/USDT", candle(T0 + MINUTE, 102))
+
+    drive(stream, steps)
+    assert closed == [("BTC/USDT", [candle(T0, 101)])]
+    assert stream.forming["BTC/USDT"] == candle(T0 + MINUTE, 102)
+
+
+def test_quiet_symbol_closes_after_the_grace_period():
+    exchange = FakeProExchange({}, T0)
+    stream, closed = make_stream(exchange, grace_seconds=2.0)
+
+    def steps():
+        stream.update("BTC/USDT", candle(T0, 100))
+        exchange.now = T0 + MINUTE + 1_999
+        stream.close_due()
+        assert stream.closed == 0
+        exchange.now = T0 + MINUTE + 2_000
+        stream.close_due()
+        stream.close_due()
+
+    drive(stream, steps)
+    assert closed == [("BTC/USDT", [candle(T0, 100)])]
+    assert "BTC/USDT" not in stream.forming
+
+
+def test_late_update_of_a_closed_candle_is_ignored():
+    exchange = FakeProExchange({}, T0)
+    stream, closed = make_stream(exchange)
+
+    def steps():
+        stream.update("BTC/USDT", candle(T0, 100))
+        exchange.now = T0 + MINUTE + 5_000
+        stream.close_due()
+        stream.update("BTC/USDT", candle(T0, 99))  # arrives after the grace period closed it
+        stream.update("BTC/USDT", candle(T0 + MINUTE, 103))
+        stream.update("BTC/USDT", candle(T0 + 2 * MINUTE, 104))
+
+    drive(stream, steps)
+    assert closed == [
+        ("BTC/USDT", [candle(T0, 100)]),
+        ("BTC/USDT", [candle(T0, 100), candle(T0 + MINUTE, 103)]),
+    ]
+
+
+def test_seed_hands_on_seed_only_closed_history():
+    rows = [candle(T0 + i * MINUTE, 100 + i) for i in range(8)]  # the last one is still forming
+    exchange = FakeProExchange({"BTC/USDT": rows, "ETH/USDT": rows[:3]}, T0 + 7 * MINUTE + 30_000)
+    seeded = {}
+    stream, _closed = make_stream(exchange, ("BTC/USDT", "ETH/USDT"), on_seed=seeded.__setitem__)
+
+    async def run():
+        stream._executor = concurrent.futures.ThreadPoolExecutor(1)
+        await stream._seed()
+        stream._executor.shutdown(wait=True)
+
+    asyncio.run(run())
+    assert seeded == {"BTC/USDT": rows[2:7], "ETH/USDT": rows[:3]}
+    assert stream.forming == {"BTC/USDT": rows[7]}
+    assert stream.history["BTC/USDT"] == rows[2:7]
+
+
+def test_run_streams_pushed_candles_to_on_close():
+    rows = [candle(T0 + i * MINUTE, 100 + i) for i in range(4)]
+    exchange = FakeProExchange({"BTC/USDT": rows}, T0 + 3 * MINUTE + 10_000)
+    stream, closed = make_stream(exchange)
+
+    async def run():
+        exchange.updates.put_nowait((T0 + 3 * MINUTE + 50_000, "BTC/USDT", [candle(T0 + 3 * MINUTE, 110)]))
+        exchange.updates.put_nowait((T0 + 4 * MINUTE + 100, "BTC/USDT", [candle(T0 + 3 * MINUTE, 111),
+                                                                        candle(T0 + 4 * MINUTE, 112)]))
+        await stream.run_async(duration=0.3)
+
+    asyncio.run(run())
+    assert closed == [("BTC/USDT", rows[:3] + [candle(T0 + 3 * MINUTE, 111)])]
+    assert exchange.closed
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import crypto_futures_market_signal_bot as futures
+import crypto_spot_market_signal_bot as spot
+import equities_market_signal_bot as equities
+import options_market_signal_bot as options
+from signal_pipeline.panel import evaluate_crypto_panel, evaluate_equity_panel
+
+
+# The per-symbol rules as the bots first shipped them, the baseline the panel must reproduce
+def baseline_crypto_signal(df, labels=("BUY", "SHORT")):
+    latest = df.iloc[-1]
+    buy_conditions = [
+        latest["RSI"] < 40,
+        latest["MACD_Hist"] > 0,
+        latest["close"] > latest["EMA_50"],
+        latest["StochRSI_K"] > latest["StochRSI_D"],
+        latest["close"] < latest["BBL"],
+        latest["ATR_14"] > 0
+    ]
+    short_conditions = [
+        latest["RSI"] > 60,
+        latest["MACD_Hist"] < 0,
+        latest["close"] < latest["EMA_50"],
+        latest["StochRSI_K"] < latest["StochRSI_D"],
+        latest["close"] > latest["BBU"],
+        latest["ATR_14"] > 0
+    ]
+    buy_score = sum(buy_conditions)
+    short_score = sum(short_conditions)
+    if buy_score >= 3:
+        return labels[0], latest, buy_score
+    elif short_score >= 3:
+        return labels[1], latest, short_score
+    else:
+        return None, latest, 0
+
+
+def baseline_equity_signal(df):
+    latest = df.iloc[-1]
+    close = latest["Close"]
+    conditions_buy = [
+        latest["RSI"] < 40,
+        latest["MACD_Hist"] >= 0,
+        close >= latest["EMA_50"],
+        close <= latest["BB_Lower"] * 1.02,
+        latest["Stoch_K"] < 30
+    ]
+    conditions_short = [
+        latest["RSI"] > 60,
+        latest["MACD_Hist"] <= 0,
+        close <= latest["EMA_50"],
+        close >= latest["BB_Upper"] * 0.98,
+        latest["Stoch_K"] > 70
+    ]
+    buy_count = sum(conditions_buy)
+    short_count = sum(conditions_short)
+    if buy_count >= 2:
+        return "BUY", latest, buy_count
+    elif short_count >= 2:
+        return "SHORT", latest, short_count
+    else:
+        return None, latest, 0
+
+
+NAN = float("nan")
+RSI = [40.0, 60.0, 39.999, 60.001, 50.0, NAN]
+MACD_HIST = [0.0, -0.0, 0.25, -0.25, NAN]
+STOCH = [30.0, 70.0, 29.9, 70.1, 50.0, NAN]
+
+
+def pick(rng, values):
+    return values[rng.integers(len(values))]
+
+
+def relative(rng, close, factor):
+    # Exactly close / factor (so close == level * factor), or a little above/below, or NaN
+    return pick(rng, [close / factor, close / factor * 1.001, close / factor * 0.999, close, NAN])
+
+
+def frames_for(latest_rows, columns, seed):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i, latest in enumerate(latest_rows):
+        history = pd.DataFrame(rng.uniform(1, 100, (3, len(columns))), columns=columns)
+        frames[f"S{i:03d}"] = pd.concat([history, pd.DataFrame([latest], columns=columns)], ignore_index=True)
+    frames["NAN"] = pd.concat([history, pd.DataFrame([[NAN] * len(columns)], columns=columns)], ignore_index=True)
+    return frames
+
+
+def crypto_frames(count=600, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(count):
+        close = pick(rng, [100.0, 0.1, 3.3])
+        stoch_d = pick(rng, [20.0, 80.0, NAN])
+        rows.append({
+            "close": close, "RSI": pick(rng, RSI), "MACD_Hist": pick(rng, MACD_HIST),
+            "EMA_50": relative(rng, close, 1.0), "StochRSI_K": pick(rng, [stoch_d, 10.0, 90.0, NAN]),
+            "StochRSI_D": stoch_d, "BBL": relative(rng, close, 1.0), "BBU": relative(rng, close, 1.0),
+            "ATR_14": pick(rng, [0.0, 1.5, NAN]),
+        })
+    return frames_for([list(row.values()) for row in rows], list(rows[0]), seed)
+
+
+def equity_frames(count=600, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(count):
+        close = pick(rng, [100.0, 7.1, 0.3])
+        rows.append({
+            "Close": close, "RSI": pick(rng, RSI), "MACD_Hist": pick(rng, MACD_HIST),
+            "EMA_50": relative(rng, close, 1.0), "BB_Lower": relative(rng, close, 1.02),
+            "BB_Upper": relative(rng, close, 0.98), "Stoch_K": pick(rng, STOCH),
+        })
+    return frames_for([list(row.values()) for row in rows], list(rows[0]), seed)
+
+
+def test_boundary_frames_hit_the_boundaries():
+    latest = pd.DataFrame([df.iloc[-1] for df in equity_frames().values()])
+    assert (latest["RSI"] == 40).any() and (latest["RSI"] == 60).any()
+    assert (latest["MACD_Hist"] == 0).any()
+    assert (latest["Close"] == latest["BB_Lower"] * 1.02).any()
+    assert (latest["Close"] == latest["BB_Upper"] * 0.98).any()
+    assert latest.isna().any(axis=1).any()
+
+
+def assert_panel_matches(panel, frames, baseline):
+    assert list(panel.index) == list(frames)
+    for symbol, df in frames.items():
+        signal, _latest, score = baseline(df)
+        assert panel.loc[symbol, "signal"] == signal, symbol
+        assert panel.loc[symbol, "score"] == score, symbol
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_crypto_panel_matches_baseline(seed):
+    frames = crypto_frames(seed=seed)
+    assert_panel_matches(evaluate_crypto_panel(frames), frames, baseline_crypto_signal)
+    assert_panel_matches(
+        evaluate_crypto_panel(frames, labels=("LONG", "SHORT")), frames,
+        lambda df: baseline_crypto_signal(df, labels=("LONG", "SHORT")),
+    )
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_equity_panel_matches_baseline(seed):
+    frames = equity_frames(seed=seed)
+    assert_panel_matches(evaluate_equity_panel(frames), frames, baseline_equity_signal)
+
+
+def test_bot_checks_match_baseline():
+    for df in crypto_frames(200).values():
+        assert spot.check_signals(df)[::2] == baseline_crypto_signal(df)[::2]
+        assert futures.check_futures_signals(df)[::2] == baseline_crypto_signal(df, ("LONG", "SHORT"))[::2]
+    for df in equity_frames(200).values():
+        assert equities.check_signal(df)[::2] == baseline_equity_signal(df)[::2]
+        assert options.check_signal(df)[::2] == baseline_equity_signal(df)[::2]
@@ -0,0 +1,55 @@
+from signal_pipeline.sharding import ShardCoordinator, split_shards
+
+SYMBOLS = [f"S{i:03d}/USDT" for i in range(200)]
+PERIOD = 1_700_000_000_000
+
+
+def coordinator(tmp_path, worker):
+    return ShardCoordinator(str(tmp_path / "shards.sqlite"), "spot", shard_count=16, lease_seconds=60.0, worker=worker)
+
+
+def test_split_shards_covers_every_symbol_once():
+    shards = split_shards(SYMBOLS, 16)
+    assert sorted(symbol for batch in shards.values() for symbol in batch) == sorted(SYMBOLS)
+
+
+def test_failed_batch_is_released_and_finished_by_another_worker(tmp_path, capsys):
+    a, b = coordinator(tmp_path, "a"), coordinator(tmp_path, "b")
+    b.start_heartbeat()  # both workers are live, so the ring splits the shards between them
+    seen = {"a": [], "b": []}
+
+    def scan_a(batch):
+        if not seen["a"]:
+            seen["a"].append(None)
+            raise RuntimeError("exchange down")
+        seen["a"].extend(batch)
+
+    try:
+        scanned_a = a.run(SYMBOLS, scan_a, PERIOD, batch_shards=2, poll_seconds=0, max_wait=0)
+        assert "❌ Scan of shards" in capsys.readouterr().out
+        assert a.remaining(PERIOD) > 0
+        scanned_b = b.run(SYMBOLS, seen["b"].extend, PERIOD, batch_shards=2, poll_seconds=0, max_wait=0)
+    finally:
+        a.leave()
+        b.leave()
+
+    assert a.remaining(PERIOD) == 0
+    assert scanned_a == seen["a"][1:]
+    assert scanned_b == seen["b"]
+    assert sorted(scanned_a + scanned_b) == sorted(SYMBOLS)
+
+
+def test_worker_does_not_reclaim_its_own_failed_shards(tmp_path):
+    a = coordinator(tmp_path, "a")
+    calls = []
+
+    def scan(batch):
+        calls.append(batch)
+        raise RuntimeError("exchange down")
+
+    try:
+        assert a.run(SYMBOLS, scan, PERIOD, batch_shards=4, poll_seconds=0, max_wait=0) == []
+    finally:
+        a.leave()
+    assert len(calls) == 4
+    assert a.remaining(PERIOD) == 16
@@ -0,0 +1,98 @@
+import datetime
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+import equities_market_signal_bot as equities
+from signal_pipeline import alerts
+from signal_pipeline.discord_dispatch import DiscordDispatcher
+from signal_pipeline.signal_state import SignalStateStore, bar_time_ms
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = ""
+
+    def json(self):
+        return {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Server Error")
+
+
+class FakeWebhookSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.posts = []
+
+    def post(self, url, json=None, timeout=None):
+        self.posts.append(json["content"])
+        return FakeResponse(self.statuses.pop(0) if self.statuses else 204)
+
+    def close(self):
+        pass
+
+
+def stock_frame(bars=80):
+    index = pd.date_range(end=pd.Timestamp.now().floor("5min"), periods=bars, freq="5min")
+    close = 100 + np.sin(np.arange(bars) / 4) * 3
+    return pd.DataFrame({
+        "Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1e6,
+        "RSI": 35.0, "MACD_Hist": 0.2, "Stoch_K": 15.0,
+    }, index=index)
+
+
+def scan_three_times(monkeypatch, tmp_path, session, dispatcher=None):
+    df = stock_frame()
+    monkeypatch.setattr(equities, "signal_state", SignalStateStore(str(tmp_path / "signals.sqlite")))
+    monkeypatch.setattr(equities, "alert_dispatcher", dispatcher)
+    monkeypatch.setattr(equities, "check_signal", lambda df_stock: ("BUY", df_stock.iloc[-1], 4))
+    monkeypatch.setattr(alerts, "_session", session)
+    equities.analyze_equity("AAPL", df)
+    if dispatcher is not None:
+        dispatcher.flush(5)
+    equities.analyze_equity("AAPL", df)
+    if dispatcher is not None:
+        dispatcher.flush(5)
+    equities.analyze_equity("AAPL", df)
+    if dispatcher is not None:
+        dispatcher.close()
+    return equities.signal_state
+
+
+def test_failed_send_is_not_suppressed_on_the_next_scan(monkeypatch, tmp_path, capsys):
+    session = FakeWebhookSession([500])
+    state = scan_three_times(monkeypatch, tmp_path, session)
+    # Scan 1 fails to post, scan 2 re-sends and is recorded, scan 3 is a repeat
+    assert len(session.posts) == 2
+    assert "not re-sent: already sent for this bar" in capsys.readouterr().out
+    assert state._db.execute("SELECT COUNT(*) FROM alert_log").fetchone()[0] == 1
+
+
+def test_alert_dropped_by_the_dispatcher_is_not_suppressed(monkeypatch, tmp_path):
+    session = FakeWebhookSession([400])
+    dispatcher = DiscordDispatcher("http://webhook.invalid", batch_window=0, session=session)
+    state = scan_three_times(monkeypatch, tmp_path, session, dispatcher)
+    assert len(session.posts) == 2
+    assert dispatcher.stats()["failed"] == 1
+    assert dispatcher.stats()["delivered"] == 1
+    assert state._db.execute("SELECT COUNT(*) FROM alert_log").fetchone()[0] == 1
+
+
+def test_naive_bar_times_are_utc_whatever_the_host_timezone(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        expected = 1_704_110_400_000  # 2024-01-01 12:00 UTC
+        assert bar_time_ms(datetime.datetime(2024, 1, 1, 12)) == expected
+        assert bar_time_ms(pd.Timestamp("2024-01-01 12:00")) == expected
+        assert bar_time_ms(pd.Timestamp("2024-01-01 07:00", tz="America/New_York")) == expected
+        assert bar_time_ms(expected) == expected
+    finally:
+        monkeypatch.undo()
+        time.tzset()